@@ -1,19 +1,29 @@
+import asyncio
 import logging
 import uvicorn
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 # Import configuration and database
 from src.web.constants.config import (
     API_CONFIG,
+    ERROR_MESSAGES,
     SECURITY_CONFIG,
     validate_config,
     SRC_LOG_LEVELS
 )
 # from src.web.internal.db import init_database, init_supabase, create_tables, get_db, get_supabase
 from src.web.internal.database_factory import get_current_provider, test_current_provider
+from src.web.internal.db import RollbackOnlyError, close_async_database, request_db_scope
+from src.web.models.users import last_active_buffer
+from src.web.models.connections import connection_log_buffer
+from src.web.internal.query_executor import query_executor
+from src.web.internal.result_cache import query_result_cache
+from src.web.internal.http_client import http_client
+from src.web.internal.hashing_pool import hashing_pool
+from src.web.utils.security import credential_manager, reencrypt_stored_credentials
 from src.web.routers import connections, users, chats, messages, knowledge, files, prompts, auth
 
 # Setup logging
@@ -61,12 +71,31 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    # Batched last_active_at writes for authenticated requests
+    last_active_buffer.start()
+    connection_log_buffer.start()
+
+    # Shared keep-alive sessions for outbound HTTP (connection tests, health checks)
+    http_client.start()
+
+    # Stretch the credential master keys off the event loop before serving
+    await asyncio.to_thread(credential_manager.key_ring.warm)
+    if SECURITY_CONFIG["CREDENTIAL_REENCRYPT_ON_STARTUP"]:
+        reencrypt_task = asyncio.create_task(asyncio.to_thread(reencrypt_stored_credentials))
+
     logger.info("Application startup completed")
     
     yield
     
     # Shutdown
     logger.info("Shutting down FinX Backend Application...")
+    await last_active_buffer.stop()
+    await connection_log_buffer.stop()
+    query_executor.shutdown()
+    hashing_pool.shutdown()
+    await query_result_cache.close()
+    await http_client.close()
+    await close_async_database()
 
 
 # Create FastAPI app
@@ -115,6 +144,25 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    """
+    Share one lazily opened database session across the table calls of a
+    request and commit it once, before the response is sent; server errors
+    roll the whole request back
+    """
+    try:
+        async with request_db_scope() as scope:
+            response = await call_next(request)
+            if response.status_code >= 500:
+                scope.rollback_only = True
+    except RollbackOnlyError as e:
+        logger.error(f"Rolled back {request.method} {request.url.path}: {e}")
+        return JSONResponse(status_code=500, content={"detail": ERROR_MESSAGES.INTERNAL_SERVER_ERROR})
+    return response
+
+
 # Include routers
 app.include_router(
     auth.router,
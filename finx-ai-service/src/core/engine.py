@@ -1,11 +1,14 @@
 import logging 
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from abc import ABCMeta, abstractmethod
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 import re
 import aiohttp
+import sqlglot
 import sqlparse
+from sqlglot import exp
 from sqlglot.tokens import Token, Tokenizer, TokenType
 
 log = logging.getLogger(__name__)
@@ -25,7 +28,26 @@ class Engine(metaclass=ABCMeta):
         dry_run: bool = True,
         **kwargs,
     ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Run sql, or with dry_run only plan it. A dry run returns the
+        planner's estimate ({"estimated_rows", "estimated_cost", "plan"})
+        and fails when it exceeds the engine's limits (see check_estimate).
+        """
         ...
+
+
+def check_estimate(estimate: Dict[str, Any], max_cost: float, max_rows: int) -> Optional[str]:
+    """
+    Why a planner estimate is too expensive to run, or None if it is within
+    max_cost and max_rows (0 disables a limit; missing estimates pass)
+    """
+    cost = estimate.get("estimated_cost")
+    rows = estimate.get("estimated_rows")
+    if max_cost and cost is not None and cost > max_cost:
+        return f"Estimated cost {cost} exceeds the limit of {max_cost}"
+    if max_rows and rows is not None and rows > max_rows:
+        return f"Estimated {rows} rows exceeds the limit of {max_rows}"
+    return None
         
 
 def clean_generation_result(result: str) -> str:
@@ -61,193 +83,224 @@ def squish_sql(sql: str) -> str:
         .strip()
     )
 
-def add_quotes(sql: str) -> Tuple[str, str]:
-    def _quote_sql_identifiers_by_tokens(sql: str, quote_char: str = '"') -> str:
-        """
-        Add quotes around identifiers using SQLGlot's tokenizer positions.
-        """
+# Keywords that sqlglot may tokenize as identifiers but must never be quoted
+SQL_KEYWORDS = frozenset({
+    # Basic SQL keywords
+    "SELECT", "FROM", "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER",
+    "ON", "AND", "OR", "NOT", "IN", "EXISTS", "BETWEEN", "LIKE", "IS", "NULL",
+    "ORDER", "BY", "GROUP", "HAVING", "LIMIT", "OFFSET", "UNION", "INTERSECT",
+    "EXCEPT", "AS", "DISTINCT", "ALL", "TOP", "WITH", "RECURSIVE",
+    # Data types
+    "INTEGER", "INT", "BIGINT", "SMALLINT", "DECIMAL", "NUMERIC", "FLOAT",
+    "REAL", "DOUBLE", "PRECISION", "VARCHAR", "CHAR", "TEXT", "BOOLEAN",
+    "BOOL", "DATE", "TIME", "TIMESTAMP", "TIMESTAMPTZ", "INTERVAL", "WITHOUT",
+    # Time/date keywords
+    "YEAR", "MONTH", "DAY", "HOUR", "MINUTE", "SECOND", "TIMEZONE", "EPOCH",
+    "AT", "ZONE", "CURRENT_DATE", "CURRENT_TIME", "CURRENT_TIMESTAMP",
+    # Other common keywords
+    "CASE", "WHEN", "THEN", "ELSE", "END", "DESC", "ASC", "TRUE", "FALSE",
+})
 
-        def is_sql_keyword(text: str) -> bool:
-            """Check if the text is a SQL keyword that should not be quoted."""
-            # Common SQL keywords that should never be quoted
-            sql_keywords = {
-                # Basic SQL keywords
-                "SELECT",
-                "FROM",
-                "WHERE",
-                "JOIN",
-                "LEFT",
-                "RIGHT",
-                "INNER",
-                "OUTER",
-                "ON",
-                "AND",
-                "OR",
-                "NOT",
-                "IN",
-                "EXISTS",
-                "BETWEEN",
-                "LIKE",
-                "IS",
-                "NULL",
-                "ORDER",
-                "BY",
-                "GROUP",
-                "HAVING",
-                "LIMIT",
-                "OFFSET",
-                "UNION",
-                "INTERSECT",
-                "EXCEPT",
-                "AS",
-                "DISTINCT",
-                "ALL",
-                "TOP",
-                "WITH",
-                "RECURSIVE",
-                # Data types
-                "INTEGER",
-                "INT",
-                "BIGINT",
-                "SMALLINT",
-                "DECIMAL",
-                "NUMERIC",
-                "FLOAT",
-                "REAL",
-                "DOUBLE",
-                "PRECISION",
-                "VARCHAR",
-                "CHAR",
-                "TEXT",
-                "BOOLEAN",
-                "BOOL",
-                "DATE",
-                "TIME",
-                "TIMESTAMP",
-                "TIMESTAMPTZ",
-                "INTERVAL",
-                "WITH",
-                "WITHOUT",
-                # Time/date keywords
-                "YEAR",
-                "MONTH",
-                "DAY",
-                "HOUR",
-                "MINUTE",
-                "SECOND",
-                "TIMEZONE",
-                "EPOCH",
-                "AT",
-                "ZONE",
-                "CURRENT_DATE",
-                "CURRENT_TIME",
-                "CURRENT_TIMESTAMP",
-                # Other common keywords
-                "CASE",
-                "WHEN",
-                "THEN",
-                "ELSE",
-                "END",
-                "DESC",
-                "ASC",
-                "TRUE",
-                "FALSE",
-            }
-            return text.upper() in sql_keywords
-
-        def is_ident(tok: Token):
-            # SQLGlot uses VAR for identifiers, but also treats SQL keywords as identifiers in some contexts
-            if tok.token_type not in (
-                TokenType.VAR,
-                TokenType.SCHEMA,
-                TokenType.TABLE,
-                TokenType.COLUMN,
-                TokenType.DATABASE,
-                TokenType.INDEX,
-                TokenType.VIEW,
-            ):
-                return False
-
-            # Don't quote SQL keywords
-            token_text = sql[tok.start : tok.end + 1]
-            if is_sql_keyword(token_text):
-                return False
-
-            return True
-
-        def is_already_quoted_text(text: str) -> bool:
-            text = text.strip()
-            return (
-                (len(text) >= 2 and text[0] == '"' and text[-1] == '"')
-                or (len(text) >= 2 and text[0] == "`" and text[-1] == "`")
-                or (len(text) >= 2 and text[0] == "[" and text[-1] == "]")
-            )
-
-        toks = Tokenizer().tokenize(sql)
-        n = len(toks)
-        edits = []  # (start, end_exclusive, replacement)
-
-        i = 0
-        while i < n:
-            t = toks[i]
-
-            if not is_ident(t):
-                i += 1
-                continue
+# SQLGlot uses VAR for identifiers, but also treats SQL keywords as identifiers in some contexts
+IDENTIFIER_TOKEN_TYPES = frozenset({
+    TokenType.VAR,
+    TokenType.SCHEMA,
+    TokenType.TABLE,
+    TokenType.COLUMN,
+    TokenType.DATABASE,
+    TokenType.INDEX,
+    TokenType.VIEW,
+})
 
-            # Check for wildcard pattern: IDENT DOT STAR (e.g., t.*)
-            if (
-                i + 2 < n
-                and toks[i + 1].token_type == TokenType.DOT
-                and toks[i + 2].token_type == TokenType.STAR
-            ):
-                i += 3  # Skip the entire wildcard pattern
-                continue
+QUOTE_PAIRS = frozenset({('"', '"'), ("`", "`"), ("[", "]")})
 
-            # Check if this is part of a dotted chain
-            j = i
-            chain_tokens = [t]  # Start with current identifier
-
-            # Collect all tokens in the dotted chain: IDENT (DOT IDENT)*
-            while (
-                j + 2 < n
-                and toks[j + 1].token_type == TokenType.DOT
-                and is_ident(toks[j + 2])
-            ):
-                chain_tokens.append(toks[j + 1])  # DOT
-                chain_tokens.append(toks[j + 2])  # IDENT
-                j += 2
-
-            # If the next token after the chain is '(', it's a function call -> skip
-            if j + 1 < n and toks[j + 1].token_type == TokenType.L_PAREN:
-                i = j + 1
-                continue
 
-            # Process each identifier in the chain separately to ensure all are quoted
-            for k in range(
-                0, len(chain_tokens), 2
-            ):  # Process only identifiers (skip dots)
-                ident_token = chain_tokens[k]
-                token_text = sql[ident_token.start : ident_token.end + 1]
+def quote_identifiers(sql: str, quote_char: str = '"') -> str:
+    """
+    Add quotes around identifiers using SQLGlot's tokenizer positions.
+
+    Identifiers and dotted chains (a.b.c) are quoted part by part; function
+    names, wildcards (t.*), keywords and already-quoted text are left alone.
+    The output is assembled in a single left-to-right pass.
+    """
+    toks = Tokenizer().tokenize(sql)
+    n = len(toks)
 
-                if not is_already_quoted_text(token_text):
-                    replacement = f"{quote_char}{token_text}{quote_char}"
-                    edits.append((ident_token.start, ident_token.end + 1, replacement))
+    # Slice each candidate token once and decide whether it is an identifier
+    texts = [None] * n
+    for i, tok in enumerate(toks):
+        if tok.token_type in IDENTIFIER_TOKEN_TYPES:
+            text = sql[tok.start : tok.end + 1]
+            if text.upper() not in SQL_KEYWORDS:
+                texts[i] = text
 
+    parts = []
+    pos = 0
+    i = 0
+    while i < n:
+        if texts[i] is None:
+            i += 1
+            continue
+
+        # Wildcard pattern: IDENT DOT STAR (e.g., t.*)
+        if (
+            i + 2 < n
+            and toks[i + 1].token_type == TokenType.DOT
+            and toks[i + 2].token_type == TokenType.STAR
+        ):
+            i += 3
+            continue
+
+        # Dotted chain: IDENT (DOT IDENT)*
+        j = i
+        while (
+            j + 2 < n
+            and toks[j + 1].token_type == TokenType.DOT
+            and texts[j + 2] is not None
+        ):
+            j += 2
+
+        # If the next token after the chain is '(', it's a function call -> skip
+        if j + 1 < n and toks[j + 1].token_type == TokenType.L_PAREN:
             i = j + 1
+            continue
+
+        for k in range(i, j + 1, 2):
+            text = texts[k]
+            stripped = text.strip()
+            if len(stripped) >= 2 and (stripped[0], stripped[-1]) in QUOTE_PAIRS:
+                continue
+            tok = toks[k]
+            parts.append(sql[pos : tok.start])
+            parts.append(quote_char)
+            parts.append(text)
+            parts.append(quote_char)
+            pos = tok.end + 1
+
+        i = j + 1
 
-        # Apply edits right-to-left to keep offsets valid
-        out = sql
-        for start, end, repl in sorted(edits, key=lambda x: x[0], reverse=True):
-            out = out[:start] + repl + out[end:]
-        return out
+    parts.append(sql[pos:])
+    return "".join(parts)
 
+
+@lru_cache(maxsize=1024)
+def add_quotes(sql: str) -> Tuple[str, str]:
+    """
+    Squish and quote generated SQL. Returns (quoted_sql, error). Results are
+    memoized since the same generated SQL is post-processed repeatedly.
+    """
     try:
         sql = squish_sql(sql)
-        quoted_sql = _quote_sql_identifiers_by_tokens(sql)
+        quoted_sql = quote_identifiers(sql)
     except Exception as e:
         log.exception(f"Error in adding quotes to {sql}: {e}")
 
         return "", str(e)
 
-    return quoted_sql, ""
\ No newline at end of file
+    return quoted_sql, ""
+
+
+# Connection.type values mapped to sqlglot dialect names
+SQLGLOT_DIALECTS = {
+    "postgresql": "postgres",
+    "mysql": "mysql",
+    "sqlite": "sqlite",
+    "oracle": "oracle",
+    "sql_server": "tsql",
+    "snowflake": "snowflake",
+    "bigquery": "bigquery",
+    "redshift": "redshift",
+    "databricks": "databricks",
+    "aws_athena": "athena",
+    "presto": "presto",
+    "trino": "trino",
+    "spark": "spark",
+}
+
+GENERATION_MARKUP = re.compile(r"```(?:sql|json)?|\"\"\"|'''")
+
+
+class PreparedSQL(BaseModel):
+    """
+    Output of prepare_sql. ``expression`` is the transformed sqlglot tree
+    the SQL was rendered from, kept for validation and cache keys.
+    """
+    sql: str
+    expression: Optional[exp.Expression] = None
+    dialect: Optional[str] = None
+    error: str = ""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+
+@lru_cache(maxsize=1024)
+def _parse_sql(sql: str, read: Optional[str]) -> exp.Expression:
+    return sqlglot.parse_one(sql, read=read)
+
+
+def parse_sql(sql: str, read: Optional[str] = None) -> exp.Expression:
+    """Parse SQL into a tree the caller may modify (parses are memoized)"""
+    return _parse_sql(sql, read).copy()
+
+
+def cap_limit(expression: exp.Expression, limit: int) -> exp.Expression:
+    """
+    Make a query return at most ``limit`` rows. An existing literal LIMIT is
+    lowered if it is larger; any other row limit (expressions, FETCH with
+    OFFSET) is kept by wrapping the query. Rendering emits the dialect's
+    form (LIMIT, TOP, FETCH FIRST). Non-query statements are returned as is.
+    """
+    if not isinstance(expression, exp.Query):
+        return expression
+
+    current = expression.args.get("limit")
+    if current is None:
+        return expression.limit(limit, copy=False)
+
+    value = current.expression if isinstance(current, exp.Limit) else None
+    if isinstance(value, exp.Literal) and value.is_int:
+        if int(value.name) > limit:
+            current.set("expression", exp.Literal.number(limit))
+        return expression
+
+    return exp.select("*").from_(expression.subquery("_capped")).limit(limit)
+
+
+def prepare_sql(
+    sql: str,
+    dialect: Optional[str] = None,
+    read: Optional[str] = None,
+    remove_limit: bool = False,
+    limit: Optional[int] = None,
+    quote: bool = True,
+) -> PreparedSQL:
+    """
+    Post-process generated SQL on a single parse: strip LLM markup, drop or
+    cap the LIMIT clause if asked, quote identifiers and render for the
+    target dialect (a sqlglot dialect or a Connection.type value). Rendering
+    also normalizes whitespace. ``read`` is the dialect the SQL was
+    generated in and defaults to the target dialect.
+    """
+    dialect = SQLGLOT_DIALECTS.get(dialect, dialect)
+    try:
+        text = GENERATION_MARKUP.sub("", sql).strip().rstrip(";").strip()
+        expression = parse_sql(text, read or dialect)
+
+        if remove_limit and isinstance(expression, exp.Query):
+            expression.set("limit", None)
+        if limit is not None:
+            expression = cap_limit(expression, limit)
+
+        if quote:
+            for identifier in expression.find_all(exp.Identifier):
+                identifier.set("quoted", True)
+
+        return PreparedSQL(
+            sql=expression.sql(dialect=dialect),
+            expression=expression,
+            dialect=dialect
+        )
+    except Exception as e:
+        log.exception(f"Error in preparing {sql}: {e}")
+
+        return PreparedSQL(sql="", dialect=dialect, error=str(e))
@@ -0,0 +1,178 @@
+"""
+SQL engines that run generated SQL directly against a database.
+
+dry_run=True validates the statement with EXPLAIN instead of running it and
+returns the planner's estimates, so expensive SQL can be rejected before it
+reaches the warehouse. Estimates above the engine's max_cost / max_rows
+thresholds fail the dry run; 0 disables a threshold. Queries on user
+connections get the same check from QueryExecutor.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+import asyncpg
+import orjson
+
+from src.core.engine import Engine, check_estimate
+from src.web.constants.config import QUERY_CONFIG, SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["CORE"])
+
+
+class SQLEngine(Engine):
+    """Shared threshold handling for EXPLAIN-based dry runs"""
+
+    def __init__(
+        self,
+        max_cost: float = QUERY_CONFIG["DRY_RUN_MAX_COST"],
+        max_rows: int = QUERY_CONFIG["DRY_RUN_MAX_ROWS"],
+    ):
+        self.max_cost = max_cost
+        self.max_rows = max_rows
+
+    def _check_estimate(self, estimate: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        error = check_estimate(estimate, self.max_cost, self.max_rows)
+        if error:
+            return False, {**estimate, "error": error}
+        return True, estimate
+
+
+class PostgresEngine(SQLEngine):
+    """Runs SQL on PostgreSQL through a lazily created asyncpg pool"""
+
+    def __init__(self, dsn: str, pool_size: int = 5, **kwargs):
+        super().__init__(**kwargs)
+        self.dsn = dsn
+        self.pool_size = pool_size
+        self._pool: Optional[asyncpg.Pool] = None
+        self._pool_lock = asyncio.Lock()
+
+    async def _get_pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size)
+        return self._pool
+
+    async def execute_sql(
+        self,
+        sql: str,
+        session: aiohttp.ClientSession,
+        dry_run: bool = True,
+        limit: int = 500,
+        **kwargs,
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """``session`` is unused; the engine talks to the database directly"""
+        try:
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                if dry_run:
+                    # Plain EXPLAIN plans the statement without executing it
+                    plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}")
+                    if isinstance(plan, str):
+                        plan = orjson.loads(plan)
+                    root = plan[0]["Plan"]
+                    return self._check_estimate({
+                        "estimated_rows": root.get("Plan Rows"),
+                        "estimated_cost": root.get("Total Cost"),
+                        "plan": plan,
+                    })
+
+                # A cursor fetches only the first ``limit`` rows from the server
+                async with conn.transaction():
+                    statement = await conn.prepare(sql)
+                    columns = [attribute.name for attribute in statement.get_attributes()]
+                    if columns:
+                        records = await statement.cursor().fetch(limit)
+                    else:
+                        await statement.fetch()
+                        records = []
+                return True, {
+                    "columns": columns,
+                    "data": [dict(record) for record in records],
+                }
+        except Exception as e:
+            log.warning(f"PostgreSQL {'dry run' if dry_run else 'execution'} failed: {e}")
+            return False, {"error": str(e)}
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+class SQLiteEngine(SQLEngine):
+    """
+    Local stand-in engine for development and tests, on a database file.
+    One connection is kept open and calls are serialized on it. SQLite's
+    planner has no cost model, so dry runs only validate the statement and
+    return the query plan.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        if not path or path == ":memory:" or path.startswith("file::memory:"):
+            raise ValueError("SQLiteEngine needs a database file")
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _run(self, sql: str, dry_run: bool, limit: int) -> Dict[str, Any]:
+        with self._lock:
+            if self._conn is None:
+                # Used from whichever worker thread runs the call
+                self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn = self._conn
+
+            if dry_run:
+                plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+                return {
+                    "estimated_rows": None,
+                    "estimated_cost": None,
+                    "plan": [row[-1] for row in plan],
+                }
+
+            try:
+                cursor = conn.execute(sql)
+                columns = [column[0] for column in cursor.description or []]
+                rows: List[tuple] = cursor.fetchmany(limit) if columns else []
+                cursor.close()
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            return {
+                "columns": columns,
+                "data": [dict(zip(columns, row)) for row in rows],
+            }
+
+    async def execute_sql(
+        self,
+        sql: str,
+        session: aiohttp.ClientSession,
+        dry_run: bool = True,
+        limit: int = 500,
+        **kwargs,
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """``session`` is unused; sqlite3 calls run in a worker thread"""
+        try:
+            result = await asyncio.to_thread(self._run, sql, dry_run, limit)
+        except sqlite3.Error as e:
+            log.warning(f"SQLite {'dry run' if dry_run else 'execution'} failed: {e}")
+            return False, {"error": str(e)}
+
+        if dry_run:
+            return self._check_estimate(result)
+        return True, result
+
+    async def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
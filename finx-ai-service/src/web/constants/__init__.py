@@ -11,7 +11,14 @@ from .config import (
     API_CONFIG,
     SECURITY_CONFIG,
     HEALTH_CHECK_CONFIG,
+    CONNECTION_LOG_CONFIG,
+    LOG_SAMPLING_CONFIG,
     RATE_LIMIT_CONFIG,
+    CACHE_CONFIG,
+    QUERY_CONFIG,
+    QUERY_CACHE_CONFIG,
+    HTTP_CLIENT_CONFIG,
+    PASSWORD_HASH_CONFIG,
     get_database_url,
     validate_config,
     ENVIRONMENT,
@@ -30,7 +37,14 @@ __all__ = [
     "API_CONFIG",
     "SECURITY_CONFIG",
     "HEALTH_CHECK_CONFIG",
+    "CONNECTION_LOG_CONFIG",
+    "LOG_SAMPLING_CONFIG",
     "RATE_LIMIT_CONFIG",
+    "CACHE_CONFIG",
+    "QUERY_CONFIG",
+    "QUERY_CACHE_CONFIG",
+    "HTTP_CLIENT_CONFIG",
+    "PASSWORD_HASH_CONFIG",
     "get_database_url",
     "validate_config",
     "ENVIRONMENT",
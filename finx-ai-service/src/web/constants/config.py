@@ -21,7 +21,14 @@ DATABASE_CONFIG = {
     "MAX_OVERFLOW": 20,
     "POOL_TIMEOUT": 30,
     "POOL_RECYCLE": 3600,
-    "ECHO": os.getenv("DB_ECHO", "false").lower() == "true"
+    "ECHO": os.getenv("DB_ECHO", "false").lower() == "true",
+    # Whether the database is reached through PgBouncer in transaction mode
+    # (e.g. the Supabase pooler), which cannot keep prepared statements
+    # across transactions. Unset: detected from the URL (port 6543, a
+    # *.pooler.supabase.com host or pgbouncer=true)
+    "PGBOUNCER": (
+        os.getenv("DB_PGBOUNCER").lower() == "true" if os.getenv("DB_PGBOUNCER") else None
+    )
 }
 
 # Database provider configuration
@@ -61,15 +68,41 @@ SECURITY_CONFIG = {
     "SECRET_KEY": os.getenv("SECRET_KEY", "your-secret-key-change-in-production"),
     "ALGORITHM": "HS256",
     "ACCESS_TOKEN_EXPIRE_MINUTES": int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")),
-    "REFRESH_TOKEN_EXPIRE_DAYS": int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+    "REFRESH_TOKEN_EXPIRE_DAYS": int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")),
+    # Connection credential encryption. CONNECTION_MASTER_KEYS is
+    # "version:key,..." for rotation; without it CONNECTION_MASTER_KEY is version 1
+    "CONNECTION_MASTER_KEY": os.getenv("CONNECTION_MASTER_KEY", "default-key-change-in-production"),
+    "CREDENTIAL_KEYS": os.getenv("CONNECTION_MASTER_KEYS", ""),
+    "CREDENTIAL_KEY_VERSION": int(os.getenv("CONNECTION_MASTER_KEY_VERSION", "0")) or None,  # None: highest
+    "CREDENTIAL_LEGACY_KEY_VERSION": int(os.getenv("CONNECTION_LEGACY_KEY_VERSION", "1")),
+    "CREDENTIAL_REENCRYPT_ON_STARTUP": os.getenv("CREDENTIAL_REENCRYPT_ON_STARTUP", "false").lower() == "true"
 }
 
 # Connection health check configuration
 HEALTH_CHECK_CONFIG = {
     "DEFAULT_INTERVAL": 300,  # 5 minutes
-    "DEFAULT_TIMEOUT": 10,
+    "DEFAULT_TIMEOUT": 10,  # seconds a single check may take
     "MAX_RETRIES": 3,
-    "RETRY_DELAY": 5
+    "RETRY_DELAY": 5,
+    "JITTER": 0.1,  # fraction of the interval each next check is randomly shifted by
+    "BATCH_SIZE": int(os.getenv("HEALTH_CHECK_BATCH_SIZE", "500")),  # upper bound on connections claimed per tick
+    "LEASE_SECONDS": int(os.getenv("HEALTH_CHECK_LEASE_SECONDS", "120"))  # claim held by the worker checking it
+}
+
+# Buffered connection_log writes
+CONNECTION_LOG_CONFIG = {
+    "BATCH_SIZE": int(os.getenv("CONNECTION_LOG_BATCH_SIZE", "200")),  # rows per INSERT
+    "FLUSH_INTERVAL_MS": int(os.getenv("CONNECTION_LOG_FLUSH_INTERVAL_MS", "1000")),
+    "MAX_PENDING": int(os.getenv("CONNECTION_LOG_MAX_PENDING", "10000"))  # rows kept in memory at most
+}
+
+# Sampling of high-volume operation logs (table/connection decorators, health checks)
+LOG_SAMPLING_CONFIG = {
+    "SUCCESS_RATE": float(os.getenv("LOG_SAMPLE_SUCCESS_RATE", "0.01")),  # fraction of successes written
+    "FAILURE_RATE": float(os.getenv("LOG_SAMPLE_FAILURE_RATE", "1.0")),
+    "RATE_LIMIT": int(os.getenv("LOG_SAMPLE_RATE_LIMIT", "10")),  # records per key per window; 0 disables
+    "RATE_WINDOW": int(os.getenv("LOG_SAMPLE_RATE_WINDOW", "60")),  # seconds
+    "SUMMARY_INTERVAL": int(os.getenv("LOG_SAMPLE_SUMMARY_INTERVAL", "60")),  # seconds
 }
 
 # Rate limiting configuration
@@ -80,6 +113,51 @@ RATE_LIMIT_CONFIG = {
     "BURST_PERIOD": 10
 }
 
+# External query execution configuration
+QUERY_CONFIG = {
+    "MAX_WORKERS": int(os.getenv("QUERY_MAX_WORKERS", "16")),  # threads for blocking drivers
+    "STREAM_BATCH_SIZE": int(os.getenv("QUERY_STREAM_BATCH_SIZE", "1000")),  # rows per fetchmany
+    "STREAM_MAX_ROWS": int(os.getenv("QUERY_STREAM_MAX_ROWS", "1000000")),  # hard cap per streamed query
+    "ARROW_SCHEMA_ROWS": int(os.getenv("QUERY_ARROW_SCHEMA_ROWS", "10000")),  # rows held back to type all-NULL Arrow columns
+    "PREVIEW_ROWS": int(os.getenv("QUERY_PREVIEW_ROWS", "1000")),  # row limit unless full results are requested
+    "DRY_RUN_MAX_COST": float(os.getenv("QUERY_DRY_RUN_MAX_COST", "1000000")),  # planner cost units, 0 disables
+    "DRY_RUN_MAX_ROWS": int(os.getenv("QUERY_DRY_RUN_MAX_ROWS", "10000000")),  # estimated rows, 0 disables
+    "SQLITE_SANDBOX_DIR": os.getenv("QUERY_SQLITE_SANDBOX_DIR", ""),  # SQLite files live here; empty disables SQLite connections
+}
+
+# Shared outbound HTTP client configuration
+HTTP_CLIENT_CONFIG = {
+    "MAX_CONNECTIONS": int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    "MAX_CONNECTIONS_PER_HOST": int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10")),
+    "DNS_CACHE_TTL": int(os.getenv("HTTP_DNS_CACHE_TTL", "300")),  # seconds
+    "KEEPALIVE_TIMEOUT": int(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30")),  # seconds
+    "DEFAULT_TIMEOUT": int(os.getenv("HTTP_DEFAULT_TIMEOUT", "30")),  # seconds
+}
+
+# Password hashing pool (bcrypt runs off the event loop)
+PASSWORD_HASH_CONFIG = {
+    "MAX_WORKERS": int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    "MAX_CONCURRENCY": int(os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", str(min(4, os.cpu_count() or 1)))),  # hashes in flight
+}
+
+# Cache for results of queries run against user connections
+QUERY_CACHE_CONFIG = {
+    "ENABLED": os.getenv("QUERY_CACHE_ENABLED", "true").lower() == "true",
+    "TTL": int(os.getenv("QUERY_CACHE_TTL", "300")),  # seconds
+    "MAX_SIZE": int(os.getenv("QUERY_CACHE_MAX_SIZE", "512")),  # entries per worker
+    "MAX_ROWS": int(os.getenv("QUERY_CACHE_MAX_ROWS", "10000")),  # larger results are not cached
+    "REDIS_URL": os.getenv("QUERY_CACHE_REDIS_URL"),  # optional shared backing store
+}
+
+# In-process cache configuration
+CACHE_CONFIG = {
+    "USER_TTL": int(os.getenv("USER_CACHE_TTL", "60")),  # seconds; also how long other workers may serve a stale role
+    "USER_MAX_SIZE": int(os.getenv("USER_CACHE_MAX_SIZE", "10000")),
+    "LAST_ACTIVE_FLUSH_INTERVAL": int(os.getenv("LAST_ACTIVE_FLUSH_INTERVAL", "60")),  # seconds
+    "CREDENTIAL_TTL": int(os.getenv("CREDENTIAL_CACHE_TTL", "60")),  # seconds
+    "CREDENTIAL_MAX_SIZE": int(os.getenv("CREDENTIAL_CACHE_MAX_SIZE", "1024"))
+}
+
 def get_database_url() -> str:
     """
     Get the database URL for SQLAlchemy connection based on provider
@@ -174,5 +252,6 @@ class ErrorMessages:
     BAD_REQUEST = "Bad request"
     CONFLICT = "Resource conflict"
     RATE_LIMIT_EXCEEDED = "Rate limit exceeded"
+    INVALID_CURSOR = "Invalid pagination cursor"
 
 ERROR_MESSAGES = ErrorMessages()
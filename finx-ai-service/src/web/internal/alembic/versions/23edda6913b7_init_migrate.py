@@ -7,7 +7,11 @@ Create Date: 2025-08-17 16:28:38.742469
 """
 from alembic import op
 import sqlalchemy as sa
-from src.web.internal.db import JSONField
+
+# JSONField was TEXT on every dialect when this revision was written, and
+# 5b1e9d7a42c8 converts these columns from TEXT. Pinned so that a replay
+# does not pick up the current JSONField, which is JSONB on PostgreSQL.
+JSONField = sa.Text
 
 # revision identifiers, used by Alembic.
 revision = '23edda6913b7'
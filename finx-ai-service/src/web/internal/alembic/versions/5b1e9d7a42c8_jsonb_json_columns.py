@@ -0,0 +1,148 @@
+"""jsonb_json_columns
+
+Revision ID: 5b1e9d7a42c8
+Revises: ce6f31cf13d2
+Create Date: 2026-10-17 11:04:27.551903
+
+The columns were written by json.dumps, which emits NaN/Infinity and
+\\u0000 escapes that the ::jsonb cast rejects. Rows containing them are
+rewritten first (NaN/Infinity become null, NUL characters are dropped,
+empty strings become NULL). Precondition: every other value is valid
+JSON. Text that is not still fails the cast, and PostgreSQL then rolls
+the whole upgrade back; fix or clear those rows and rerun.
+"""
+import json
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e9d7a42c8'
+down_revision = 'ce6f31cf13d2'
+branch_labels = None
+depends_on = None
+
+
+# Every JSONField column, by table
+JSON_COLUMNS = {
+    'user': ['settings', 'info'],
+    'message': ['data', 'meta'],
+    'group': ['data', 'meta', 'permissions', 'user_ids'],
+    'prompt': ['access_control'],
+    'file': ['data', 'meta', 'access_control'],
+    'tag': ['meta'],
+    'channel': ['data', 'meta', 'access_control'],
+    'folder': ['items', 'meta'],
+    'chat': ['chat', 'meta'],
+    'knowledge': ['data', 'meta', 'access_control'],
+    'feedback': ['data', 'meta', 'snapshot'],
+    'connection': ['config', 'credentials', 'connection_metadata'],
+    'connection_template': ['config_template', 'credentials_template', 'tags'],
+    'connection_log': ['details'],
+    'model': ['params', 'meta', 'access_control'],
+}
+
+# GIN indexes for containment (@>) queries. Kept to the read-mostly tables;
+# message rows are written far too often to carry them. They are only
+# created here rather than in the models because they are PostgreSQL-only.
+GIN_INDEXES = [
+    ('ix_chat_meta_gin', 'chat', 'meta'),
+    ('ix_file_meta_gin', 'file', 'meta'),
+    ('ix_file_data_gin', 'file', 'data'),
+    ('ix_file_access_control_gin', 'file', 'access_control'),
+    ('ix_channel_access_control_gin', 'channel', 'access_control'),
+    ('ix_knowledge_meta_gin', 'knowledge', 'meta'),
+    ('ix_knowledge_data_gin', 'knowledge', 'data'),
+    ('ix_knowledge_access_control_gin', 'knowledge', 'access_control'),
+    ('ix_prompt_access_control_gin', 'prompt', 'access_control'),
+    ('ix_model_meta_gin', 'model', 'meta'),
+    ('ix_model_access_control_gin', 'model', 'access_control'),
+]
+
+
+def _sanitize(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, str):
+        return value.replace('\x00', '')
+    if isinstance(value, list):
+        return [_sanitize(item) for item in value]
+    if isinstance(value, dict):
+        return {key.replace('\x00', ''): _sanitize(item) for key, item in value.items()}
+    return value
+
+
+def _clean_json_text(bind, table: str, column: str):
+    """Rewrite the values of table.column that ::jsonb would reject"""
+    key_columns = sa.inspect(bind).get_pk_constraint(table)['constrained_columns']
+    t = sa.table(table, sa.column(column), *(sa.column(name) for name in key_columns))
+    value = t.c[column]
+    # Only candidates are loaded; json.loads decides which really need it
+    candidates = bind.execute(
+        sa.select(value, *(t.c[name] for name in key_columns)).where(sa.or_(
+            value == '',
+            sa.func.strpos(value, '\\u0000') > 0,
+            value.regexp_match('NaN|Infinity'),
+        ))
+    ).all()
+
+    for row in candidates:
+        text, key = row[0], dict(zip(key_columns, row[1:]))
+        if text == '':
+            cleaned = None
+        else:
+            try:
+                parsed = json.loads(text)
+            except ValueError:
+                raise RuntimeError(f'{table}.{column} of {key} is not JSON; fix or clear it and rerun')
+            sanitized = _sanitize(parsed)
+            cleaned = json.dumps(sanitized, allow_nan=False)
+            if cleaned == json.dumps(parsed):
+                continue
+        bind.execute(
+            sa.update(t)
+            .where(*(t.c[name] == key[name] for name in key_columns))
+            .values({column: cleaned})
+        )
+
+
+def upgrade() -> None:
+    # JSONField keeps using orjson-encoded TEXT on other dialects
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            _clean_json_text(bind, table, column)
+
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f'ALTER TABLE "{table}" ALTER COLUMN "{column}" '
+                f'TYPE JSONB USING "{column}"::jsonb'
+            )
+
+    for name, table, column in GIN_INDEXES:
+        op.create_index(
+            name, table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'jsonb_path_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, table, _ in reversed(GIN_INDEXES):
+        op.drop_index(name, table_name=table)
+
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f'ALTER TABLE "{table}" ALTER COLUMN "{column}" '
+                f'TYPE TEXT USING "{column}"::text'
+            )
@@ -0,0 +1,30 @@
+"""add_connection_next_check_at
+
+Revision ID: 9c4d2e7b1a05
+Revises: 5b1e9d7a42c8
+Create Date: 2026-10-17 14:03:27.540118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4d2e7b1a05'
+down_revision = '5b1e9d7a42c8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NULL means "not scheduled yet"; the health monitor spreads those
+    # connections over their interval the first time it sees them
+    op.add_column('connection', sa.Column('next_check_at', sa.BigInteger(), nullable=True))
+    op.create_index(
+        'ix_connection_is_active_next_check_at', 'connection', ['is_active', 'next_check_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_connection_is_active_next_check_at', table_name='connection')
+    op.drop_column('connection', 'next_check_at')
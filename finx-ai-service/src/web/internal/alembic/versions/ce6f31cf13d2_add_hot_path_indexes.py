@@ -0,0 +1,50 @@
+"""add_hot_path_indexes
+
+Revision ID: ce6f31cf13d2
+Revises: 23edda6913b7
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ce6f31cf13d2'
+down_revision = '23edda6913b7'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) - each one mirrors a filter_by(...).order_by(...)
+# shape used by the table classes in src/web/models
+INDEXES = [
+    ('ix_auth_email_active', 'auth', ['email', 'active']),
+    ('ix_user_email', 'user', ['email']),
+    ('ix_folder_user_id_created_at', 'folder', ['user_id', 'created_at']),
+    ('ix_folder_parent_id_user_id_created_at', 'folder', ['parent_id', 'user_id', 'created_at']),
+    ('ix_chat_user_id_updated_at', 'chat', ['user_id', 'updated_at']),
+    ('ix_chat_user_id_archived_updated_at', 'chat', ['user_id', 'archived', 'updated_at']),
+    ('ix_chat_user_id_pinned_updated_at', 'chat', ['user_id', 'pinned', 'updated_at']),
+    ('ix_chat_folder_id_user_id_updated_at', 'chat', ['folder_id', 'user_id', 'updated_at']),
+    ('ix_message_channel_id_created_at', 'message', ['channel_id', 'created_at']),
+    ('ix_message_parent_id_created_at', 'message', ['parent_id', 'created_at']),
+    ('ix_message_user_id_created_at', 'message', ['user_id', 'created_at']),
+    ('ix_message_reaction_message_id_created_at', 'message_reaction', ['message_id', 'created_at']),
+    ('ix_message_reaction_user_id_message_id_name', 'message_reaction', ['user_id', 'message_id', 'name']),
+    ('ix_file_hash', 'file', ['hash']),
+    ('ix_file_user_id_created_at', 'file', ['user_id', 'created_at']),
+    ('ix_memory_user_id_updated_at', 'memory', ['user_id', 'updated_at']),
+    ('ix_connection_user_id_updated_at', 'connection', ['user_id', 'updated_at']),
+    ('ix_connection_log_connection_id_timestamp', 'connection_log', ['connection_id', 'timestamp']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,27 @@
+"""add_connection_credentials_masked
+
+Revision ID: e3f8a1c6b297
+Revises: 9c4d2e7b1a05
+Create Date: 2026-10-17 15:21:09.318842
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from src.web.internal.db import JSONField
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3f8a1c6b297'
+down_revision = '9c4d2e7b1a05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows; the API decrypts those on read until
+    # their credentials are next saved
+    op.add_column('connection', sa.Column('credentials_masked', JSONField(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('connection', 'credentials_masked')
@@ -3,16 +3,75 @@ Connection Providers for Data Sources
 Handles actual connections to various data sources like PostgreSQL, AWS Athena, Snowflake, etc.
 """
 
+import io
+import os
 import time
 import logging
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, Iterator, List, Tuple
 from dataclasses import dataclass
 
+import orjson
+from sqlalchemy import create_engine, text, Engine
+from sqlalchemy.pool import QueuePool
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # Arrow output is optional
+    pa = None
+
+from src.web.constants.config import QUERY_CONFIG
 from src.web.models.connections import ConnectionModel, ConnectionType, DatabaseDriver
 
 log = logging.getLogger(__name__)
 
+# Cancel token of the query running on the current worker thread
+_cancel_token = threading.local()
+
+
+def run_with_cancel_token(token: Any, func, *args):
+    """
+    Run a blocking provider call with token identifying the queries it
+    starts, so BaseConnectionProvider.cancel(token) aborts only those
+    """
+    previous = getattr(_cancel_token, "value", None)
+    _cancel_token.value = token
+    try:
+        return func(*args)
+    finally:
+        _cancel_token.value = previous
+
+
+def current_cancel_token() -> Any:
+    """Token of the running call, falling back to the worker thread"""
+    token = getattr(_cancel_token, "value", None)
+    return token if token is not None else threading.get_ident()
+
+def unique_column_names(columns: List[str]) -> List[str]:
+    """
+    Column names usable as row dict keys: a repeated name (e.g. two "id"
+    columns from a join) gets a _2, _3, ... suffix instead of overwriting
+    the earlier value
+    """
+    seen = set(columns)
+    counts: Dict[str, int] = {}
+    names = []
+    for column in columns:
+        count = counts.get(column, 0) + 1
+        counts[column] = count
+        name = column
+        if count > 1:
+            suffix = count
+            while f"{column}_{suffix}" in seen:
+                suffix += 1
+            name = f"{column}_{suffix}"
+            seen.add(name)
+        names.append(name)
+    return names
+
 @dataclass
 class ConnectionResult:
     """Result of a connection operation"""
@@ -25,16 +84,88 @@ class ConnectionResult:
 
 @dataclass
 class QueryResult:
-    """Result of a query operation"""
+    """
+    Result of a query operation. Rows are held either as ``data`` (one dict
+    per row) or, for columnar execution, as ``column_values`` (one list per
+    entry of ``columns``), which avoids repeating column names per row.
+    """
     success: bool
     data: Optional[List[Dict[str, Any]]] = None
     columns: Optional[List[str]] = None
     row_count: Optional[int] = None
     execution_time: Optional[float] = None
     error: Optional[str] = None
+    column_values: Optional[List[List[Any]]] = None
+    truncated: bool = False  # more rows exist than were returned (preview mode)
+    estimate: Optional[Dict[str, Any]] = None  # planner estimate from the dry run, if one ran
+
+    def get_rows(self) -> List[Dict[str, Any]]:
+        """Row-oriented view of the result"""
+        if self.data is not None:
+            return self.data
+        if self.column_values is None:
+            return []
+        columns = unique_column_names(self.columns or [])
+        return [dict(zip(columns, row)) for row in zip(*self.column_values)]
+
+    def get_column_values(self) -> List[List[Any]]:
+        """Column-oriented view of the result"""
+        if self.column_values is not None:
+            return self.column_values
+        columns = self.columns or []
+        rows = self.data or []
+        return [[row.get(column) for row in rows] for column in columns]
+
+    def to_columnar_json(self) -> bytes:
+        """Serialize as column-oriented JSON: {"columns": [...], "values": [[...], ...]}"""
+        return orjson.dumps(
+            {
+                "success": self.success,
+                "columns": self.columns or [],
+                "values": self.get_column_values(),
+                "row_count": self.row_count,
+                "execution_time": self.execution_time,
+                "error": self.error,
+                "truncated": self.truncated,
+                "estimate": self.estimate,
+            },
+            default=str
+        )
+
+    def truncate(self, max_rows: int):
+        """Keep the first max_rows rows, flagging the result if any were dropped"""
+        if self.row_count is None or self.row_count <= max_rows:
+            return
+        if self.data is not None:
+            self.data = self.data[:max_rows]
+        if self.column_values is not None:
+            self.column_values = [values[:max_rows] for values in self.column_values]
+        self.row_count = max_rows
+        self.truncated = True
+
+    def to_arrow(self) -> "pa.Table":
+        """Build an Arrow table (requires pyarrow)"""
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Arrow output")
+        # from_arrays keeps repeated column names, which Arrow allows
+        return pa.Table.from_arrays(
+            [pa.array(values) for values in self.get_column_values()], names=self.columns or []
+        )
+
+    def to_arrow_ipc(self) -> bytes:
+        """Serialize as an Arrow IPC stream (requires pyarrow)"""
+        table = self.to_arrow()
+        sink = io.BytesIO()
+        with pa_ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
 
 class BaseConnectionProvider(ABC):
     """Base class for all connection providers"""
+
+    # Whether explain() returns row and cost estimates worth checking
+    # before every query
+    has_cost_estimates = False
     
     def __init__(self, connection: ConnectionModel):
         self.connection = connection
@@ -57,10 +188,46 @@ class BaseConnectionProvider(ABC):
         pass
     
     @abstractmethod
-    def execute_query(self, query: str, params: Optional[Dict] = None) -> QueryResult:
-        """Execute a query"""
+    def execute_query(self, query: str, params: Optional[Dict] = None, columnar: bool = False) -> QueryResult:
+        """Execute a query; ``columnar`` is a hint to fill column_values instead of data"""
         pass
     
+    def iter_query(
+        self, query: str, params: Optional[Dict] = None, batch_size: int = 1000
+    ) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """
+        Execute a query and yield (columns, rows) batches of at most
+        batch_size rows. Blocking, like execute_query: each next() is meant
+        to run on the query executor's thread pool. Errors are raised rather
+        than returned. Providers without cursor support fall back to
+        execute_query and slice its result.
+        """
+        result = self.execute_query(query, params)
+        if not result.success:
+            raise RuntimeError(result.error)
+
+        columns = result.columns or []
+        rows = [tuple(row.get(column) for column in columns) for row in result.get_rows()]
+        for start in range(0, max(len(rows), 1), batch_size):
+            yield columns, rows[start:start + batch_size]
+
+    def explain(self, query: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """
+        Plan a query without running it and return the planner's estimate as
+        {"estimated_rows", "estimated_cost", "plan"}; estimates the planner
+        does not provide are None. Returns None for providers that cannot
+        plan queries. Blocking, like execute_query; errors are raised.
+        """
+        return None
+
+    def cancel(self, token: Any):
+        """
+        Abort the query started under token (see run_with_cancel_token).
+        Called when a query exceeds its timeout; providers that cannot
+        interrupt their client leave the worker thread to finish on its own.
+        """
+        pass
+
     def get_connection_info(self) -> Dict[str, Any]:
         """Get connection information"""
         return {
@@ -73,127 +240,245 @@ class BaseConnectionProvider(ABC):
             "is_connected": self._is_connected
         }
 
-class PostgreSQLProvider(BaseConnectionProvider):
-    """PostgreSQL connection provider"""
-    
+class SQLAlchemyProvider(BaseConnectionProvider):
+    """
+    Base for providers backed by a SQLAlchemy engine. Each connection gets
+    its own pool sized by Connection.max_connections; calls are blocking and
+    meant to run on the query executor's thread pool.
+    """
+
+    name = "SQL"
+    test_query = "SELECT 1"
+
+    def __init__(self, connection: ConnectionModel):
+        super().__init__(connection)
+        self.engine: Optional[Engine] = None
+        self._engine_lock = threading.Lock()
+        self._running: Dict[Any, Any] = {}  # cancel token -> DBAPI connection
+        self._running_lock = threading.Lock()
+
+    @abstractmethod
+    def _build_connection_string(self) -> str:
+        """Build the SQLAlchemy URL for this connection"""
+        pass
+
+    def _engine_options(self) -> Dict[str, Any]:
+        """Extra create_engine() keyword arguments"""
+        return {}
+
+    def _cancel_dbapi_connection(self, dbapi_connection):
+        """Interrupt a statement running on a raw DBAPI connection"""
+        pass
+
+    def _get_engine(self) -> Engine:
+        if self.engine is None:
+            with self._engine_lock:
+                if self.engine is None:
+                    self.engine = create_engine(
+                        self._build_connection_string(),
+                        poolclass=QueuePool,
+                        pool_size=self.connection.max_connections,
+                        max_overflow=0,
+                        pool_timeout=self.connection.timeout_seconds,
+                        pool_pre_ping=True,
+                        **self._engine_options()
+                    )
+        return self.engine
+
     def connect(self) -> ConnectionResult:
-        """Connect to PostgreSQL database"""
         start_time = time.time()
-        
+
         try:
-            # Mock implementation - in real usage, use psycopg2 or asyncpg
-            connection_string = self._build_connection_string()
-            
-            # Simulate connection
-            time.sleep(0.1)  # Simulate connection time
-            
+            with self._get_engine().connect() as conn:
+                conn.execute(text(self.test_query))
+
             self._is_connected = True
-            response_time = time.time() - start_time
-            
             return ConnectionResult(
                 success=True,
-                message="PostgreSQL connection established",
-                response_time=response_time,
+                message=f"{self.name} connection established",
+                response_time=time.time() - start_time,
                 metadata={
-                    "connection_string": connection_string,
                     "driver": self.connection.driver,
-                    "ssl_mode": self.connection.config.get("sslmode", "prefer") if self.connection.config else "prefer"
+                    "pool_size": self.connection.max_connections
                 }
             )
-            
+
         except Exception as e:
             return ConnectionResult(
                 success=False,
-                message="Failed to connect to PostgreSQL",
+                message=f"Failed to connect to {self.name}",
                 error=str(e),
                 response_time=time.time() - start_time
             )
-    
+
     def disconnect(self) -> ConnectionResult:
-        """Disconnect from PostgreSQL"""
         try:
-            if self.client:
-                # self.client.close()  # In real implementation
-                pass
-            
+            if self.engine is not None:
+                self.engine.dispose()
+                self.engine = None
+
             self._is_connected = False
             return ConnectionResult(
                 success=True,
-                message="PostgreSQL connection closed"
+                message=f"{self.name} connection closed"
             )
         except Exception as e:
             return ConnectionResult(
                 success=False,
-                message="Error closing PostgreSQL connection",
+                message=f"Error closing {self.name} connection",
                 error=str(e)
             )
-    
+
     def test_connection(self) -> ConnectionResult:
-        """Test PostgreSQL connection"""
-        if not self._is_connected:
-            connect_result = self.connect()
-            if not connect_result.success:
-                return connect_result
-        
-        try:
-            # Test with simple query
-            query_result = self.execute_query("SELECT version(), current_database(), current_user")
-            
-            if query_result.success:
-                return ConnectionResult(
-                    success=True,
-                    message="PostgreSQL connection test successful",
-                    data=query_result.data,
-                    response_time=query_result.execution_time
-                )
-            else:
-                return ConnectionResult(
-                    success=False,
-                    message="PostgreSQL connection test failed",
-                    error=query_result.error
-                )
-                
-        except Exception as e:
+        query_result = self.execute_query(self.test_query)
+
+        if query_result.success:
+            self._is_connected = True
             return ConnectionResult(
-                success=False,
-                message="PostgreSQL connection test error",
-                error=str(e)
+                success=True,
+                message=f"{self.name} connection test successful",
+                data=query_result.data,
+                response_time=query_result.execution_time
             )
-    
-    def execute_query(self, query: str, params: Optional[Dict] = None) -> QueryResult:
-        """Execute PostgreSQL query"""
+        return ConnectionResult(
+            success=False,
+            message=f"{self.name} connection test failed",
+            error=query_result.error,
+            response_time=query_result.execution_time
+        )
+
+    def execute_query(self, query: str, params: Optional[Dict] = None, columnar: bool = False) -> QueryResult:
         start_time = time.time()
-        
+
         try:
-            # Mock implementation
-            if "version()" in query.lower():
-                mock_data = [{
-                    "version": "PostgreSQL 14.5 on x86_64-pc-linux-gnu",
-                    "current_database": self.connection.database_name,
-                    "current_user": self.connection.username
-                }]
-                columns = ["version", "current_database", "current_user"]
-            else:
-                mock_data = [{"result": "Query executed successfully"}]
-                columns = ["result"]
-            
-            execution_time = time.time() - start_time
-            
+            with self._get_engine().connect() as conn:
+                columns, rows, row_count = self._track(
+                    conn.connection.dbapi_connection, self._fetch_all, conn, query, params
+                )
+
+            if columnar:
+                column_values = [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+                return QueryResult(
+                    success=True,
+                    columns=columns,
+                    column_values=column_values,
+                    row_count=row_count,
+                    execution_time=time.time() - start_time
+                )
+
+            columns = unique_column_names(columns)
             return QueryResult(
                 success=True,
-                data=mock_data,
+                data=[dict(zip(columns, row)) for row in rows],
                 columns=columns,
-                row_count=len(mock_data),
-                execution_time=execution_time
+                row_count=row_count,
+                execution_time=time.time() - start_time
             )
-            
+
         except Exception as e:
             return QueryResult(
                 success=False,
                 error=str(e),
                 execution_time=time.time() - start_time
             )
-    
+
+    @staticmethod
+    def _fetch_all(conn, query: str, params: Optional[Dict]) -> Tuple[List[str], List[Any], int]:
+        result = conn.execute(text(query), params or {})
+        if result.returns_rows:
+            rows = result.fetchall()
+            return list(result.keys()), rows, len(rows)
+        conn.commit()
+        return [], [], result.rowcount
+
+    def explain(self, query: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        with self._get_engine().connect() as conn:
+            return self._track(conn.connection.dbapi_connection, self._explain, conn, query, params)
+
+    def _explain(self, conn, query: str, params: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """Dialect-specific EXPLAIN; None when the database has no usable planner output"""
+        return None
+
+    def iter_query(
+        self, query: str, params: Optional[Dict] = None, batch_size: int = 1000
+    ) -> Iterator[Tuple[List[str], List[tuple]]]:
+        """
+        Stream rows through a server-side cursor (stream_results), so only
+        one batch is held in memory at a time. The pooled connection is
+        kept until the generator is exhausted or closed.
+        """
+        with self._get_engine().connect() as conn:
+            dbapi_connection = conn.connection.dbapi_connection
+            conn = conn.execution_options(stream_results=True, max_row_buffer=batch_size)
+            result = self._track(dbapi_connection, conn.execute, text(query), params or {})
+
+            if not result.returns_rows:
+                conn.commit()
+                yield [], []
+                return
+
+            columns = list(result.keys())
+            rows = self._track(dbapi_connection, result.fetchmany, batch_size)
+            # Always yield once so callers learn the columns of an empty result
+            yield columns, [tuple(row) for row in rows]
+            while rows:
+                rows = self._track(dbapi_connection, result.fetchmany, batch_size)
+                if rows:
+                    yield columns, [tuple(row) for row in rows]
+
+    def _track(self, dbapi_connection, func, *args):
+        """Run func with dbapi_connection cancellable under the current cancel token"""
+        token = current_cancel_token()
+        with self._running_lock:
+            self._running[token] = dbapi_connection
+        try:
+            return func(*args)
+        finally:
+            with self._running_lock:
+                self._running.pop(token, None)
+
+    def cancel(self, token: Any):
+        # Cancel under the lock: once _track has unregistered, the pooled
+        # connection may already serve another caller's query
+        with self._running_lock:
+            dbapi_connection = self._running.get(token)
+            if dbapi_connection is None:
+                return
+            try:
+                self._cancel_dbapi_connection(dbapi_connection)
+            except Exception as e:
+                log.warning(f"Failed to cancel {self.name} query: {e}")
+
+
+class PostgreSQLProvider(SQLAlchemyProvider):
+    """PostgreSQL connection provider"""
+
+    name = "PostgreSQL"
+    test_query = "SELECT version(), current_database(), current_user"
+    has_cost_estimates = True
+
+    def _engine_options(self) -> Dict[str, Any]:
+        # Let the server enforce the timeout too, so a query abandoned by
+        # the executor does not keep running
+        timeout_ms = self.connection.timeout_seconds * 1000
+        return {"connect_args": {"options": f"-c statement_timeout={timeout_ms}"}}
+
+    def _cancel_dbapi_connection(self, dbapi_connection):
+        # psycopg2 sends a cancel request on a separate socket
+        dbapi_connection.cancel()
+
+    def _explain(self, conn, query: str, params: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        # Plain EXPLAIN plans the statement without executing it
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params or {}).scalar()
+        if isinstance(plan, str):
+            plan = orjson.loads(plan)
+        root = plan[0]["Plan"]
+        return {
+            "estimated_rows": root.get("Plan Rows"),
+            "estimated_cost": root.get("Total Cost"),
+            "plan": plan,
+        }
+
     def _build_connection_string(self) -> str:
         """Build PostgreSQL connection string"""
         if self.connection.connection_string:
@@ -216,6 +501,56 @@ class PostgreSQLProvider(BaseConnectionProvider):
         
         return conn_str
 
+
+class SQLiteProvider(SQLAlchemyProvider):
+    """
+    SQLite connection provider. The database file is opened on this server,
+    so database_name must be a path inside QUERY_CONFIG["SQLITE_SANDBOX_DIR"]
+    (connection_string is ignored) and ATTACH is disabled. The provider is
+    only registered when a sandbox directory is configured.
+    """
+
+    name = "SQLite"
+    test_query = "SELECT sqlite_version()"
+
+    def _engine_options(self) -> Dict[str, Any]:
+        return {"creator": self._connect}
+
+    def _connect(self) -> sqlite3.Connection:
+        # Pooled connections are handed to whichever executor thread runs
+        # the query
+        dbapi_connection = sqlite3.connect(self._database_path(), check_same_thread=False)
+        dbapi_connection.setlimit(sqlite3.SQLITE_LIMIT_ATTACHED, 0)
+        return dbapi_connection
+
+    def _database_path(self) -> str:
+        sandbox = QUERY_CONFIG["SQLITE_SANDBOX_DIR"]
+        if not sandbox:
+            raise ValueError("SQLite connections are disabled")
+
+        root = os.path.realpath(sandbox)
+        path = os.path.realpath(os.path.join(root, self.connection.database_name or ""))
+        if path == root or os.path.commonpath([root, path]) != root:
+            raise ValueError("SQLite database must be a file inside the sandbox directory")
+        return path
+
+    def _cancel_dbapi_connection(self, dbapi_connection):
+        dbapi_connection.interrupt()
+
+    def _explain(self, conn, query: str, params: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        # SQLite's planner has no cost model: the plan validates the
+        # statement and shows index usage, but there is nothing to threshold
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {query}"), params or {}).fetchall()
+        return {
+            "estimated_rows": None,
+            "estimated_cost": None,
+            "plan": [row[-1] for row in rows],
+        }
+
+    def _build_connection_string(self) -> str:
+        # The file is opened by _connect
+        return "sqlite://"
+
 class AthenaProvider(BaseConnectionProvider):
     """AWS Athena connection provider"""
     
@@ -293,7 +628,7 @@ class AthenaProvider(BaseConnectionProvider):
                 error=str(e)
             )
     
-    def execute_query(self, query: str, params: Optional[Dict] = None) -> QueryResult:
+    def execute_query(self, query: str, params: Optional[Dict] = None, columnar: bool = False) -> QueryResult:
         """Execute Athena query"""
         start_time = time.time()
         
@@ -403,7 +738,7 @@ class SnowflakeProvider(BaseConnectionProvider):
                 error=str(e)
             )
 
-    def execute_query(self, query: str, params: Optional[Dict] = None) -> QueryResult:
+    def execute_query(self, query: str, params: Optional[Dict] = None, columnar: bool = False) -> QueryResult:
         """Execute Snowflake query"""
         start_time = time.time()
 
@@ -515,7 +850,7 @@ class BigQueryProvider(BaseConnectionProvider):
                 error=str(e)
             )
 
-    def execute_query(self, query: str, params: Optional[Dict] = None) -> QueryResult:
+    def execute_query(self, query: str, params: Optional[Dict] = None, columnar: bool = False) -> QueryResult:
         """Execute BigQuery query"""
         start_time = time.time()
 
@@ -623,7 +958,7 @@ class S3Provider(BaseConnectionProvider):
                 error=str(e)
             )
 
-    def execute_query(self, query: str, params: Optional[Dict] = None) -> QueryResult:
+    def execute_query(self, query: str, params: Optional[Dict] = None, columnar: bool = False) -> QueryResult:
         """Execute S3 operation (list, read, etc.)"""
         start_time = time.time()
 
@@ -695,6 +1030,10 @@ class ConnectionProviderFactory:
         """Register a new provider"""
         cls._providers[connection_type] = provider_class
 
+# SQLite reads files on this server; only offered with a sandbox directory
+if QUERY_CONFIG["SQLITE_SANDBOX_DIR"]:
+    ConnectionProviderFactory.register_provider(ConnectionType.SQLITE, SQLiteProvider)
+
 class ConnectionManager:
     """Manages multiple connections and their providers"""
     
@@ -727,7 +1066,9 @@ class ConnectionManager:
         
         return provider.test_connection()
     
-    def execute_query(self, connection: ConnectionModel, query: str, params: Optional[Dict] = None) -> QueryResult:
+    def execute_query(
+        self, connection: ConnectionModel, query: str, params: Optional[Dict] = None, columnar: bool = False
+    ) -> QueryResult:
         """Execute a query on a connection"""
         provider = self.get_provider(connection)
         if not provider:
@@ -736,7 +1077,7 @@ class ConnectionManager:
                 error=f"No provider available for connection type: {connection.type}"
             )
         
-        return provider.execute_query(query, params)
+        return provider.execute_query(query, params, columnar)
     
     def close_connection(self, connection_id: str) -> ConnectionResult:
         """Close a specific connection"""
@@ -3,9 +3,19 @@ Database provider abstraction layer for dynamic connection support
 """
 
 import logging
+import shlex
+import ssl
+import uuid
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, Generator
-from sqlalchemy import create_engine, Engine
+import orjson
+from typing import Optional, Dict, Any, Generator, Tuple
+from sqlalchemy import create_engine, Engine, URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 
@@ -19,12 +29,116 @@ from src.web.constants.config import (
 log = logging.getLogger(__name__)
 
 
+def json_serialize(value: Any) -> str:
+    """orjson-backed serializer shared by JSONField and the engines' JSON/JSONB codec"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def json_deserialize(value) -> Any:
+    """orjson-backed deserializer; accepts str or bytes"""
+    return orjson.loads(value)
+
+
+def asyncpg_connect_args(url: URL, pgbouncer: Optional[bool] = None) -> Tuple[URL, Dict[str, Any]]:
+    """
+    Translate a libpq-style PostgreSQL URL (as used by psycopg2 and in
+    SUPABASE_DB_URL) for asyncpg. SQLAlchemy hands URL query parameters to
+    asyncpg.connect() as keywords, and asyncpg names most of them
+    differently (sslmode is ssl, connect_timeout is timeout, ...), so they
+    are moved into connect_args. Returns the asyncpg URL without a query
+    string and the connect_args for create_async_engine.
+    """
+    query = dict(url.query)
+    connect_args: Dict[str, Any] = {}
+    server_settings: Dict[str, str] = {}
+
+    sslmode = query.pop("sslmode", None)
+    ssl_files = {name: query.pop(name) for name in ("sslrootcert", "sslcert", "sslkey") if name in query}
+    if ssl_files and sslmode != "disable":
+        connect_args["ssl"] = _ssl_context(sslmode, **ssl_files)
+    elif sslmode:
+        # asyncpg takes the libpq sslmode names as its ssl argument
+        connect_args["ssl"] = sslmode
+
+    if "connect_timeout" in query:
+        connect_args["timeout"] = float(query.pop("connect_timeout"))
+    if "target_session_attrs" in query:
+        connect_args["target_session_attrs"] = query.pop("target_session_attrs")
+    if "application_name" in query:
+        server_settings["application_name"] = query.pop("application_name")
+    if "options" in query:
+        server_settings.update(_parse_libpq_options(query.pop("options")))
+    if server_settings:
+        connect_args["server_settings"] = server_settings
+
+    pgbouncer_param = query.pop("pgbouncer", None)
+    if pgbouncer is None:
+        pgbouncer = (
+            (pgbouncer_param or "").lower() == "true"
+            or url.port == 6543
+            or (url.host or "").endswith(".pooler.supabase.com")
+        )
+    if pgbouncer:
+        # In transaction mode every transaction may run on another server
+        # connection: prepared statements must be neither cached (by asyncpg
+        # and by SQLAlchemy's dialect) nor reuse asyncpg's numbered names
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = _unique_statement_name
+
+    for name in query:
+        log.warning(f"Ignoring database URL parameter {name!r}: not supported by asyncpg")
+
+    return url.set(drivername="postgresql+asyncpg", query={}), connect_args
+
+
+def _ssl_context(sslmode: Optional[str], sslrootcert: Optional[str] = None,
+                 sslcert: Optional[str] = None, sslkey: Optional[str] = None) -> ssl.SSLContext:
+    """SSLContext for libpq's certificate file parameters"""
+    context = ssl.create_default_context(cafile=sslrootcert)
+    if sslmode in (None, "prefer", "allow", "require"):
+        # libpq only verifies the server certificate for verify-ca/verify-full
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif sslmode == "verify-ca":
+        context.check_hostname = False
+    if sslcert:
+        context.load_cert_chain(sslcert, sslkey)
+    return context
+
+
+def _parse_libpq_options(options: str) -> Dict[str, str]:
+    """Server settings from a libpq options string, e.g. "-c search_path=app -c statement_timeout=5000" """
+    settings = {}
+    words = iter(shlex.split(options))
+    for word in words:
+        if word == "-c":
+            word = next(words, "")
+        elif word.startswith("-c"):
+            word = word[2:]
+        else:
+            continue
+        name, _, value = word.partition("=")
+        if name and value:
+            settings[name.replace("-", "_")] = value
+    return settings
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
 class DatabaseProvider(ABC):
     """Abstract base class for database providers"""
     
+    # Async driver used to build the AsyncEngine URL from the sync URL
+    async_driver: str = "postgresql+asyncpg"
+
     def __init__(self):
         self.engine: Optional[Engine] = None
         self.session_factory: Optional[sessionmaker] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.async_session_factory: Optional[async_sessionmaker] = None
         self._client = None
     
     @abstractmethod
@@ -54,6 +168,8 @@ class DatabaseProvider(ABC):
                 max_overflow=DATABASE_CONFIG["MAX_OVERFLOW"],
                 pool_timeout=DATABASE_CONFIG["POOL_TIMEOUT"],
                 pool_recycle=DATABASE_CONFIG["POOL_RECYCLE"],
+                json_serializer=json_serialize,
+                json_deserializer=json_deserialize,
                 echo=DATABASE_CONFIG["ECHO"]
             )
             
@@ -74,6 +190,56 @@ class DatabaseProvider(ABC):
         
         return self.session_factory
     
+    def get_async_connect_args(self) -> Tuple[URL, Dict[str, Any]]:
+        """Get the async driver's connection URL and connect_args (see asyncpg_connect_args)"""
+        url, connect_args = asyncpg_connect_args(make_url(self.get_connection_url()), DATABASE_CONFIG["PGBOUNCER"])
+        return url.set(drivername=self.async_driver), connect_args
+
+    def create_async_engine(self) -> AsyncEngine:
+        """Create SQLAlchemy AsyncEngine"""
+        if self.async_engine is None:
+            connection_url, connect_args = self.get_async_connect_args()
+
+            self.async_engine = create_async_engine(
+                connection_url,
+                connect_args=connect_args,
+                pool_size=DATABASE_CONFIG["POOL_SIZE"],
+                max_overflow=DATABASE_CONFIG["MAX_OVERFLOW"],
+                pool_timeout=DATABASE_CONFIG["POOL_TIMEOUT"],
+                pool_recycle=DATABASE_CONFIG["POOL_RECYCLE"],
+                pool_pre_ping=True,
+                json_serializer=json_serialize,
+                json_deserializer=json_deserialize,
+                echo=DATABASE_CONFIG["ECHO"]
+            )
+
+            log.info(f"Async database engine created for {self.__class__.__name__}")
+
+        return self.async_engine
+
+    def create_async_session_factory(self) -> async_sessionmaker:
+        """Create SQLAlchemy AsyncSession factory"""
+        if self.async_session_factory is None:
+            engine = self.create_async_engine()
+            # expire_on_commit=False so ORM rows stay readable after commit
+            # without an implicit (and on AsyncSession, illegal) lazy refresh
+            self.async_session_factory = async_sessionmaker(
+                bind=engine,
+                class_=AsyncSession,
+                autoflush=False,
+                expire_on_commit=False
+            )
+            log.info(f"Async session factory created for {self.__class__.__name__}")
+
+        return self.async_session_factory
+
+    async def dispose_async_engine(self):
+        """Dispose AsyncEngine and close pooled connections"""
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+            self.async_engine = None
+            self.async_session_factory = None
+
     def get_session(self) -> Generator[Session, None, None]:
         """Get database session"""
         session_factory = self.create_session_factory()
@@ -1,13 +1,17 @@
-import json
 import logging
-from contextlib import contextmanager
-from typing import Any, Optional, Generator, Dict
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, Generator, AsyncGenerator, Dict
 from sqlalchemy import Dialect, create_engine, MetaData, types, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 from sqlalchemy.sql.type_api import _T
 from typing_extensions import Self
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
 from supabase import create_client, Client
 
 # Import configuration and providers
@@ -17,7 +21,9 @@ from src.web.constants.config import (
 ) 
 from src.web.internal.database_providers import (
     get_provider_instance,
-    DatabaseProvider
+    DatabaseProvider,
+    json_serialize,
+    json_deserialize
 )
 
 # Setup logging
@@ -30,28 +36,82 @@ Base = declarative_base()
 # Global variables for database connection
 engine = None
 SessionLocal = None
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
 supabase_client: Optional[Client] = None
 _db_provider: Optional[DatabaseProvider] = None
+
+
+class TransactionScope:
+    """
+    The session of an outermost get_db_context/get_async_db_context block,
+    or the sync or async session of a request
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.rollback_only = False
+
+
+class RequestScope:
+    """
+    Unit of work of one request (see request_db_scope). The sync and the
+    async session are each opened on the first table call that needs them,
+    so requests that never touch the database never check out a pooled
+    connection. They are two transactions: a request must not write the
+    same rows through both a sync and an async table.
+    """
+
+    def __init__(self):
+        self.sync: Optional[TransactionScope] = None
+        self.async_: Optional[TransactionScope] = None
+        self.rollback_only = False  # set by the middleware for server errors
+        self.closed = False
+
+
+class RollbackOnlyError(Exception):
+    """A nested database operation failed, so the enclosing transaction was rolled back"""
+
+
+# Nested table calls join the transaction of the block that is already open
+_sync_scope: ContextVar[Optional[TransactionScope]] = ContextVar("db_sync_scope", default=None)
+_async_scope: ContextVar[Optional[TransactionScope]] = ContextVar("db_async_scope", default=None)
+_request_scope: ContextVar[Optional[RequestScope]] = ContextVar("db_request_scope", default=None)
+
+
 class JSONField(types.TypeDecorator):
+    """
+    JSON column stored as native JSONB on PostgreSQL (encoded by the
+    engine's orjson json_serializer) and as orjson-encoded Text elsewhere
+    """
     impl = types.Text
     cache_ok = True
 
+    def load_dialect_impl(self, dialect: Dialect) -> types.TypeEngine:
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(types.Text())
+
     def process_bind_param(self, value: Optional[_T], dialect: Dialect) -> Any:
-        return json.dumps(value)
+        if dialect.name == "postgresql":
+            return value
+        return json_serialize(value)
 
     def process_result_value(self, value: Optional[_T], dialect: Dialect) -> Any:
+        if dialect.name == "postgresql":
+            return value
         if value is not None:
-            return json.loads(value)
+            return json_deserialize(value)
 
     def copy(self, **kw: Any) -> Self:
         return JSONField(self.impl.length)
 
     def db_value(self, value):
-        return json.dumps(value)
+        return json_serialize(value)
 
     def python_value(self, value):
         if value is not None:
-            return json.loads(value)
+            return json_deserialize(value)
 
 
 def get_database_provider() -> DatabaseProvider:
@@ -104,6 +164,36 @@ def init_database():
     return engine, SessionLocal
 
 
+def init_async_database():
+    """
+    Initialize async database engine and session factory using provider
+    """
+    global async_engine, AsyncSessionLocal
+
+    if async_engine is None:
+        provider = get_database_provider()
+
+        async_engine = provider.create_async_engine()
+        AsyncSessionLocal = provider.create_async_session_factory()
+
+        log.info(f"Async database initialized with {provider.__class__.__name__}")
+
+    return async_engine, AsyncSessionLocal
+
+
+async def close_async_database():
+    """
+    Dispose async engine (call on application shutdown)
+    """
+    global async_engine, AsyncSessionLocal
+
+    if async_engine is not None:
+        await get_database_provider().dispose_async_engine()
+        async_engine = None
+        AsyncSessionLocal = None
+        log.info("Async database engine disposed")
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Get database session for dependency injection
@@ -133,20 +223,168 @@ def get_supabase() -> Optional[Client]:
 @contextmanager
 def get_db_context():
     """
-    Context manager for database sessions
+    Context manager for database sessions. Inside a request every block
+    uses the request's session, which is committed when the request ends.
+    Elsewhere the outermost block commits on exit and blocks opened inside
+    it (a table method calling another) join its transaction. Either way an
+    exception in a joined block marks the transaction rollback-only, so it
+    is rolled back and reported even if a table method swallowed the error.
     """
     if SessionLocal is None:
         init_database()
 
-    db = SessionLocal()
+    scope = _sync_scope.get()
+    request = _request_scope.get()
+    if scope is None and request is not None and not request.closed:
+        if request.sync is None:
+            request.sync = TransactionScope(SessionLocal())
+        scope = request.sync
+    if scope is not None:
+        try:
+            yield scope.session
+        except HTTPException:
+            # A deliberate error response, not a failed database operation
+            raise
+        except Exception:
+            scope.rollback_only = True
+            raise
+        return
+
+    scope = TransactionScope(SessionLocal())
+    token = _sync_scope.set(scope)
     try:
+        yield scope.session
+        if scope.rollback_only:
+            raise RollbackOnlyError("A nested database operation failed")
+        scope.session.commit()
+    except Exception:
+        scope.session.rollback()
+        raise
+    finally:
+        _sync_scope.reset(token)
+        scope.session.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session for dependency injection
+    """
+    if AsyncSessionLocal is None:
+        init_async_database()
+
+    async with AsyncSessionLocal() as db:
         yield db
-        db.commit()
+
+
+@asynccontextmanager
+async def get_async_db_context():
+    """
+    Async context manager for database sessions, with the same nesting
+    rules as get_db_context
+    """
+    if AsyncSessionLocal is None:
+        init_async_database()
+
+    scope = _async_scope.get()
+    request = _request_scope.get()
+    if scope is None and request is not None and not request.closed:
+        if request.async_ is None:
+            request.async_ = TransactionScope(AsyncSessionLocal())
+        scope = request.async_
+    if scope is not None:
+        try:
+            yield scope.session
+        except HTTPException:
+            # A deliberate error response, not a failed database operation
+            raise
+        except Exception:
+            scope.rollback_only = True
+            raise
+        return
+
+    scope = TransactionScope(AsyncSessionLocal())
+    token = _async_scope.set(scope)
+    try:
+        yield scope.session
+        if scope.rollback_only:
+            raise RollbackOnlyError("A nested database operation failed")
+        await scope.session.commit()
     except Exception:
-        db.rollback()
+        await scope.session.rollback()
         raise
     finally:
-        db.close()
+        _async_scope.reset(token)
+        await scope.session.close()
+
+
+@asynccontextmanager
+async def request_db_scope() -> AsyncGenerator[RequestScope, None]:
+    """
+    Unit of work of one request: table calls made inside share the scope's
+    sessions, which are committed once on a clean exit. The work is rolled
+    back if the block raises or the scope is marked rollback_only; if a
+    table call failed inside it, it is rolled back and RollbackOnlyError is
+    raised. Table calls made after the scope ends (e.g. while a streaming
+    response is sent) get their own transactions again.
+    """
+    request = RequestScope()
+    token = _request_scope.set(request)
+    try:
+        yield request
+    except BaseException:
+        await _end_request_transactions(request, commit=False)
+        raise
+    else:
+        await _end_request_transactions(request, commit=not request.rollback_only)
+    finally:
+        request.closed = True
+        _request_scope.reset(token)
+
+
+async def release_db_session():
+    """
+    Commit what the current request has done so far and return its pooled
+    connections, so they are not held idle in a transaction across a long
+    await (an outbound call, a slow query, password hashing). Later table
+    calls open new sessions. Does nothing outside a request.
+    """
+    request = _request_scope.get()
+    if request is not None and not request.closed:
+        await _end_request_transactions(request, commit=True)
+
+
+async def _end_request_transactions(request: RequestScope, commit: bool):
+    sync, async_ = request.sync, request.async_
+    request.sync = request.async_ = None
+    failed = commit and any(scope.rollback_only for scope in (sync, async_) if scope is not None)
+    try:
+        if commit and not failed:
+            if sync is not None:
+                await run_in_threadpool(sync.session.commit)
+            if async_ is not None:
+                await async_.session.commit()
+        else:
+            if sync is not None:
+                await run_in_threadpool(sync.session.rollback)
+            if async_ is not None:
+                await async_.session.rollback()
+    finally:
+        if sync is not None:
+            await run_in_threadpool(sync.session.close)
+        if async_ is not None:
+            await async_.session.close()
+    if failed:
+        raise RollbackOnlyError("A database operation of the request failed")
+
+
+def after_commit(session, callback: Callable[[], None]):
+    """
+    Run callback once the transaction of session (sync or async) commits,
+    e.g. to invalidate a cache only when the change is visible to other
+    sessions. Nothing runs if the transaction rolls back.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    event.listen(sync_session, "after_commit", lambda _: callback(), once=True)
 
 
 def create_tables():
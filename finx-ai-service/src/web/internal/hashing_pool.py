@@ -0,0 +1,89 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt is deliberately slow (tens of milliseconds per call). Run inline in
+an ``async def`` handler it stalls every other request on the worker, so a
+burst of logins serializes the whole process. Hashes run here instead: a
+thread pool is enough because the bcrypt extension releases the GIL while
+hashing, and a semaphore caps how many hashes are in flight so a login
+burst queues up in front of the pool rather than inside it.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from src.web.constants.config import PASSWORD_HASH_CONFIG
+
+log = logging.getLogger(__name__)
+
+
+class HashingPool:
+    """Runs CPU-bound hashing calls in a bounded thread pool with queue metrics"""
+
+    def __init__(self, config: Dict):
+        self.max_workers = config["MAX_WORKERS"]
+        self.max_concurrency = config["MAX_CONCURRENCY"]
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Metrics
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run fn(*args) in the pool once a slot is free"""
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        started_at = time.perf_counter()
+        self.wait_seconds += started_at - queued_at
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.run_seconds += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.completed or 1
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "waiting": self.waiting,
+            "running": self.running,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "avg_wait_ms": round(self.wait_seconds / completed * 1000, 2),
+            "avg_run_ms": round(self.run_seconds / completed * 1000, 2),
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global password hashing pool
+hashing_pool = HashingPool(PASSWORD_HASH_CONFIG)
@@ -0,0 +1,64 @@
+"""
+Shared aiohttp sessions for outbound HTTP.
+
+Sessions live for the lifetime of the app (started and closed in the
+lifespan handler), so repeated connection tests and health checks reuse
+pooled keep-alive connections and cached DNS lookups instead of paying for
+a new TCP+TLS handshake per request. Request timeouts are passed per call.
+
+The sessions serve every user, so they keep no cookies: a cookie set by
+one user's test target must not be sent with another user's request.
+"""
+
+import logging
+from typing import Dict
+
+import aiohttp
+
+from src.web.constants.config import HTTP_CLIENT_CONFIG
+
+log = logging.getLogger(__name__)
+
+
+class HTTPClientRegistry:
+    """Named, lazily created aiohttp sessions sharing one set of limits"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.config["MAX_CONNECTIONS"],
+            limit_per_host=self.config["MAX_CONNECTIONS_PER_HOST"],
+            ttl_dns_cache=self.config["DNS_CACHE_TTL"],
+            keepalive_timeout=self.config["KEEPALIVE_TIMEOUT"],
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=self.config["DEFAULT_TIMEOUT"]),
+        )
+
+    def get_session(self, name: str = "default") -> aiohttp.ClientSession:
+        """Return the shared session for name, creating it on first use"""
+        session = self._sessions.get(name)
+        if session is None or session.closed:
+            session = self._create_session()
+            self._sessions[name] = session
+        return session
+
+    def start(self):
+        self.get_session()
+
+    async def close(self):
+        sessions, self._sessions = self._sessions, {}
+        for name, session in sessions.items():
+            try:
+                await session.close()
+            except Exception as e:
+                log.warning(f"Error closing HTTP session {name}: {e}")
+
+
+# Global HTTP client registry
+http_client = HTTPClientRegistry(HTTP_CLIENT_CONFIG)
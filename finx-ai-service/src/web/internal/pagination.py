@@ -0,0 +1,67 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by a timestamp column with the primary key as a tie
+breaker, and the next page starts strictly after the last row returned:
+``WHERE (ts, id) < (:ts, :id)``. Unlike OFFSET this stays index-backed no
+matter how deep the client pages.
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+
+
+def encode_cursor(ts: int, id: str) -> str:
+    """Build an opaque cursor token from the last row of a page"""
+    raw = json.dumps([ts, id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, str]:
+    """Decode a cursor token back into its (ts, id) pair"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts, id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise InvalidCursorError(cursor) from e
+
+    if not isinstance(ts, int) or not isinstance(id, str):
+        raise InvalidCursorError(cursor)
+    return ts, id
+
+
+def keyset_filter(ts_column, id_column, cursor: str, descending: bool = True):
+    """WHERE clause selecting the rows after ``cursor`` in (ts, id) order"""
+    ts, id = decode_cursor(cursor)
+    if descending:
+        return tuple_(ts_column, id_column) < tuple_(ts, id)
+    return tuple_(ts_column, id_column) > tuple_(ts, id)
+
+
+def keyset_order(ts_column, id_column, descending: bool = True) -> tuple:
+    """ORDER BY clause matching keyset_filter"""
+    if descending:
+        return ts_column.desc(), id_column.desc()
+    return ts_column.asc(), id_column.asc()
+
+
+def paginate(
+    rows: Sequence[Any], limit: int, ts_attr: str, id_attr: str = "id"
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Split a result fetched with ``limit + 1`` rows into the page to return
+    and the cursor for the next one (None on the last page)
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+
+    last = page[-1]
+    return page, encode_cursor(getattr(last, ts_attr), getattr(last, id_attr))
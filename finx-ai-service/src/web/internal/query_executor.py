@@ -0,0 +1,355 @@
+"""
+Query execution service for user data source connections.
+
+Provider clients are blocking (SQLAlchemy engines, cloud SDKs), so every
+call runs on a bounded thread pool instead of the event loop. Concurrency
+per connection is capped at Connection.max_connections and each call is
+bounded by Connection.timeout_seconds; on timeout the provider is asked to
+cancel whatever it is still running.
+
+Queries on providers whose planner estimates cost (PostgreSQL) are planned
+with EXPLAIN first and rejected if the estimate is over QUERY_CONFIG
+["DRY_RUN_MAX_COST"] or ["DRY_RUN_MAX_ROWS"], before they burn warehouse time.
+
+stream_query() pulls result batches one at a time from the provider's
+cursor, so a slow client holds back the fetch instead of rows piling up in
+memory.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlglot import exp
+
+from src.core.engine import SQLGLOT_DIALECTS, check_estimate, prepare_sql
+from src.web.constants.config import QUERY_CACHE_CONFIG, QUERY_CONFIG
+from src.web.internal.connection_providers import (
+    BaseConnectionProvider,
+    ConnectionResult,
+    QueryResult,
+    connection_manager,
+    run_with_cancel_token,
+)
+from src.web.internal.result_cache import is_cacheable_query, query_result_cache
+from src.web.models.connections import ConnectionModel
+
+log = logging.getLogger(__name__)
+
+
+class QueryExecutor:
+    """Runs provider calls off the event loop with per-connection limits"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, Tuple[int, asyncio.Semaphore]] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="finx-query"
+            )
+        return self._executor
+
+    def _get_semaphore(self, connection: ConnectionModel) -> asyncio.Semaphore:
+        size = max(1, connection.max_connections)
+        entry = self._semaphores.get(connection.id)
+        if entry is None or entry[0] != size:
+            entry = (size, asyncio.Semaphore(size))
+            self._semaphores[connection.id] = entry
+        return entry[1]
+
+    async def run(
+        self,
+        connection: ConnectionModel,
+        provider: BaseConnectionProvider,
+        func: Callable[..., Any],
+        *args,
+        timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run a blocking provider call on the thread pool. Raises
+        asyncio.TimeoutError if it does not finish within the timeout.
+        """
+        timeout = timeout or connection.timeout_seconds
+        loop = asyncio.get_running_loop()
+
+        token = object()
+        semaphore = self._get_semaphore(connection)
+        await semaphore.acquire()
+        try:
+            future = self._get_executor().submit(run_with_cancel_token, token, func, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        # The slot is held until the worker thread is done, not until the
+        # caller stops waiting: a call that timed out keeps counting against
+        # max_connections while its statement is still being cancelled
+        future.add_done_callback(functools.partial(_release_threadsafe, loop, semaphore))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # The worker thread cannot be killed; ask the driver to abort
+            # this call's statement (the provider is shared by all users)
+            provider.cancel(token)
+            raise
+
+    async def execute(
+        self,
+        connection: ConnectionModel,
+        query: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        columnar: bool = False,
+        use_cache: bool = True,
+        preview_rows: Optional[int] = None,
+        dry_run: bool = False
+    ) -> QueryResult:
+        """
+        Execute a query on a connection. Read results are served from and
+        stored in query_result_cache unless use_cache is False.
+
+        With preview_rows set, SQL queries are rewritten to fetch one row
+        more than that (in the connection's dialect) so the result can be
+        flagged as truncated without pulling the full result set.
+
+        Before running, queries on providers with cost estimates are
+        planned and rejected if the estimate is over the dry-run limits; the
+        estimate is returned on the result. With dry_run set the query is
+        only planned.
+        """
+        if preview_rows is not None:
+            query = self._limit_query(connection, query, preview_rows + 1)
+
+        use_cache = (
+            not dry_run and use_cache and QUERY_CACHE_CONFIG["ENABLED"] and is_cacheable_query(query, connection.type)
+        )
+        if use_cache:
+            cache_key = query_result_cache.make_key(connection.id, query, params, columnar)
+            cached = await query_result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        provider = connection_manager.get_provider(connection)
+        if not provider:
+            return QueryResult(
+                success=False,
+                error=f"No provider available for connection type: {connection.type}"
+            )
+
+        start_time = time.time()
+        try:
+            if dry_run:
+                return await self._estimate(connection, provider, query, params, timeout)
+            planned = await self._check_cost(connection, provider, query, params, timeout)
+            if planned is not None and not planned.success:
+                return planned
+
+            result = await self.run(
+                connection, provider, provider.execute_query, query, params, columnar, timeout=timeout
+            )
+            if planned is not None:
+                result.estimate = planned.estimate
+            if preview_rows is not None:
+                result.truncate(preview_rows)
+            if use_cache:
+                await query_result_cache.set(cache_key, result)
+            return result
+        except asyncio.TimeoutError:
+            return QueryResult(
+                success=False,
+                error=f"Query timed out after {timeout or connection.timeout_seconds}s",
+                execution_time=time.time() - start_time
+            )
+
+    async def _estimate(
+        self,
+        connection: ConnectionModel,
+        provider: BaseConnectionProvider,
+        query: str,
+        params: Optional[Dict],
+        timeout: Optional[float]
+    ) -> QueryResult:
+        """
+        Plan the query with EXPLAIN. The result carries the planner's
+        estimate and fails if the statement cannot be planned or the
+        estimate exceeds QUERY_CONFIG["DRY_RUN_MAX_COST"] / ["DRY_RUN_MAX_ROWS"].
+        """
+        start_time = time.time()
+        try:
+            estimate = await self.run(connection, provider, provider.explain, query, params, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            return QueryResult(
+                success=False, error=f"EXPLAIN failed: {e}", execution_time=time.time() - start_time
+            )
+        if estimate is None:
+            return QueryResult(
+                success=False,
+                error=f"Dry runs are not supported for connection type: {connection.type}",
+                execution_time=time.time() - start_time
+            )
+
+        error = check_estimate(estimate, QUERY_CONFIG["DRY_RUN_MAX_COST"], QUERY_CONFIG["DRY_RUN_MAX_ROWS"])
+        return QueryResult(
+            success=error is None, error=error, estimate=estimate, execution_time=time.time() - start_time
+        )
+
+    async def _check_cost(
+        self,
+        connection: ConnectionModel,
+        provider: BaseConnectionProvider,
+        query: str,
+        params: Optional[Dict],
+        timeout: Optional[float]
+    ) -> Optional[QueryResult]:
+        """
+        The dry run made before executing a query, for providers with cost
+        estimates while a limit is set. Statements EXPLAIN cannot plan (e.g.
+        DDL) are let through; executing them reports any real error.
+        """
+        if not provider.has_cost_estimates:
+            return None
+        if not (QUERY_CONFIG["DRY_RUN_MAX_COST"] or QUERY_CONFIG["DRY_RUN_MAX_ROWS"]):
+            return None
+
+        planned = await self._estimate(connection, provider, query, params, timeout)
+        if planned.estimate is None:
+            log.debug(f"Running query without a dry run: {planned.error}")
+            return None
+        return planned
+
+    @staticmethod
+    def _limit_query(connection: ConnectionModel, query: str, limit: int) -> str:
+        if connection.type not in SQLGLOT_DIALECTS:
+            return query
+        prepared = prepare_sql(query, connection.type, limit=limit, quote=False)
+        if prepared.error or not isinstance(prepared.expression, exp.Query):
+            # Other statements are run exactly as written
+            log.debug(f"Running preview query without a row limit: {prepared.error or 'not a query'}")
+            return query
+        return prepared.sql
+
+    async def stream_query(
+        self,
+        connection: ConnectionModel,
+        query: str,
+        params: Optional[Dict] = None,
+        max_rows: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Tuple[List[str], List[tuple]]]:
+        """
+        Yield (columns, rows) batches of a query result, stopping after
+        max_rows rows (capped at QUERY_CONFIG["STREAM_MAX_ROWS"]). The next
+        batch is only fetched once the previous one has been consumed; each
+        fetch is bounded by the timeout. Raises ValueError if the dry run
+        rejects the query. A slot of the connection's
+        concurrency limit is held until the generator is closed.
+        """
+        provider = connection_manager.get_provider(connection)
+        if not provider:
+            raise ValueError(f"No provider available for connection type: {connection.type}")
+
+        timeout = timeout or connection.timeout_seconds
+        planned = await self._check_cost(connection, provider, query, params, timeout)
+        if planned is not None and not planned.success:
+            raise ValueError(planned.error)
+
+        batch_size = batch_size or QUERY_CONFIG["STREAM_BATCH_SIZE"]
+        max_rows = min(max_rows or QUERY_CONFIG["STREAM_MAX_ROWS"], QUERY_CONFIG["STREAM_MAX_ROWS"])
+        executor = self._get_executor()
+        token = object()
+
+        async with self._get_semaphore(connection):
+            batches = provider.iter_query(query, params, batch_size)
+            pending: Optional[Future] = None
+            sent = 0
+            try:
+                while sent < max_rows:
+                    pending = executor.submit(run_with_cancel_token, token, next, batches, None)
+                    try:
+                        batch = await asyncio.wait_for(asyncio.wrap_future(pending), timeout)
+                    except (asyncio.TimeoutError, asyncio.CancelledError):
+                        provider.cancel(token)
+                        raise
+                    if batch is None:
+                        break
+
+                    columns, rows = batch
+                    rows = rows[:max_rows - sent]
+                    sent += len(rows)
+                    yield columns, rows
+            finally:
+                # Closing releases the cursor and pooled connection; it has
+                # to wait for a fetch that is still running after a timeout
+                await asyncio.get_running_loop().run_in_executor(
+                    executor, _close_batches, batches, pending
+                )
+
+    async def test_connection(self, connection: ConnectionModel) -> ConnectionResult:
+        """Test a connection"""
+        provider = connection_manager.get_provider(connection)
+        if not provider:
+            return ConnectionResult(
+                success=False,
+                message=f"No provider available for connection type: {connection.type}"
+            )
+
+        start_time = time.time()
+        try:
+            return await self.run(connection, provider, provider.test_connection)
+        except asyncio.TimeoutError:
+            return ConnectionResult(
+                success=False,
+                message="Connection test timed out",
+                error=f"Timed out after {connection.timeout_seconds}s",
+                response_time=time.time() - start_time
+            )
+
+    async def release(self, connection_id: str):
+        """
+        Drop the provider and pool for a connection, e.g. after its
+        settings changed or it was deleted
+        """
+        self._semaphores.pop(connection_id, None)
+        await query_result_cache.invalidate(connection_id)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self._get_executor(), connection_manager.close_connection, connection_id
+        )
+
+    def shutdown(self):
+        """Close every pooled connection and stop the worker threads"""
+        connection_manager.close_all_connections()
+        self._semaphores.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore, _future: Future):
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        # The loop is closed; nothing waits on the semaphore any more
+        pass
+
+
+def _close_batches(batches: Iterator, pending: Optional[Future]):
+    if pending is not None:
+        try:
+            pending.result()
+        except Exception:
+            pass
+    batches.close()
+
+
+# Global query executor instance
+query_executor = QueryExecutor(QUERY_CONFIG["MAX_WORKERS"])
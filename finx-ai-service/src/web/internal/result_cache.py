@@ -0,0 +1,239 @@
+"""
+Result cache for queries executed against user connections.
+
+Entries are keyed on the connection id, the whitespace-normalized SQL
+(squish_sql) and the bound parameters, so re-issued dashboard and follow-up
+queries are answered without hitting the warehouse again. Results live in an
+in-process TTL/LRU cache; when QUERY_CACHE_CONFIG["REDIS_URL"] is set they
+are also written to Redis so that workers share them, as long as every
+value survives a JSON round trip unchanged. Only successful results up to
+MAX_ROWS rows of plain reads are cached (see is_cacheable_query), and every
+entry of a connection is dropped when the connection is changed or deleted.
+"""
+
+import dataclasses
+import hashlib
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set, Tuple
+
+import orjson
+import sqlglot
+from sqlglot import exp
+
+from src.core.engine import SQLGLOT_DIALECTS, squish_sql
+from src.web.constants.config import QUERY_CACHE_CONFIG
+from src.web.internal.cache import TTLCache
+from src.web.internal.connection_providers import QueryResult
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # Redis backing is optional
+    aioredis = None
+
+log = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "finx:query-result"
+
+# Nodes that make a query write, lock rows or return something new each run
+UNCACHEABLE_NODES = (
+    exp.Insert, exp.Update, exp.Delete, exp.Merge, exp.Into, exp.Lock,
+    exp.CurrentDate, exp.CurrentDatetime, exp.CurrentTime, exp.CurrentTimestamp,
+    exp.CurrentTimestampLTZ, exp.Rand, exp.Uuid,
+)
+# Volatile functions sqlglot parses as anonymous calls
+VOLATILE_FUNCTIONS = frozenset({
+    "nextval", "setval", "currval", "lastval", "clock_timestamp", "statement_timestamp",
+    "transaction_timestamp", "timeofday", "now", "random", "gen_random_uuid",
+    "uuid_generate_v4", "newid", "sysdate", "systimestamp", "getdate", "pg_sleep",
+    "txid_current",
+})
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so formatting differences share an entry"""
+    try:
+        return squish_sql(query)
+    except Exception:
+        return " ".join(query.split())
+
+
+@lru_cache(maxsize=1024)
+def is_cacheable_query(query: str, connection_type: str) -> bool:
+    """
+    True for a single read-only query whose result only depends on the
+    data: no DML (including data-modifying CTEs), SELECT INTO, locking
+    clauses or volatile functions. Queries of connection types sqlglot
+    cannot parse are never cached.
+    """
+    dialect = SQLGLOT_DIALECTS.get(connection_type)
+    if dialect is None:
+        return False
+    try:
+        statements = [statement for statement in sqlglot.parse(query, read=dialect) if statement is not None]
+    except Exception:
+        return False
+    if len(statements) != 1 or not isinstance(statements[0], exp.Query):
+        return False
+
+    for node in statements[0].walk():
+        if isinstance(node, UNCACHEABLE_NODES):
+            return False
+        if isinstance(node, exp.Anonymous) and node.name.lower() in VOLATILE_FUNCTIONS:
+            return False
+    return True
+
+
+def _json_exact(value: Any) -> bool:
+    """Whether value comes back from a JSON round trip as the same type and value"""
+    if value is None or isinstance(value, (bool, str)):
+        return True
+    if isinstance(value, int):
+        return -2**63 <= value < 2**64
+    if isinstance(value, float):
+        return math.isfinite(value)
+    if isinstance(value, list):
+        return all(_json_exact(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _json_exact(item) for key, item in value.items())
+    return False
+
+
+class QueryResultCache:
+    """Two-level (process, optional Redis) cache of QueryResult objects"""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: int,
+        max_rows: int,
+        redis_url: Optional[str] = None
+    ):
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._local = TTLCache(maxsize=maxsize, ttl=ttl, on_evict=self._forget)
+        self._keys: Dict[str, Set[Tuple]] = {}
+        self._redis = None
+        self.redis_hits = 0
+        self.redis_errors = 0
+
+        if redis_url:
+            if aioredis is None:
+                log.warning("QUERY_CACHE_REDIS_URL is set but redis is not installed; using the local cache only")
+            else:
+                self._redis = aioredis.from_url(redis_url)
+
+    def make_key(self, connection_id: str, query: str, params: Optional[Dict], columnar: bool) -> Tuple:
+        return (
+            connection_id,
+            normalize_query(query),
+            orjson.dumps(params or {}, option=orjson.OPT_SORT_KEYS, default=str),
+            columnar,
+        )
+
+    async def get(self, key: Tuple) -> Optional[QueryResult]:
+        result = self._local.get(key)
+        if result is not None or self._redis is None:
+            return result
+
+        try:
+            payload = await self._redis.get(self._redis_key(key))
+        except Exception as e:
+            self.redis_errors += 1
+            log.warning(f"Query cache read from Redis failed: {e}")
+            return None
+        if payload is None:
+            return None
+
+        self.redis_hits += 1
+        result = QueryResult(**orjson.loads(payload))
+        self._store_local(key, result)
+        return result
+
+    async def set(self, key: Tuple, result: QueryResult):
+        """
+        Cache a successful, small enough result. Callers check
+        is_cacheable_query first. Results holding values JSON cannot
+        reproduce (dates, decimals, bytes, ...) stay in the local cache
+        only, so a Redis hit never changes a value's type.
+        """
+        if not result.success:
+            return
+        if result.row_count is not None and result.row_count > self.max_rows:
+            return
+
+        self._store_local(key, result)
+        if self._redis is None:
+            return
+
+        values = result.column_values if result.column_values is not None else result.data
+        if not _json_exact(values):
+            return
+
+        redis_key = self._redis_key(key)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.set(redis_key, orjson.dumps(dataclasses.asdict(result)), ex=self.ttl)
+                pipe.sadd(self._redis_index_key(key[0]), redis_key)
+                pipe.expire(self._redis_index_key(key[0]), self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            self.redis_errors += 1
+            log.warning(f"Query cache write to Redis failed: {e}")
+
+    async def invalidate(self, connection_id: str):
+        """Drop every cached result of a connection"""
+        for key in list(self._keys.get(connection_id, ())):
+            self._local.pop(key)
+        self._keys.pop(connection_id, None)
+
+        if self._redis is None:
+            return
+        index_key = self._redis_index_key(connection_id)
+        try:
+            redis_keys = await self._redis.smembers(index_key)
+            await self._redis.delete(index_key, *redis_keys)
+        except Exception as e:
+            self.redis_errors += 1
+            log.warning(f"Query cache invalidation in Redis failed for {connection_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._local.stats(),
+            "redis_enabled": self._redis is not None,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+        }
+
+    async def close(self):
+        self._local.clear()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def _store_local(self, key: Tuple, result: QueryResult):
+        self._local.set(key, result)
+        self._keys.setdefault(key[0], set()).add(key)
+
+    def _forget(self, key: Tuple, value: QueryResult):
+        keys = self._keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                self._keys.pop(key[0], None)
+
+    def _redis_key(self, key: Tuple) -> str:
+        digest = hashlib.sha256(repr(key[1:]).encode()).hexdigest()
+        return f"{REDIS_KEY_PREFIX}:{key[0]}:{digest}"
+
+    def _redis_index_key(self, connection_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{connection_id}:keys"
+
+
+# Global query result cache instance
+query_result_cache = QueryResultCache(
+    maxsize=QUERY_CACHE_CONFIG["MAX_SIZE"],
+    ttl=QUERY_CACHE_CONFIG["TTL"],
+    max_rows=QUERY_CACHE_CONFIG["MAX_ROWS"],
+    redis_url=QUERY_CACHE_CONFIG["REDIS_URL"]
+)
@@ -1,10 +1,10 @@
 # Import all models and their table instances
-from .users import User, UserModel, Users
+from .users import User, UserModel, Users, AsyncUsers
 from .auths import Auth, AuthModel, Auths
-from .chats import Chat, ChatModel, Chats, Folder, FolderModel, Folders
+from .chats import Chat, ChatModel, ChatSummaryModel, Chats, AsyncChats, Folder, FolderModel, Folders
 from .groups import Group, GroupModel, Groups
 from .channels import Channel, ChannelModel, Channels
-from .messages import Message, MessageModel, Messages, MessageReaction, MessageReactionModel, MessageReactions
+from .messages import Message, MessageModel, Messages, AsyncMessages, MessageReaction, MessageReactionModel, MessageReactions, AsyncMessageReactions
 from .files import File, FileModel, Files
 from .models import Model, ModelModel, Models
 from .tags import Tag, TagModel, Tags
@@ -22,12 +22,15 @@ __all__ = [
     "ConnectionTemplate", "ConnectionLog",
 
     # Pydantic Models
-    "UserModel", "AuthModel", "ChatModel", "FolderModel", "GroupModel", "ChannelModel",
+    "UserModel", "AuthModel", "ChatModel", "ChatSummaryModel", "FolderModel", "GroupModel", "ChannelModel",
     "MessageModel", "MessageReactionModel", "FileModel", "ModelModel", "TagModel",
     "MemoryModel", "FeedbackModel", "KnowledgeModel", "PromptModel", "ConnectionModel",
     "ConnectionTemplateModel", "ConnectionLogModel",
 
     # Table Instances
     "Users", "Auths", "Chats", "Folders", "Groups", "Channels", "Messages", "MessageReactions",
-    "Files", "Models", "Tags", "Memories", "Feedbacks", "Knowledges", "Prompts", "Connections"
+    "Files", "Models", "Tags", "Memories", "Feedbacks", "Knowledges", "Prompts", "Connections",
+
+    # Async Table Instances
+    "AsyncUsers", "AsyncChats", "AsyncMessages", "AsyncMessageReactions"
 ]
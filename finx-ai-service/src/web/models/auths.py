@@ -1,32 +1,65 @@
+import asyncio
 import logging
 import uuid
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
-import hashlib
-from src.web.internal.db import Base, JSONField, get_db_context
-from .users import UserModel, Users
+from src.web.internal.db import Base, JSONField, get_db_context, get_async_db_context, release_db_session
+from src.web.internal.hashing_pool import hashing_pool
+from .users import UserModel, Users, AsyncUsers
 from src.web.constants.config import SRC_LOG_LEVELS
+from passlib.context import CryptContext
 from pydantic import BaseModel
-from sqlalchemy import Boolean, Column, String, Text
+from sqlalchemy import Boolean, Column, String, Text, Index, select, update
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
-# Simple password verification function
+logging.getLogger("passlib").setLevel(logging.ERROR)
+
+# bcrypt for new hashes; unsalted SHA-256 hex digests from before still
+# verify and are rehashed on the next successful async login
+pwd_context = CryptContext(schemes=["bcrypt", "hex_sha256"], deprecated="auto")
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     if not hashed_password:
         return False
-    # For now, using simple SHA256 - replace with bcrypt in production
-    return hashlib.sha256(plain_password.encode()).hexdigest() == hashed_password
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except ValueError:
+        return False
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(verified, new hash if the stored one uses a deprecated scheme)"""
+    if not hashed_password:
+        return False, None
+    try:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    except ValueError:
+        return False, None
 
 def hash_password(password: str) -> str:
-    """Simple password hashing - in production, use proper hashing like bcrypt"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """bcrypt hash; CPU-heavy, so async code should go through hashing_pool"""
+    return pwd_context.hash(password)
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password(uuid.uuid4().hex)
+
+def verify_unknown_user(plain_password: str):
+    """
+    Spend the time of a real verification when the email is unknown, so
+    response times do not tell which accounts exist
+    """
+    verify_password(plain_password, _dummy_hash())
 
 
 class Auth(Base):
     __tablename__ = "auth"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_auth_email_active", "email", "active"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     email = Column(String)
@@ -106,6 +139,19 @@ class AuthsTable:
         profile_image_url: str = "/user.png",
         role: str = "pending",
         oauth_sub: Optional[str] = None,
+    ) -> Optional[UserModel]:
+        return self.insert_new_auth_with_hash(
+            email, hash_password(password), name, profile_image_url, role, oauth_sub
+        )
+
+    def insert_new_auth_with_hash(
+        self,
+        email: str,
+        password_hash: str,
+        name: str,
+        profile_image_url: str = "/user.png",
+        role: str = "pending",
+        oauth_sub: Optional[str] = None,
     ) -> Optional[UserModel]:
         with get_db_context() as db:
             log.info("insert_new_auth")
@@ -113,7 +159,7 @@ class AuthsTable:
             id = str(uuid.uuid4())
 
             auth = AuthModel(
-                **{"id": id, "email": email, "password": hash_password(password), "active": True}
+                **{"id": id, "email": email, "password": password_hash, "active": True}
             )
             result = Auth(**auth.model_dump())
             db.add(result)
@@ -122,7 +168,7 @@ class AuthsTable:
                 id, name, email, profile_image_url, role, oauth_sub
             )
 
-            db.commit()
+            db.flush()
             db.refresh(result)
 
             if result and user:
@@ -142,6 +188,7 @@ class AuthsTable:
                     else:
                         return None
                 else:
+                    verify_unknown_user(password)
                     return None
         except Exception:
             return None
@@ -175,7 +222,7 @@ class AuthsTable:
                 result = (
                     db.query(Auth).filter_by(id=id).update({"password": hash_password(new_password)})
                 )
-                db.commit()
+                db.flush()
                 return True if result == 1 else False
         except Exception:
             return False
@@ -184,7 +231,7 @@ class AuthsTable:
         try:
             with get_db_context() as db:
                 result = db.query(Auth).filter_by(id=id).update({"email": email})
-                db.commit()
+                db.flush()
                 return True if result == 1 else False
         except Exception:
             return False
@@ -197,7 +244,7 @@ class AuthsTable:
 
                 if result:
                     db.query(Auth).filter_by(id=id).delete()
-                    db.commit()
+                    db.flush()
 
                     return True
                 else:
@@ -206,4 +253,64 @@ class AuthsTable:
             return False
 
 
+class AsyncAuthsTable:
+    """Async variant of AuthsTable; password hashing runs on hashing_pool"""
+
+    async def insert_new_auth(
+        self,
+        email: str,
+        password: str,
+        name: str,
+        profile_image_url: str = "/user.png",
+        role: str = "pending",
+        oauth_sub: Optional[str] = None,
+    ) -> Optional[UserModel]:
+        await release_db_session()
+        password_hash = await hashing_pool.run(hash_password, password)
+        # The insert goes through the sync Users table; keep it off the loop
+        return await asyncio.to_thread(
+            Auths.insert_new_auth_with_hash,
+            email, password_hash, name, profile_image_url, role, oauth_sub
+        )
+
+    async def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
+        log.info(f"authenticate_user: {email}")
+        try:
+            async with get_async_db_context() as db:
+                auth = (
+                    await db.execute(select(Auth.id, Auth.password).filter_by(email=email, active=True))
+                ).first()
+            # No pooled connection is held while the login waits for and
+            # runs a bcrypt verify
+            await release_db_session()
+
+            if not auth:
+                await hashing_pool.run(verify_unknown_user, password)
+                return None
+
+            verified, new_hash = await hashing_pool.run(
+                verify_and_update_password, password, auth.password
+            )
+            if not verified:
+                return None
+            if new_hash:
+                async with get_async_db_context() as db:
+                    await db.execute(update(Auth).filter_by(id=auth.id).values(password=new_hash))
+
+            return await AsyncUsers.get_user_by_id(auth.id)
+        except Exception:
+            return None
+
+    async def update_user_password_by_id(self, id: str, new_password: str) -> bool:
+        try:
+            await release_db_session()
+            password_hash = await hashing_pool.run(hash_password, new_password)
+            async with get_async_db_context() as db:
+                result = await db.execute(update(Auth).filter_by(id=id).values(password=password_hash))
+                return result.rowcount == 1
+        except Exception:
+            return False
+
+
 Auths = AuthsTable()
+AsyncAuths = AsyncAuthsTable()
@@ -73,7 +73,7 @@ class ChannelsTable:
             )
             result = Channel(**channel.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return channel
@@ -117,7 +117,7 @@ class ChannelsTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Channel).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 channel = db.query(Channel).filter_by(id=id).first()
                 return ChannelModel.model_validate(channel) if channel else None
         except Exception:
@@ -127,7 +127,7 @@ class ChannelsTable:
         try:
             with get_db_context() as db:
                 db.query(Channel).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -136,7 +136,7 @@ class ChannelsTable:
         try:
             with get_db_context() as db:
                 db.query(Channel).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
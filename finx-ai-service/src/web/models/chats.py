@@ -2,13 +2,19 @@ import time
 import uuid
 from typing import Optional, List
 
-from src.web.internal.db import Base, JSONField, get_db_context
+from src.web.internal.db import Base, JSONField, get_db_context, get_async_db_context
+from src.web.internal.pagination import keyset_filter, keyset_order
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, ForeignKey, select, update, delete, Index
+from sqlalchemy.orm import load_only
 
 class Folder(Base):
     __tablename__ = "folder"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_folder_user_id_created_at", "user_id", "created_at"),
+        Index("ix_folder_parent_id_user_id_created_at", "parent_id", "user_id", "created_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     parent_id = Column(String, ForeignKey("folder.id", ondelete="CASCADE"), nullable=True)
@@ -35,7 +41,13 @@ class FolderModel(BaseModel):
 
 class Chat(Base):
     __tablename__ = "chat"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_chat_user_id_updated_at", "user_id", "updated_at"),
+        Index("ix_chat_user_id_archived_updated_at", "user_id", "archived", "updated_at"),
+        Index("ix_chat_user_id_pinned_updated_at", "user_id", "pinned", "updated_at"),
+        Index("ix_chat_folder_id_user_id_updated_at", "folder_id", "user_id", "updated_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -49,6 +61,9 @@ class Chat(Base):
     meta = Column(JSONField, default={})
     folder_id = Column(String, ForeignKey("folder.id", ondelete="SET NULL"), nullable=True)
 
+# Columns loaded for chat listings; the chat JSON column is never fetched
+CHAT_SUMMARY_COLUMNS = (Chat.id, Chat.title, Chat.updated_at, Chat.pinned, Chat.archived, Chat.folder_id)
+
 class ChatModel(BaseModel):
     id: str
     user_id: str
@@ -64,6 +79,17 @@ class ChatModel(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ChatSummaryModel(BaseModel):
+    """Sidebar projection of a chat, without the conversation blob"""
+    id: str
+    title: str
+    updated_at: int
+    pinned: bool = False
+    archived: bool = False
+    folder_id: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
 class FolderForm(BaseModel):
     name: str
     parent_id: Optional[str] = None
@@ -110,7 +136,7 @@ class FoldersTable:
             )
             result = Folder(**folder.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return folder
@@ -140,7 +166,7 @@ class FoldersTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Folder).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 folder = db.query(Folder).filter_by(id=id).first()
                 return FolderModel.model_validate(folder) if folder else None
         except Exception:
@@ -153,7 +179,7 @@ class FoldersTable:
                 self._delete_subfolders_recursive(db, id)
                 # Delete the folder itself
                 db.query(Folder).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -182,7 +208,7 @@ class ChatsTable:
             )
             result = Chat(**chat.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return chat
@@ -205,54 +231,44 @@ class ChatsTable:
         except Exception:
             return None
 
-    def get_chats_by_user_id(self, user_id: str, skip: int = 0, limit: int = 50) -> List[ChatModel]:
+    def get_chats_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
         with get_db_context() as db:
-            chats = (
-                db.query(Chat)
-                .filter_by(user_id=user_id)
-                .order_by(Chat.updated_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
-            return [ChatModel.model_validate(chat) for chat in chats]
+            query = db.query(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(user_id=user_id)
+            if cursor:
+                query = query.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = query.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit).all()
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
 
-    def get_chats_by_folder_id(self, folder_id: Optional[str], user_id: str) -> List[ChatModel]:
+    def get_chats_by_folder_id(self, folder_id: Optional[str], user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
         with get_db_context() as db:
-            chats = (
-                db.query(Chat)
-                .filter_by(folder_id=folder_id, user_id=user_id)
-                .order_by(Chat.updated_at.desc())
-                .all()
-            )
-            return [ChatModel.model_validate(chat) for chat in chats]
+            query = db.query(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(folder_id=folder_id, user_id=user_id)
+            if cursor:
+                query = query.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = query.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit).all()
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
 
-    def get_archived_chats_by_user_id(self, user_id: str) -> List[ChatModel]:
+    def get_archived_chats_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
         with get_db_context() as db:
-            chats = (
-                db.query(Chat)
-                .filter_by(user_id=user_id, archived=True)
-                .order_by(Chat.updated_at.desc())
-                .all()
-            )
-            return [ChatModel.model_validate(chat) for chat in chats]
+            query = db.query(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(user_id=user_id, archived=True)
+            if cursor:
+                query = query.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = query.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit).all()
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
 
-    def get_pinned_chats_by_user_id(self, user_id: str) -> List[ChatModel]:
+    def get_pinned_chats_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
         with get_db_context() as db:
-            chats = (
-                db.query(Chat)
-                .filter_by(user_id=user_id, pinned=True)
-                .order_by(Chat.updated_at.desc())
-                .all()
-            )
-            return [ChatModel.model_validate(chat) for chat in chats]
+            query = db.query(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(user_id=user_id, pinned=True)
+            if cursor:
+                query = query.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = query.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit).all()
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
 
     def update_chat_by_id(self, id: str, updated: dict) -> Optional[ChatModel]:
         try:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Chat).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 chat = db.query(Chat).filter_by(id=id).first()
                 return ChatModel.model_validate(chat) if chat else None
         except Exception:
@@ -265,7 +281,7 @@ class ChatsTable:
                     "share_id": share_id,
                     "updated_at": int(time.time())
                 })
-                db.commit()
+                db.flush()
                 chat = db.query(Chat).filter_by(id=id).first()
                 return ChatModel.model_validate(chat) if chat else None
         except Exception:
@@ -278,7 +294,7 @@ class ChatsTable:
                 if chat:
                     chat.archived = not chat.archived
                     chat.updated_at = int(time.time())
-                    db.commit()
+                    db.flush()
                     return ChatModel.model_validate(chat)
                 return None
         except Exception:
@@ -291,7 +307,7 @@ class ChatsTable:
                 if chat:
                     chat.pinned = not chat.pinned
                     chat.updated_at = int(time.time())
-                    db.commit()
+                    db.flush()
                     return ChatModel.model_validate(chat)
                 return None
         except Exception:
@@ -301,7 +317,7 @@ class ChatsTable:
         try:
             with get_db_context() as db:
                 db.query(Chat).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -310,10 +326,154 @@ class ChatsTable:
         try:
             with get_db_context() as db:
                 db.query(Chat).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
+                return True
+        except Exception:
+            return False
+
+class AsyncChatsTable:
+    """Async variant of ChatsTable for use from async routes"""
+
+    async def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
+        async with get_async_db_context() as db:
+            id = str(uuid.uuid4())
+            chat = ChatModel(
+                **{
+                    "id": id,
+                    "user_id": user_id,
+                    "title": form_data.title,
+                    "chat": form_data.chat,
+                    "folder_id": form_data.folder_id,
+                    "created_at": int(time.time()),
+                    "updated_at": int(time.time()),
+                }
+            )
+            result = Chat(**chat.model_dump())
+            db.add(result)
+            await db.flush()
+            if result:
+                return chat
+            else:
+                return None
+
+    async def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
+        try:
+            async with get_async_db_context() as db:
+                chat = await db.scalar(select(Chat).filter_by(id=id))
+                return ChatModel.model_validate(chat) if chat else None
+        except Exception:
+            return None
+
+    async def get_chat_by_share_id(self, share_id: str) -> Optional[ChatModel]:
+        try:
+            async with get_async_db_context() as db:
+                chat = await db.scalar(select(Chat).filter_by(share_id=share_id))
+                return ChatModel.model_validate(chat) if chat else None
+        except Exception:
+            return None
+
+    async def get_chats_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(user_id=user_id)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = await db.scalars(stmt.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit))
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
+
+    async def get_chats_by_folder_id(self, folder_id: Optional[str], user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(folder_id=folder_id, user_id=user_id)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = await db.scalars(stmt.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit))
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
+
+    async def get_archived_chats_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(user_id=user_id, archived=True)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = await db.scalars(stmt.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit))
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
+
+    async def get_pinned_chats_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[ChatSummaryModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Chat).options(load_only(*CHAT_SUMMARY_COLUMNS)).filter_by(user_id=user_id, pinned=True)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Chat.updated_at, Chat.id, cursor))
+            chats = await db.scalars(stmt.order_by(*keyset_order(Chat.updated_at, Chat.id)).limit(limit))
+            return [ChatSummaryModel.model_validate(chat) for chat in chats]
+
+    async def update_chat_by_id(self, id: str, updated: dict) -> Optional[ChatModel]:
+        try:
+            async with get_async_db_context() as db:
+                updated["updated_at"] = int(time.time())
+                await db.execute(update(Chat).filter_by(id=id).values(**updated))
+                await db.flush()
+                chat = await db.scalar(select(Chat).filter_by(id=id))
+                return ChatModel.model_validate(chat) if chat else None
+        except Exception:
+            return None
+
+    async def update_chat_share_id_by_id(self, id: str, share_id: Optional[str]) -> Optional[ChatModel]:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(
+                    update(Chat).filter_by(id=id).values(
+                        share_id=share_id,
+                        updated_at=int(time.time())
+                    )
+                )
+                await db.flush()
+                chat = await db.scalar(select(Chat).filter_by(id=id))
+                return ChatModel.model_validate(chat) if chat else None
+        except Exception:
+            return None
+
+    async def toggle_chat_archive_by_id(self, id: str) -> Optional[ChatModel]:
+        try:
+            async with get_async_db_context() as db:
+                chat = await db.scalar(select(Chat).filter_by(id=id))
+                if chat:
+                    chat.archived = not chat.archived
+                    chat.updated_at = int(time.time())
+                    await db.flush()
+                    return ChatModel.model_validate(chat)
+                return None
+        except Exception:
+            return None
+
+    async def toggle_chat_pin_by_id(self, id: str) -> Optional[ChatModel]:
+        try:
+            async with get_async_db_context() as db:
+                chat = await db.scalar(select(Chat).filter_by(id=id))
+                if chat:
+                    chat.pinned = not chat.pinned
+                    chat.updated_at = int(time.time())
+                    await db.flush()
+                    return ChatModel.model_validate(chat)
+                return None
+        except Exception:
+            return None
+
+    async def delete_chat_by_id(self, id: str) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(delete(Chat).filter_by(id=id))
+                await db.flush()
+                return True
+        except Exception:
+            return False
+
+    async def delete_chats_by_user_id(self, user_id: str) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(delete(Chat).filter_by(user_id=user_id))
+                await db.flush()
                 return True
         except Exception:
             return False
 
 Folders = FoldersTable()
-Chats = ChatsTable()
\ No newline at end of file
+Chats = ChatsTable()
+AsyncChats = AsyncChatsTable()
\ No newline at end of file
@@ -1,11 +1,18 @@
+import asyncio
+import logging
 import time
 import uuid
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
-from src.web.internal.db import Base, JSONField, get_db_context
+from src.web.internal.db import Base, JSONField, get_db_context, get_async_db_context
+from src.web.constants.config import CONNECTION_LOG_CONFIG, SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, ForeignKey
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, ForeignKey, Index, insert
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
 
 class ConnectionType(str, Enum):
     # Relational Databases
@@ -101,7 +108,11 @@ class DatabaseDriver(str, Enum):
 
 class Connection(Base):
     __tablename__ = "connection"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_connection_user_id_updated_at", "user_id", "updated_at"),
+        Index("ix_connection_is_active_next_check_at", "is_active", "next_check_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -123,6 +134,8 @@ class Connection(Base):
 
     # Credentials stored as JSON (should be encrypted in production)
     credentials = Column(JSONField, nullable=True)
+    # Credentials minus secret fields, kept in plaintext for listings
+    credentials_masked = Column(JSONField, nullable=True)
 
     # Connection string template or full connection string
     connection_string = Column(Text, nullable=True)
@@ -137,6 +150,7 @@ class Connection(Base):
     # Status tracking
     last_connected_at = Column(BigInteger, nullable=True)
     last_tested_at = Column(BigInteger, nullable=True)
+    next_check_at = Column(BigInteger, nullable=True)  # when the health monitor checks it next
     last_error = Column(Text, nullable=True)
     error_count = Column(BigInteger, default=0)
     success_count = Column(BigInteger, default=0)
@@ -176,7 +190,10 @@ class ConnectionTemplate(Base):
 
 class ConnectionLog(Base):
     __tablename__ = "connection_log"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_connection_log_connection_id_timestamp", "connection_id", "timestamp"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     connection_id = Column(String, ForeignKey("connection.id", ondelete="CASCADE"), nullable=False)
@@ -231,6 +248,7 @@ class ConnectionModel(BaseModel):
     # Status tracking
     last_connected_at: Optional[int] = None
     last_tested_at: Optional[int] = None
+    next_check_at: Optional[int] = None
     last_error: Optional[str] = None
     error_count: int = 0
     success_count: int = 0
@@ -351,11 +369,20 @@ class ConnectionTestForm(BaseModel):
     test_query: Optional[str] = None  # SQL query or test command
     test_timeout: Optional[int] = 10  # Test timeout in seconds
 
+class ConnectionQueryForm(BaseModel):
+    query: str
+    params: Optional[Dict[str, Any]] = None  # Bound parameters for the query
+    timeout_seconds: Optional[int] = None  # Defaults to the connection's timeout_seconds
+    max_rows: Optional[int] = None  # Row cap for streamed results
+    use_cache: bool = True  # Serve repeated reads from the query result cache
+    full: bool = False  # Return all rows instead of a preview capped at QUERY_PREVIEW_ROWS
+    dry_run: bool = False  # Only plan the query and return the planner's estimate
+
 class ConnectionResponse(BaseModel):
     id: str
     name: str
     type: str
-    provider: str
+    provider: Optional[str] = None  # DatabaseDriver, if any
     status: str
     is_active: bool
     created_at: int
@@ -363,10 +390,10 @@ class ConnectionResponse(BaseModel):
 
 class ConnectionListResponse(BaseModel):
     connections: List[ConnectionResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # Only counted when include_total is requested
     limit: int
     has_next: bool
+    next_cursor: Optional[str] = None
 
 class ConnectionTemplateResponse(BaseModel):
     templates: List[ConnectionTemplateModel]
@@ -392,6 +419,16 @@ class ConnectionTestResult(BaseModel):
     timestamp: int
     details: Optional[Dict[str, Any]] = None
 
+class ConnectionQueryResult(BaseModel):
+    success: bool
+    data: Optional[List[Dict[str, Any]]] = None
+    columns: Optional[List[str]] = None
+    row_count: Optional[int] = None
+    execution_time: Optional[float] = None
+    error: Optional[str] = None
+    truncated: bool = False
+    estimate: Optional[Dict[str, Any]] = None  # Planner estimate (estimated_rows, estimated_cost, plan)
+
 class ConnectionsTable:
     def insert_new_connection(self, user_id: str, form_data: ConnectionForm) -> Optional[ConnectionModel]:
         with get_db_context() as db:
@@ -424,7 +461,7 @@ class ConnectionsTable:
             )
             result = Connection(**connection.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return connection
@@ -486,7 +523,7 @@ class ConnectionsTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Connection).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 connection = db.query(Connection).filter_by(id=id).first()
                 return ConnectionModel.model_validate(connection) if connection else None
         except Exception:
@@ -508,7 +545,7 @@ class ConnectionsTable:
                     update_data["error_count"] = Connection.error_count + 1
 
                 db.query(Connection).filter_by(id=id).update(update_data)
-                db.commit()
+                db.flush()
                 connection = db.query(Connection).filter_by(id=id).first()
                 return ConnectionModel.model_validate(connection) if connection else None
         except Exception:
@@ -546,7 +583,7 @@ class ConnectionsTable:
                     db.query(Connection).filter_by(id=id).update({
                         "last_tested_at": int(time.time())
                     })
-                    db.commit()
+                    db.flush()
             else:
                 self.update_connection_status(id, ConnectionStatus.ERROR, test_result.get("error"))
 
@@ -795,7 +832,7 @@ class ConnectionsTable:
                 if connection:
                     connection.is_active = not connection.is_active
                     connection.updated_at = int(time.time())
-                    db.commit()
+                    db.flush()
                     return ConnectionModel.model_validate(connection)
                 return None
         except Exception:
@@ -805,7 +842,7 @@ class ConnectionsTable:
         try:
             with get_db_context() as db:
                 result = db.query(Connection).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return result > 0
         except Exception:
             return False
@@ -814,7 +851,7 @@ class ConnectionsTable:
         try:
             with get_db_context() as db:
                 db.query(Connection).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -873,4 +910,124 @@ class ConnectionsTable:
             )
             return [ConnectionModel.model_validate(connection) for connection in connections]
 
+# Failures that say nothing about the rows themselves; the batch is retried
+_TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, OSError, asyncio.TimeoutError)
+
+
+class ConnectionLogBuffer:
+    """
+    Collects connection_log rows in memory and writes them with one
+    multi-row INSERT per flush, so a health sweep over many connections
+    costs a few transactions instead of one per log line. A flush happens
+    every flush_interval_ms, or as soon as batch_size rows are pending.
+    Logs are best effort: beyond max_pending rows new entries are dropped,
+    and so are rows the database rejects (e.g. for a deleted connection).
+    """
+
+    def __init__(self, batch_size: int, flush_interval_ms: int, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add(
+        self,
+        connection_id: str,
+        user_id: str,
+        level: str,
+        message: str,
+        details: Optional[Dict[str, Any]] = None,
+        action: Optional[str] = None,
+        source: Optional[str] = None,
+        duration_ms: Optional[int] = None,
+    ):
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+
+        self._pending.append({
+            "id": str(uuid.uuid4()),
+            "connection_id": connection_id,
+            "user_id": user_id,
+            "level": level,
+            "message": message,
+            "details": details,
+            "action": action,
+            "source": source,
+            "duration_ms": duration_ms,
+            "timestamp": int(time.time()),
+        })
+        if len(self._pending) >= self.batch_size:
+            self._full.set()
+
+    async def flush(self) -> int:
+        """
+        Write all pending rows; returns the number of rows written. A batch
+        the database rejects is bisected until the offending rows are
+        isolated and dropped; on connection errors the unwritten rows are
+        retried with the next flush.
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, []
+        self._full.clear()
+        written = 0
+        batches = [pending]
+        while batches:
+            rows = batches.pop()
+            try:
+                async with get_async_db_context() as db:
+                    await db.execute(insert(ConnectionLog.__table__), rows)
+            except _TRANSIENT_ERRORS as e:
+                unwritten = rows + [row for batch in batches for row in batch]
+                log.error(f"Failed to write {len(unwritten)} connection logs: {e}")
+                # Retry with the next flush, as far as the buffer has room
+                room = self.max_pending - len(self._pending)
+                self.dropped += max(0, len(unwritten) - room)
+                self._pending[:0] = unwritten[:max(0, room)]
+                return written
+            except Exception as e:
+                if len(rows) == 1:
+                    log.error(f"Dropping connection log for connection {rows[0]['connection_id']}: {e}")
+                    self.dropped += 1
+                    continue
+                middle = len(rows) // 2
+                batches += [rows[middle:], rows[:middle]]
+                continue
+            written += len(rows)
+
+        return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
 Connections = ConnectionsTable()
+connection_log_buffer = ConnectionLogBuffer(
+    CONNECTION_LOG_CONFIG["BATCH_SIZE"],
+    CONNECTION_LOG_CONFIG["FLUSH_INTERVAL_MS"],
+    CONNECTION_LOG_CONFIG["MAX_PENDING"]
+)
@@ -71,7 +71,7 @@ class FeedbackTable:
             )
             result = Feedback(**feedback.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return feedback
@@ -138,7 +138,7 @@ class FeedbackTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Feedback).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 feedback = db.query(Feedback).filter_by(id=id).first()
                 return FeedbackModel.model_validate(feedback) if feedback else None
         except Exception:
@@ -151,7 +151,7 @@ class FeedbackTable:
                 if feedback:
                     feedback.version += 1
                     feedback.updated_at = int(time.time())
-                    db.commit()
+                    db.flush()
                     return FeedbackModel.model_validate(feedback)
                 return None
         except Exception:
@@ -161,7 +161,7 @@ class FeedbackTable:
         try:
             with get_db_context() as db:
                 result = db.query(Feedback).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return result > 0
         except Exception:
             return False
@@ -170,7 +170,7 @@ class FeedbackTable:
         try:
             with get_db_context() as db:
                 db.query(Feedback).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -182,7 +182,7 @@ class FeedbackTable:
                 if user_id:
                     query = query.filter_by(user_id=user_id)
                 query.delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -215,7 +215,7 @@ class FeedbackTable:
                     Feedback.user_id == user_id,
                     Feedback.id.in_(feedback_ids)
                 ).delete(synchronize_session=False)
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -2,13 +2,17 @@ import time
 import uuid
 from typing import Optional, List
 
-from src.web.internal.db import Base, JSONField, get_db_context
+from src.web.internal.db import Base, JSONField, get_db_context, get_async_db_context
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Text, ForeignKey, Index, select, update, delete
 
 class File(Base):
     __tablename__ = "file"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_file_hash", "hash"),
+        Index("ix_file_user_id_created_at", "user_id", "created_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -80,7 +84,7 @@ class FilesTable:
             )
             result = File(**file.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return file
@@ -139,7 +143,7 @@ class FilesTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(File).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 file = db.query(File).filter_by(id=id).first()
                 return FileModel.model_validate(file) if file else None
         except Exception:
@@ -152,7 +156,7 @@ class FilesTable:
                     "hash": hash,
                     "updated_at": int(time.time())
                 })
-                db.commit()
+                db.flush()
                 file = db.query(File).filter_by(id=id).first()
                 return FileModel.model_validate(file) if file else None
         except Exception:
@@ -165,7 +169,7 @@ class FilesTable:
                     "path": path,
                     "updated_at": int(time.time())
                 })
-                db.commit()
+                db.flush()
                 file = db.query(File).filter_by(id=id).first()
                 return FileModel.model_validate(file) if file else None
         except Exception:
@@ -175,7 +179,7 @@ class FilesTable:
         try:
             with get_db_context() as db:
                 db.query(File).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -184,7 +188,7 @@ class FilesTable:
         try:
             with get_db_context() as db:
                 db.query(File).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -193,7 +197,7 @@ class FilesTable:
         try:
             with get_db_context() as db:
                 db.query(File).filter_by(hash=hash).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -212,4 +216,88 @@ class FilesTable:
                     total_size += file.meta.get("size", 0)
             return total_size
 
+class AsyncFilesTable:
+    """Async variant of FilesTable for use from async routes"""
+
+    async def insert_new_file(self, user_id: str, form_data: FileForm) -> Optional[FileModel]:
+        async with get_async_db_context() as db:
+            id = str(uuid.uuid4())
+            file = FileModel(
+                **{
+                    "id": id,
+                    "user_id": user_id,
+                    "filename": form_data.filename,
+                    "hash": form_data.hash,
+                    "path": form_data.path,
+                    "data": form_data.data or {},
+                    "meta": {},
+                    "access_control": form_data.access_control or {},
+                    "created_at": int(time.time()),
+                    "updated_at": int(time.time()),
+                }
+            )
+            result = File(**file.model_dump())
+            db.add(result)
+            await db.flush()
+            if result:
+                return file
+            else:
+                return None
+
+    async def get_file_by_id(self, id: str) -> Optional[FileModel]:
+        try:
+            async with get_async_db_context() as db:
+                file = await db.scalar(select(File).filter_by(id=id))
+                return FileModel.model_validate(file) if file else None
+        except Exception:
+            return None
+
+    async def get_file_by_hash(self, hash: str) -> Optional[FileModel]:
+        try:
+            async with get_async_db_context() as db:
+                file = await db.scalar(select(File).filter_by(hash=hash).limit(1))
+                return FileModel.model_validate(file) if file else None
+        except Exception:
+            return None
+
+    async def get_files_by_user_id(self, user_id: str, skip: int = 0, limit: int = 50) -> List[FileModel]:
+        async with get_async_db_context() as db:
+            files = await db.scalars(
+                select(File)
+                .filter_by(user_id=user_id)
+                .order_by(File.created_at.desc())
+                .offset(skip)
+                .limit(limit)
+            )
+            return [FileModel.model_validate(file) for file in files]
+
+    async def get_files_by_filename(self, filename: str, user_id: Optional[str] = None) -> List[FileModel]:
+        async with get_async_db_context() as db:
+            stmt = select(File).filter_by(filename=filename)
+            if user_id:
+                stmt = stmt.filter_by(user_id=user_id)
+            files = await db.scalars(stmt.order_by(File.created_at.desc()))
+            return [FileModel.model_validate(file) for file in files]
+
+    async def update_file_by_id(self, id: str, updated: dict) -> Optional[FileModel]:
+        try:
+            async with get_async_db_context() as db:
+                updated["updated_at"] = int(time.time())
+                await db.execute(update(File).filter_by(id=id).values(**updated))
+                await db.flush()
+                file = await db.scalar(select(File).filter_by(id=id))
+                return FileModel.model_validate(file) if file else None
+        except Exception:
+            return None
+
+    async def delete_file_by_id(self, id: str) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(delete(File).filter_by(id=id))
+                await db.flush()
+                return True
+        except Exception:
+            return False
+
 Files = FilesTable()
+AsyncFiles = AsyncFilesTable()
@@ -68,7 +68,7 @@ class GroupsTable:
             )
             result = Group(**group.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return group
@@ -103,7 +103,7 @@ class GroupsTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Group).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 group = db.query(Group).filter_by(id=id).first()
                 return GroupModel.model_validate(group) if group else None
         except Exception:
@@ -119,7 +119,7 @@ class GroupsTable:
                         user_ids.append(user_id)
                         group.user_ids = user_ids
                         group.updated_at = int(time.time())
-                        db.commit()
+                        db.flush()
                     return GroupModel.model_validate(group)
                 return None
         except Exception:
@@ -135,7 +135,7 @@ class GroupsTable:
                         user_ids.remove(user_id)
                         group.user_ids = user_ids
                         group.updated_at = int(time.time())
-                        db.commit()
+                        db.flush()
                     return GroupModel.model_validate(group)
                 return None
         except Exception:
@@ -152,7 +152,7 @@ class GroupsTable:
                         user_ids.remove(user_id)
                         group.user_ids = user_ids
                         group.updated_at = int(time.time())
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -161,7 +161,7 @@ class GroupsTable:
         try:
             with get_db_context() as db:
                 db.query(Group).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -170,7 +170,7 @@ class GroupsTable:
         try:
             with get_db_context() as db:
                 db.query(Group).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -4,11 +4,12 @@ import time
 from typing import Optional
 import uuid
 
-from src.web.internal.db import Base, JSONField, get_db_context, JSONField
+from src.web.internal.db import Base, JSONField, get_db_context, get_async_db_context
+from src.web.internal.pagination import keyset_filter, keyset_order
 from src.web.constants.config import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy import BigInteger, Column, String, Text, select, update, delete
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -95,7 +96,7 @@ class KnowledgeTable:
             try:
                 result = Knowledge(**knowledge.model_dump())
                 db.add(result)
-                db.commit()
+                db.flush()
                 db.refresh(result)
                 if result:
                     return KnowledgeModel.model_validate(result)
@@ -104,14 +105,22 @@ class KnowledgeTable:
             except Exception:
                 return None
 
-    def get_knowledge_bases(self) -> list[KnowledgeModel]:
+    def get_knowledge_bases(self, limit: int = 50, cursor: Optional[str] = None) -> list[KnowledgeModel]:
         with get_db_context() as db:
-            knowledge_bases = db.query(Knowledge).order_by(Knowledge.updated_at.desc()).all()
+            query = db.query(Knowledge)
+            if cursor:
+                query = query.filter(keyset_filter(Knowledge.updated_at, Knowledge.id, cursor))
+            knowledge_bases = query.order_by(*keyset_order(Knowledge.updated_at, Knowledge.id)).limit(limit).all()
             return [KnowledgeModel.model_validate(knowledge) for knowledge in knowledge_bases]
 
-    def get_knowledge_bases_by_user_id(self, user_id: str) -> list[KnowledgeModel]:
+    def get_knowledge_bases_by_user_id(
+        self, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> list[KnowledgeModel]:
         with get_db_context() as db:
-            knowledge_bases = db.query(Knowledge).filter_by(user_id=user_id).order_by(Knowledge.updated_at.desc()).all()
+            query = db.query(Knowledge).filter_by(user_id=user_id)
+            if cursor:
+                query = query.filter(keyset_filter(Knowledge.updated_at, Knowledge.id, cursor))
+            knowledge_bases = query.order_by(*keyset_order(Knowledge.updated_at, Knowledge.id)).limit(limit).all()
             return [KnowledgeModel.model_validate(knowledge) for knowledge in knowledge_bases]
 
     def get_knowledge_by_id(self, id: str) -> Optional[KnowledgeModel]:
@@ -133,7 +142,7 @@ class KnowledgeTable:
                         "updated_at": int(time.time()),
                     }
                 )
-                db.commit()
+                db.flush()
                 return self.get_knowledge_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -150,7 +159,7 @@ class KnowledgeTable:
                         "updated_at": int(time.time()),
                     }
                 )
-                db.commit()
+                db.flush()
                 return self.get_knowledge_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -160,7 +169,7 @@ class KnowledgeTable:
         try:
             with get_db_context() as db:
                 db.query(Knowledge).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -169,11 +178,121 @@ class KnowledgeTable:
         with get_db_context() as db:
             try:
                 db.query(Knowledge).delete()
-                db.commit()
+                db.flush()
 
                 return True
             except Exception:
                 return False
 
 
+class AsyncKnowledgeTable:
+    """Async variant of KnowledgeTable for use from async routes"""
+
+    async def insert_new_knowledge(
+        self, user_id: str, form_data: KnowledgeForm
+    ) -> Optional[KnowledgeModel]:
+        async with get_async_db_context() as db:
+            knowledge = KnowledgeModel(
+                **{
+                    **form_data.model_dump(),
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "created_at": int(time.time()),
+                    "updated_at": int(time.time()),
+                }
+            )
+
+            try:
+                result = Knowledge(**knowledge.model_dump())
+                db.add(result)
+                await db.flush()
+                if result:
+                    return KnowledgeModel.model_validate(result)
+                else:
+                    return None
+            except Exception:
+                return None
+
+    async def get_knowledge_bases(self, limit: int = 50, cursor: Optional[str] = None) -> list[KnowledgeModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Knowledge)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Knowledge.updated_at, Knowledge.id, cursor))
+            knowledge_bases = await db.scalars(stmt.order_by(*keyset_order(Knowledge.updated_at, Knowledge.id)).limit(limit))
+            return [KnowledgeModel.model_validate(knowledge) for knowledge in knowledge_bases]
+
+    async def get_knowledge_bases_by_user_id(
+        self, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> list[KnowledgeModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Knowledge).filter_by(user_id=user_id)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Knowledge.updated_at, Knowledge.id, cursor))
+            knowledge_bases = await db.scalars(stmt.order_by(*keyset_order(Knowledge.updated_at, Knowledge.id)).limit(limit))
+            return [KnowledgeModel.model_validate(knowledge) for knowledge in knowledge_bases]
+
+    async def get_knowledge_by_id(self, id: str) -> Optional[KnowledgeModel]:
+        try:
+            async with get_async_db_context() as db:
+                knowledge = await db.scalar(select(Knowledge).filter_by(id=id))
+                return KnowledgeModel.model_validate(knowledge) if knowledge else None
+        except Exception:
+            return None
+
+    async def update_knowledge_by_id(
+        self, id: str, form_data: KnowledgeForm
+    ) -> Optional[KnowledgeModel]:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(
+                    update(Knowledge).filter_by(id=id).values(
+                        **form_data.model_dump(),
+                        updated_at=int(time.time()),
+                    )
+                )
+                await db.flush()
+                knowledge = await db.scalar(select(Knowledge).filter_by(id=id))
+                return KnowledgeModel.model_validate(knowledge) if knowledge else None
+        except Exception as e:
+            log.exception(e)
+            return None
+
+    async def update_knowledge_data_by_id(
+        self, id: str, data: dict
+    ) -> Optional[KnowledgeModel]:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(
+                    update(Knowledge).filter_by(id=id).values(
+                        data=data,
+                        updated_at=int(time.time()),
+                    )
+                )
+                await db.flush()
+                knowledge = await db.scalar(select(Knowledge).filter_by(id=id))
+                return KnowledgeModel.model_validate(knowledge) if knowledge else None
+        except Exception as e:
+            log.exception(e)
+            return None
+
+    async def delete_knowledge_by_id(self, id: str) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(delete(Knowledge).filter_by(id=id))
+                await db.flush()
+                return True
+        except Exception:
+            return False
+
+    async def delete_all_knowledge(self) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(delete(Knowledge))
+                await db.flush()
+                return True
+        except Exception:
+            return False
+
+
 Knowledges = KnowledgeTable()
+AsyncKnowledges = AsyncKnowledgeTable()
@@ -4,11 +4,14 @@ from typing import Optional, List
 
 from src.web.internal.db import Base, JSONField, get_db_context
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Text, ForeignKey, Index
 
 class Memory(Base):
     __tablename__ = "memory"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_memory_user_id_updated_at", "user_id", "updated_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -52,7 +55,7 @@ class MemoriesTable:
             )
             result = Memory(**memory.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return memory
@@ -116,7 +119,7 @@ class MemoriesTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Memory).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 memory = db.query(Memory).filter_by(id=id).first()
                 return MemoryModel.model_validate(memory) if memory else None
         except Exception:
@@ -129,7 +132,7 @@ class MemoriesTable:
                     "content": content,
                     "updated_at": int(time.time())
                 })
-                db.commit()
+                db.flush()
                 memory = db.query(Memory).filter_by(id=id).first()
                 return MemoryModel.model_validate(memory) if memory else None
         except Exception:
@@ -139,7 +142,7 @@ class MemoriesTable:
         try:
             with get_db_context() as db:
                 result = db.query(Memory).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return result > 0
         except Exception:
             return False
@@ -148,7 +151,7 @@ class MemoriesTable:
         try:
             with get_db_context() as db:
                 db.query(Memory).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -204,7 +207,7 @@ class MemoriesTable:
                 db.add(result)
                 created_memories.append(memory)
             
-            db.commit()
+            db.flush()
             return created_memories
 
     def bulk_delete_memories(self, user_id: str, memory_ids: List[str]) -> bool:
@@ -215,7 +218,7 @@ class MemoriesTable:
                     Memory.user_id == user_id,
                     Memory.id.in_(memory_ids)
                 ).delete(synchronize_session=False)
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -2,14 +2,20 @@ import time
 import uuid
 from typing import Optional, List
 
-from src.web.internal.db import Base, JSONField, get_db_context
+from src.web.internal.db import Base, JSONField, get_db_context, get_async_db_context
+from src.web.internal.pagination import keyset_filter, keyset_order
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, ForeignKey
+from sqlalchemy import BigInteger, Column, String, Text, ForeignKey, select, update, delete, Index
 
 
 class Message(Base):
     __tablename__ = "message"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_message_channel_id_created_at", "channel_id", "created_at"),
+        Index("ix_message_parent_id_created_at", "parent_id", "created_at"),
+        Index("ix_message_user_id_created_at", "user_id", "created_at"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -38,7 +44,11 @@ class MessageModel(BaseModel):
 
 class MessageReaction(Base):
     __tablename__ = "message_reaction"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_message_reaction_message_id_created_at", "message_id", "created_at"),
+        Index("ix_message_reaction_user_id_message_id_name", "user_id", "message_id", "name"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     user_id = Column(String, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -94,7 +104,7 @@ class MessagesTable:
             )
             result = Message(**message.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return message
@@ -109,38 +119,28 @@ class MessagesTable:
         except Exception:
             return None
 
-    def get_messages_by_channel_id(self, channel_id: str, skip: int = 0, limit: int = 50) -> List[MessageModel]:
+    def get_messages_by_channel_id(self, channel_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[MessageModel]:
         with get_db_context() as db:
-            messages = (
-                db.query(Message)
-                .filter_by(channel_id=channel_id)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            query = db.query(Message).filter_by(channel_id=channel_id)
+            if cursor:
+                query = query.filter(keyset_filter(Message.created_at, Message.id, cursor))
+            messages = query.order_by(*keyset_order(Message.created_at, Message.id)).limit(limit).all()
             return [MessageModel.model_validate(message) for message in messages]
 
-    def get_messages_by_user_id(self, user_id: str, skip: int = 0, limit: int = 50) -> List[MessageModel]:
+    def get_messages_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[MessageModel]:
         with get_db_context() as db:
-            messages = (
-                db.query(Message)
-                .filter_by(user_id=user_id)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
-            )
+            query = db.query(Message).filter_by(user_id=user_id)
+            if cursor:
+                query = query.filter(keyset_filter(Message.created_at, Message.id, cursor))
+            messages = query.order_by(*keyset_order(Message.created_at, Message.id)).limit(limit).all()
             return [MessageModel.model_validate(message) for message in messages]
 
-    def get_replies_by_parent_id(self, parent_id: str) -> List[MessageModel]:
+    def get_replies_by_parent_id(self, parent_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[MessageModel]:
         with get_db_context() as db:
-            messages = (
-                db.query(Message)
-                .filter_by(parent_id=parent_id)
-                .order_by(Message.created_at.asc())
-                .all()
-            )
+            query = db.query(Message).filter_by(parent_id=parent_id)
+            if cursor:
+                query = query.filter(keyset_filter(Message.created_at, Message.id, cursor, descending=False))
+            messages = query.order_by(*keyset_order(Message.created_at, Message.id, descending=False)).limit(limit).all()
             return [MessageModel.model_validate(message) for message in messages]
 
     def update_message_by_id(self, id: str, updated: dict) -> Optional[MessageModel]:
@@ -148,7 +148,7 @@ class MessagesTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Message).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 message = db.query(Message).filter_by(id=id).first()
                 return MessageModel.model_validate(message) if message else None
         except Exception:
@@ -161,7 +161,7 @@ class MessagesTable:
                 db.query(Message).filter_by(parent_id=id).delete()
                 # Delete the message itself
                 db.query(Message).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -170,7 +170,7 @@ class MessagesTable:
         try:
             with get_db_context() as db:
                 db.query(Message).filter_by(channel_id=channel_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -179,7 +179,7 @@ class MessagesTable:
         try:
             with get_db_context() as db:
                 db.query(Message).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -200,7 +200,7 @@ class MessageReactionsTable:
             )
             result = MessageReaction(**reaction.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return reaction
@@ -224,7 +224,7 @@ class MessageReactionsTable:
         try:
             with get_db_context() as db:
                 db.query(MessageReaction).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -233,7 +233,7 @@ class MessageReactionsTable:
         try:
             with get_db_context() as db:
                 db.query(MessageReaction).filter_by(user_id=user_id, message_id=message_id, name=name).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -242,7 +242,7 @@ class MessageReactionsTable:
         try:
             with get_db_context() as db:
                 db.query(MessageReaction).filter_by(message_id=message_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -251,7 +251,142 @@ class MessageReactionsTable:
         try:
             with get_db_context() as db:
                 db.query(MessageReaction).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
+                return True
+        except Exception:
+            return False
+
+
+class AsyncMessagesTable:
+    """Async variant of MessagesTable for use from async routes"""
+
+    async def insert_new_message(self, user_id: str, form_data: MessageForm) -> Optional[MessageModel]:
+        async with get_async_db_context() as db:
+            id = str(uuid.uuid4())
+            message = MessageModel(
+                **{
+                    "id": id,
+                    "user_id": user_id,
+                    "channel_id": form_data.channel_id,
+                    "parent_id": form_data.parent_id,
+                    "content": form_data.content,
+                    "data": form_data.data or {},
+                    "meta": {},
+                    "created_at": int(time.time()),
+                    "updated_at": int(time.time()),
+                }
+            )
+            result = Message(**message.model_dump())
+            db.add(result)
+            await db.flush()
+            if result:
+                return message
+            else:
+                return None
+
+    async def get_message_by_id(self, id: str) -> Optional[MessageModel]:
+        try:
+            async with get_async_db_context() as db:
+                message = await db.scalar(select(Message).filter_by(id=id))
+                return MessageModel.model_validate(message) if message else None
+        except Exception:
+            return None
+
+    async def get_messages_by_channel_id(self, channel_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[MessageModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Message).filter_by(channel_id=channel_id)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Message.created_at, Message.id, cursor))
+            messages = await db.scalars(stmt.order_by(*keyset_order(Message.created_at, Message.id)).limit(limit))
+            return [MessageModel.model_validate(message) for message in messages]
+
+    async def get_messages_by_user_id(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[MessageModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Message).filter_by(user_id=user_id)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Message.created_at, Message.id, cursor))
+            messages = await db.scalars(stmt.order_by(*keyset_order(Message.created_at, Message.id)).limit(limit))
+            return [MessageModel.model_validate(message) for message in messages]
+
+    async def get_replies_by_parent_id(self, parent_id: str, limit: int = 50, cursor: Optional[str] = None) -> List[MessageModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Message).filter_by(parent_id=parent_id)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Message.created_at, Message.id, cursor, descending=False))
+            messages = await db.scalars(stmt.order_by(*keyset_order(Message.created_at, Message.id, descending=False)).limit(limit))
+            return [MessageModel.model_validate(message) for message in messages]
+
+    async def update_message_by_id(self, id: str, updated: dict) -> Optional[MessageModel]:
+        try:
+            async with get_async_db_context() as db:
+                updated["updated_at"] = int(time.time())
+                await db.execute(update(Message).filter_by(id=id).values(**updated))
+                await db.flush()
+                message = await db.scalar(select(Message).filter_by(id=id))
+                return MessageModel.model_validate(message) if message else None
+        except Exception:
+            return None
+
+    async def delete_message_by_id(self, id: str) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                # Delete all replies first
+                await db.execute(delete(Message).filter_by(parent_id=id))
+                # Delete the message itself
+                await db.execute(delete(Message).filter_by(id=id))
+                await db.flush()
+                return True
+        except Exception:
+            return False
+
+
+class AsyncMessageReactionsTable:
+    """Async variant of MessageReactionsTable for use from async routes"""
+
+    async def insert_new_reaction(self, user_id: str, message_id: str, form_data: MessageReactionForm) -> Optional[MessageReactionModel]:
+        async with get_async_db_context() as db:
+            id = str(uuid.uuid4())
+            reaction = MessageReactionModel(
+                **{
+                    "id": id,
+                    "user_id": user_id,
+                    "message_id": message_id,
+                    "name": form_data.name,
+                    "created_at": int(time.time()),
+                }
+            )
+            result = MessageReaction(**reaction.model_dump())
+            db.add(result)
+            await db.flush()
+            if result:
+                return reaction
+            else:
+                return None
+
+    async def get_reactions_by_message_id(self, message_id: str) -> List[MessageReactionModel]:
+        async with get_async_db_context() as db:
+            reactions = await db.scalars(
+                select(MessageReaction).filter_by(message_id=message_id).order_by(MessageReaction.created_at.asc())
+            )
+            return [MessageReactionModel.model_validate(reaction) for reaction in reactions]
+
+    async def get_reaction_by_user_and_message(self, user_id: str, message_id: str, name: str) -> Optional[MessageReactionModel]:
+        try:
+            async with get_async_db_context() as db:
+                reaction = await db.scalar(
+                    select(MessageReaction).filter_by(user_id=user_id, message_id=message_id, name=name)
+                )
+                return MessageReactionModel.model_validate(reaction) if reaction else None
+        except Exception:
+            return None
+
+    async def delete_reaction_by_user_and_message(self, user_id: str, message_id: str, name: str) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(
+                    delete(MessageReaction).filter_by(user_id=user_id, message_id=message_id, name=name)
+                )
+                await db.flush()
                 return True
         except Exception:
             return False
@@ -259,3 +394,5 @@ class MessageReactionsTable:
 
 Messages = MessagesTable()
 MessageReactions = MessageReactionsTable()
+AsyncMessages = AsyncMessagesTable()
+AsyncMessageReactions = AsyncMessageReactionsTable()
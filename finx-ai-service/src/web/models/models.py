@@ -77,7 +77,7 @@ class ModelsTable:
             )
             result = Model(**model.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return model
@@ -129,7 +129,7 @@ class ModelsTable:
             with get_db_context() as db:
                 updated["updated_at"] = int(time.time())
                 db.query(Model).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
                 model = db.query(Model).filter_by(id=id).first()
                 return ModelModel.model_validate(model) if model else None
         except Exception:
@@ -142,7 +142,7 @@ class ModelsTable:
                 if model:
                     model.is_active = not model.is_active
                     model.updated_at = int(time.time())
-                    db.commit()
+                    db.flush()
                     return ModelModel.model_validate(model)
                 return None
         except Exception:
@@ -155,7 +155,7 @@ class ModelsTable:
                 db.query(Model).filter_by(base_model_id=id).update({"base_model_id": None})
                 # Delete the model
                 db.query(Model).filter_by(id=id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -173,7 +173,7 @@ class ModelsTable:
                 
                 # Delete user's models
                 db.query(Model).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -1,10 +1,11 @@
 import time
 from typing import Optional
 
-from src.web.internal.db import Base, JSONField, get_db_context, JSONField
+from src.web.internal.db import Base, JSONField, get_db_context, get_async_db_context
+from src.web.internal.pagination import keyset_filter, keyset_order
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy import BigInteger, Column, String, Text, select, delete
 
 class Prompt(Base):
     __tablename__ = "prompt"
@@ -68,7 +69,7 @@ class PromptsTable:
             with get_db_context() as db:
                 result = Prompt(**prompt.model_dump())
                 db.add(result)
-                db.commit()
+                db.flush()
                 db.refresh(result)
                 if result:
                     return PromptModel.model_validate(result)
@@ -81,18 +82,26 @@ class PromptsTable:
         try:
             with get_db_context() as db:
                 prompt = db.query(Prompt).filter_by(command=command).first()
-                return PromptModel.model_validate(prompt)
+                return PromptModel.model_validate(prompt) if prompt else None
         except Exception:
             return None
 
-    def get_prompts(self) -> list[PromptModel]:
+    def get_prompts(self, limit: int = 50, cursor: Optional[str] = None) -> list[PromptModel]:
         with get_db_context() as db:
-            prompts = db.query(Prompt).order_by(Prompt.timestamp.desc()).all()
+            query = db.query(Prompt)
+            if cursor:
+                query = query.filter(keyset_filter(Prompt.timestamp, Prompt.command, cursor))
+            prompts = query.order_by(*keyset_order(Prompt.timestamp, Prompt.command)).limit(limit).all()
             return [PromptModel.model_validate(prompt) for prompt in prompts]
 
-    def get_prompts_by_user_id(self, user_id: str) -> list[PromptModel]:
+    def get_prompts_by_user_id(
+        self, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> list[PromptModel]:
         with get_db_context() as db:
-            prompts = db.query(Prompt).filter_by(user_id=user_id).order_by(Prompt.timestamp.desc()).all()
+            query = db.query(Prompt).filter_by(user_id=user_id)
+            if cursor:
+                query = query.filter(keyset_filter(Prompt.timestamp, Prompt.command, cursor))
+            prompts = query.order_by(*keyset_order(Prompt.timestamp, Prompt.command)).limit(limit).all()
             return [PromptModel.model_validate(prompt) for prompt in prompts]
 
     def update_prompt_by_command(
@@ -105,7 +114,7 @@ class PromptsTable:
                 prompt.content = form_data.content
                 prompt.access_control = form_data.access_control
                 prompt.timestamp = int(time.time())
-                db.commit()
+                db.flush()
                 return PromptModel.model_validate(prompt)
         except Exception:
             return None
@@ -114,10 +123,88 @@ class PromptsTable:
         try:
             with get_db_context() as db:
                 db.query(Prompt).filter_by(command=command).delete()
-                db.commit()
+                db.flush()
+
+                return True
+        except Exception:
+            return False
+
+class AsyncPromptsTable:
+    """Async variant of PromptsTable for use from async routes"""
+
+    async def insert_new_prompt(
+        self, user_id: str, form_data: PromptForm
+    ) -> Optional[PromptModel]:
+        prompt = PromptModel(
+            **{
+                "user_id": user_id,
+                **form_data.model_dump(),
+                "timestamp": int(time.time()),
+            }
+        )
+
+        try:
+            async with get_async_db_context() as db:
+                result = Prompt(**prompt.model_dump())
+                db.add(result)
+                await db.flush()
+                if result:
+                    return PromptModel.model_validate(result)
+                else:
+                    return None
+        except Exception:
+            return None
+
+    async def get_prompt_by_command(self, command: str) -> Optional[PromptModel]:
+        try:
+            async with get_async_db_context() as db:
+                prompt = await db.scalar(select(Prompt).filter_by(command=command))
+                return PromptModel.model_validate(prompt) if prompt else None
+        except Exception:
+            return None
+
+    async def get_prompts(self, limit: int = 50, cursor: Optional[str] = None) -> list[PromptModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Prompt)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Prompt.timestamp, Prompt.command, cursor))
+            prompts = await db.scalars(stmt.order_by(*keyset_order(Prompt.timestamp, Prompt.command)).limit(limit))
+            return [PromptModel.model_validate(prompt) for prompt in prompts]
+
+    async def get_prompts_by_user_id(
+        self, user_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> list[PromptModel]:
+        async with get_async_db_context() as db:
+            stmt = select(Prompt).filter_by(user_id=user_id)
+            if cursor:
+                stmt = stmt.filter(keyset_filter(Prompt.timestamp, Prompt.command, cursor))
+            prompts = await db.scalars(stmt.order_by(*keyset_order(Prompt.timestamp, Prompt.command)).limit(limit))
+            return [PromptModel.model_validate(prompt) for prompt in prompts]
+
+    async def update_prompt_by_command(
+        self, command: str, form_data: PromptForm
+    ) -> Optional[PromptModel]:
+        try:
+            async with get_async_db_context() as db:
+                prompt = await db.scalar(select(Prompt).filter_by(command=command))
+                prompt.title = form_data.title
+                prompt.content = form_data.content
+                prompt.access_control = form_data.access_control
+                prompt.timestamp = int(time.time())
+                await db.flush()
+                return PromptModel.model_validate(prompt)
+        except Exception:
+            return None
+
+    async def delete_prompt_by_command(self, command: str) -> bool:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(delete(Prompt).filter_by(command=command))
+                await db.flush()
 
                 return True
         except Exception:
             return False
 
 Prompts = PromptsTable()
+AsyncPrompts = AsyncPromptsTable()
@@ -53,7 +53,7 @@ class TagsTable:
             )
             result = Tag(**tag.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return tag
@@ -91,7 +91,7 @@ class TagsTable:
         try:
             with get_db_context() as db:
                 db.query(Tag).filter_by(id=id, user_id=user_id).update(updated)
-                db.commit()
+                db.flush()
                 tag = db.query(Tag).filter_by(id=id, user_id=user_id).first()
                 return TagModel.model_validate(tag) if tag else None
         except Exception:
@@ -101,7 +101,7 @@ class TagsTable:
         try:
             with get_db_context() as db:
                 result = db.query(Tag).filter_by(id=id, user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return result > 0
         except Exception:
             return False
@@ -110,7 +110,7 @@ class TagsTable:
         try:
             with get_db_context() as db:
                 db.query(Tag).filter_by(user_id=user_id).delete()
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -145,7 +145,7 @@ class TagsTable:
                     db.add(result)
                     created_tags.append(tag)
             
-            db.commit()
+            db.flush()
             return created_tags
 
     def bulk_delete_tags(self, user_id: str, tag_ids: List[str]) -> bool:
@@ -156,7 +156,7 @@ class TagsTable:
                     Tag.user_id == user_id,
                     Tag.id.in_(tag_ids)
                 ).delete(synchronize_session=False)
-                db.commit()
+                db.flush()
                 return True
         except Exception:
             return False
@@ -1,16 +1,54 @@
+import asyncio
+import logging
+import threading
 import time
-from typing import Optional
+from typing import Dict, Optional
 
-from src.web.internal.db import Base, JSONField, get_db_context
+from src.web.internal.db import Base, JSONField, after_commit, get_db_context, get_async_db_context
+from src.web.internal.cache import TTLCache
+from src.web.constants.config import CACHE_CONFIG, SRC_LOG_LEVELS
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy import BigInteger, Column, String, Text, select, update, func, Index, bindparam
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MODELS"])
+
+# Users resolved by get_current_user on every request. Entries are dropped
+# once a change made through the tables below commits. Other workers keep
+# serving their entry until it expires, so a changed role or a deleted
+# user can still be honoured there for up to USER_TTL seconds.
+_user_cache = TTLCache(maxsize=CACHE_CONFIG["USER_MAX_SIZE"], ttl=CACHE_CONFIG["USER_TTL"])
+_user_cache_lock = threading.Lock()
+_user_cache_generation = 0  # bumped by every invalidation
+
+
+def _invalidate_user(db, id: str):
+    """Drop the cached user once the transaction of db commits"""
+    after_commit(db, lambda: _forget_user(id))
+
+
+def _forget_user(id: str):
+    global _user_cache_generation
+    with _user_cache_lock:
+        _user_cache_generation += 1
+        _user_cache.pop(id)
+
+
+def _cache_user(user: "UserModel", generation: int):
+    """Cache a user read at generation, unless an invalidation happened since"""
+    with _user_cache_lock:
+        if generation == _user_cache_generation:
+            _user_cache.set(user.id, user)
 
 
 class User(Base):
     __tablename__ = "user"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index("ix_user_email", "email"),
+        {'extend_existing': True},
+    )
 
     id = Column(String, primary_key=True)
     name = Column(String)
@@ -108,7 +146,7 @@ class UsersTable:
             )
             result = User(**user.model_dump())
             db.add(result)
-            db.commit()
+            db.flush()
             db.refresh(result)
             if result:
                 return user
@@ -200,7 +238,8 @@ class UsersTable:
         try:
             with get_db_context() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
-                db.commit()
+                db.flush()
+                _invalidate_user(db, id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -214,7 +253,8 @@ class UsersTable:
                 db.query(User).filter_by(id=id).update(
                     {"profile_image_url": profile_image_url}
                 )
-                db.commit()
+                db.flush()
+                _invalidate_user(db, id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -227,7 +267,7 @@ class UsersTable:
                 db.query(User).filter_by(id=id).update(
                     {"last_active_at": int(time.time())}
                 )
-                db.commit()
+                db.flush()
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -240,7 +280,8 @@ class UsersTable:
         try:
             with get_db_context() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
-                db.commit()
+                db.flush()
+                _invalidate_user(db, id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -251,7 +292,8 @@ class UsersTable:
         try:
             with get_db_context() as db:
                 db.query(User).filter_by(id=id).update(updated)
-                db.commit()
+                db.flush()
+                _invalidate_user(db, id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -274,7 +316,8 @@ class UsersTable:
                 with get_db_context() as db:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
-                    db.commit()
+                    db.flush()
+                    _invalidate_user(db, id)
 
                 return True
             else:
@@ -286,7 +329,8 @@ class UsersTable:
         try:
             with get_db_context() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
-                db.commit()
+                db.flush()
+                _invalidate_user(db, id)
                 return True if result == 1 else False
         except Exception:
             return False
@@ -305,4 +349,135 @@ class UsersTable:
             return [user.id for user in users]
 
 
+class AsyncUsersTable:
+    """Async variant of UsersTable for the authentication hot path"""
+
+    async def get_user_by_id(self, id: str) -> Optional[UserModel]:
+        """Cached lookup; see _user_cache for invalidation"""
+        user = _user_cache.get(id)
+        if user is not None:
+            return user
+
+        # A read overlapping a commit may return the old row; it is only
+        # cached if no invalidation happened meanwhile
+        generation = _user_cache_generation
+        try:
+            async with get_async_db_context() as db:
+                user = UserModel.model_validate(await db.scalar(select(User).filter_by(id=id)))
+        except Exception:
+            return None
+
+        _cache_user(user, generation)
+        return user
+
+    async def get_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        try:
+            async with get_async_db_context() as db:
+                user = await db.scalar(select(User).filter_by(api_key=api_key))
+                return UserModel.model_validate(user)
+        except Exception:
+            return None
+
+    async def get_user_by_email(self, email: str) -> Optional[UserModel]:
+        try:
+            async with get_async_db_context() as db:
+                user = await db.scalar(select(User).filter_by(email=email))
+                return UserModel.model_validate(user)
+        except Exception:
+            return None
+
+    async def get_num_users(self) -> Optional[int]:
+        async with get_async_db_context() as db:
+            return await db.scalar(select(func.count()).select_from(User))
+
+    async def update_user_last_active_by_id(self, id: str) -> Optional[UserModel]:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(
+                    update(User).filter_by(id=id).values(last_active_at=int(time.time()))
+                )
+                await db.flush()
+
+                user = await db.scalar(select(User).filter_by(id=id))
+                return UserModel.model_validate(user)
+        except Exception:
+            return None
+
+    async def update_user_by_id(self, id: str, updated: dict) -> Optional[UserModel]:
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(update(User).filter_by(id=id).values(**updated))
+                await db.flush()
+                _invalidate_user(db, id)
+
+                user = await db.scalar(select(User).filter_by(id=id))
+                return UserModel.model_validate(user)
+        except Exception:
+            return None
+
+
+class LastActiveBuffer:
+    """
+    Coalesces last_active_at updates so authenticating a request never
+    writes the user row. Touches are kept in memory and written in one
+    batched UPDATE per flush interval, i.e. at most one write per user per
+    interval.
+    """
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._pending: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, id: str):
+        self._pending[id] = int(time.time())
+
+    async def flush(self) -> int:
+        """Write all pending timestamps; returns the number of users updated"""
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        stmt = (
+            update(User.__table__)
+            .where(User.__table__.c.id == bindparam("user_id"))
+            .values(last_active_at=bindparam("last_active_at"))
+        )
+        try:
+            async with get_async_db_context() as db:
+                await db.execute(
+                    stmt,
+                    [{"user_id": id, "last_active_at": ts} for id, ts in pending.items()]
+                )
+        except Exception as e:
+            log.error(f"Failed to flush last_active_at for {len(pending)} users: {e}")
+            # Keep the timestamps for the next flush unless newer ones arrived
+            for id, ts in pending.items():
+                self._pending.setdefault(id, ts)
+            return 0
+
+        return len(pending)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
 Users = UsersTable()
+AsyncUsers = AsyncUsersTable()
+last_active_buffer = LastActiveBuffer(CACHE_CONFIG["LAST_ACTIVE_FLUSH_INTERVAL"])
@@ -2,7 +2,7 @@ import logging
 from datetime import timedelta
 
 from src.web.models.auths import (
-    Auths,
+    AsyncAuths,
     SigninForm,
     SignupForm,
     SigninResponse,
@@ -10,10 +10,12 @@ from src.web.models.auths import (
     UpdateProfileForm,
     UserResponse,
 )
-from src.web.models.users import Users
+from src.web.models.users import AsyncUsers
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
+from src.web.internal.hashing_pool import hashing_pool
 from src.web.utils.auth import (
     create_token,
+    get_admin_user,
     get_current_user,
     get_authenticated_user
 )
@@ -29,15 +31,15 @@ router = APIRouter()
 @router.post("/register", response_model=SigninResponse)
 async def register_user(response: Response, form_data: SignupForm):
     # Check if user already exists
-    if Users.get_user_by_email(form_data.email.lower()):
+    if await AsyncUsers.get_user_by_email(form_data.email.lower()):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=ERROR_MESSAGES.EMAIL_TAKEN,
         )
     try:
         # Create new user
-        role = "admin" if Users.get_num_users() == 0 else "pending"
-        user = Auths.insert_new_auth(
+        role = "admin" if await AsyncUsers.get_num_users() == 0 else "pending"
+        user = await AsyncAuths.insert_new_auth(
             form_data.email.lower(),
             form_data.password,
             form_data.name,
@@ -85,7 +87,7 @@ async def register_user(response: Response, form_data: SignupForm):
 
 @router.post("/login", response_model=SigninResponse)
 async def login_user(response: Response, form_data: SigninForm):
-    user = Auths.authenticate_user(form_data.email.lower(), form_data.password)
+    user = await AsyncAuths.authenticate_user(form_data.email.lower(), form_data.password)
     if user:
         # Create access token
         token = create_token(
@@ -140,7 +142,7 @@ async def get_current_user_session(user=Depends(get_authenticated_user)):
 
 @router.put("/me/profile", response_model=UserResponse)
 async def update_user_profile(form_data: UpdateProfileForm, user=Depends(get_authenticated_user)):
-    updated_user = Users.update_user_by_id(
+    updated_user = await AsyncUsers.update_user_by_id(
         user.id,
         {
             "profile_image_url": form_data.profile_image_url,
@@ -169,10 +171,10 @@ async def update_user_password(form_data: UpdatePasswordForm, user=Depends(get_a
     Update user password
     """
     # Verify current password by authenticating user
-    auth_user = Auths.authenticate_user(user.email, form_data.password)
+    auth_user = await AsyncAuths.authenticate_user(user.email, form_data.password)
     if auth_user:
         # Update password
-        result = Auths.update_user_password_by_id(user.id, form_data.new_password)
+        result = await AsyncAuths.update_user_password_by_id(user.id, form_data.new_password)
         if result:
             return True
         else:
@@ -185,3 +187,9 @@ async def update_user_password(form_data: UpdatePasswordForm, user=Depends(get_a
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=ERROR_MESSAGES.INVALID_PASSWORD,
         )
+
+
+@router.get("/password-hashing/stats")
+async def get_password_hashing_stats(user=Depends(get_admin_user)):
+    """Queue depth and timings of the password hashing pool (admin only)"""
+    return hashing_pool.stats()
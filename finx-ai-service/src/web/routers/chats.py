@@ -1,10 +1,11 @@
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
+from src.web.internal.pagination import InvalidCursorError, paginate
 from src.web.models.chats import (
-    ChatModel, ChatForm, ChatUpdateForm, Chats,
+    ChatModel, ChatSummaryModel, ChatForm, ChatUpdateForm, AsyncChats,
     FolderModel, FolderForm, FolderUpdateForm, Folders
 )
 from src.web.utils.auth import get_verified_user, get_current_user
@@ -14,25 +15,40 @@ log.setLevel(SRC_LOG_LEVELS["API"])
 
 router = APIRouter()
 
-@router.get("/", response_model=List[ChatModel])
+@router.get("/", response_model=List[ChatSummaryModel])
 async def get_user_chats(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     archived: Optional[bool] = Query(None),
     pinned: Optional[bool] = Query(None),
     folder_id: Optional[str] = Query(None),
     current_user=Depends(get_verified_user)
 ):
-    """Get chats for the current user with optional filters"""
+    """
+    Get chat summaries for the current user with optional filters. The full
+    conversation is only served by GET /chats/{chat_id}; the cursor for the
+    next page is returned in the X-Next-Cursor header.
+    """
     try:
         if archived is True:
-            return Chats.get_archived_chats_by_user_id(current_user.id)
+            chats = await AsyncChats.get_archived_chats_by_user_id(current_user.id, limit + 1, cursor)
         elif pinned is True:
-            return Chats.get_pinned_chats_by_user_id(current_user.id)
+            chats = await AsyncChats.get_pinned_chats_by_user_id(current_user.id, limit + 1, cursor)
         elif folder_id is not None:
-            return Chats.get_chats_by_folder_id(folder_id, current_user.id)
+            chats = await AsyncChats.get_chats_by_folder_id(folder_id, current_user.id, limit + 1, cursor)
         else:
-            return Chats.get_chats_by_user_id(current_user.id, skip, limit)
+            chats = await AsyncChats.get_chats_by_user_id(current_user.id, limit + 1, cursor)
+
+        chats, next_cursor = paginate(chats, limit, "updated_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return chats
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.INVALID_CURSOR
+        )
     except Exception as e:
         log.error(f"Error fetching chats for user {current_user.id}: {str(e)}")
         raise HTTPException(
@@ -44,7 +60,7 @@ async def get_user_chats(
 async def get_chat_by_id(chat_id: str, current_user=Depends(get_verified_user)):
     """Get a specific chat by ID"""
     try:
-        chat = Chats.get_chat_by_id(chat_id)
+        chat = await AsyncChats.get_chat_by_id(chat_id)
         if not chat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -75,7 +91,7 @@ async def create_chat(
 ):
     """Create a new chat"""
     try:
-        chat = Chats.insert_new_chat(current_user.id, chat_data)
+        chat = await AsyncChats.insert_new_chat(current_user.id, chat_data)
         if not chat:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -98,7 +114,7 @@ async def update_chat_by_id(
     """Update an existing chat"""
     try:
         # Check if chat exists and user owns it
-        existing_chat = Chats.get_chat_by_id(chat_id)
+        existing_chat = await AsyncChats.get_chat_by_id(chat_id)
         if not existing_chat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -113,7 +129,7 @@ async def update_chat_by_id(
 
         # Update chat
         update_data = chat_data.model_dump(exclude_unset=True)
-        updated_chat = Chats.update_chat_by_id(chat_id, update_data)
+        updated_chat = await AsyncChats.update_chat_by_id(chat_id, update_data)
 
         if not updated_chat:
             raise HTTPException(
@@ -136,7 +152,7 @@ async def delete_chat_by_id(chat_id: str, current_user=Depends(get_verified_user
     """Delete a chat"""
     try:
         # Check if chat exists and user owns it
-        existing_chat = Chats.get_chat_by_id(chat_id)
+        existing_chat = await AsyncChats.get_chat_by_id(chat_id)
         if not existing_chat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -150,7 +166,7 @@ async def delete_chat_by_id(chat_id: str, current_user=Depends(get_verified_user
             )
 
         # Delete chat
-        success = Chats.delete_chat_by_id(chat_id)
+        success = await AsyncChats.delete_chat_by_id(chat_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -172,7 +188,7 @@ async def toggle_chat_archive_status(chat_id: str, current_user=Depends(get_veri
     """Toggle chat archive status"""
     try:
         # Check if chat exists and user owns it
-        existing_chat = Chats.get_chat_by_id(chat_id)
+        existing_chat = await AsyncChats.get_chat_by_id(chat_id)
         if not existing_chat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -185,7 +201,7 @@ async def toggle_chat_archive_status(chat_id: str, current_user=Depends(get_veri
                 detail=ERROR_MESSAGES.ACCESS_PROHIBITED
             )
 
-        updated_chat = Chats.toggle_chat_archive_by_id(chat_id)
+        updated_chat = await AsyncChats.toggle_chat_archive_by_id(chat_id)
         if not updated_chat:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -207,7 +223,7 @@ async def toggle_chat_pin_status(chat_id: str, current_user=Depends(get_verified
     """Toggle chat pin status"""
     try:
         # Check if chat exists and user owns it
-        existing_chat = Chats.get_chat_by_id(chat_id)
+        existing_chat = await AsyncChats.get_chat_by_id(chat_id)
         if not existing_chat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -220,7 +236,7 @@ async def toggle_chat_pin_status(chat_id: str, current_user=Depends(get_verified
                 detail=ERROR_MESSAGES.ACCESS_PROHIBITED
             )
 
-        updated_chat = Chats.toggle_chat_pin_by_id(chat_id)
+        updated_chat = await AsyncChats.toggle_chat_pin_by_id(chat_id)
         if not updated_chat:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -241,7 +257,7 @@ async def toggle_chat_pin_status(chat_id: str, current_user=Depends(get_verified
 async def get_shared_chat(share_id: str):
     """Get a shared chat by share ID (no authentication required)"""
     try:
-        chat = Chats.get_chat_by_share_id(share_id)
+        chat = await AsyncChats.get_chat_by_share_id(share_id)
         if not chat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -266,7 +282,7 @@ async def share_chat_by_id(
     """Share a chat or update its share ID"""
     try:
         # Check if chat exists and user owns it
-        existing_chat = Chats.get_chat_by_id(chat_id)
+        existing_chat = await AsyncChats.get_chat_by_id(chat_id)
         if not existing_chat:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -279,7 +295,7 @@ async def share_chat_by_id(
                 detail=ERROR_MESSAGES.ACCESS_PROHIBITED
             )
 
-        updated_chat = Chats.update_chat_share_id_by_id(chat_id, share_id)
+        updated_chat = await AsyncChats.update_chat_share_id_by_id(chat_id, share_id)
         if not updated_chat:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,40 +1,68 @@
+import csv
+import io
 import logging
 import asyncio
-from typing import List, Optional, Dict, Any
+import time
+import uuid
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+import orjson
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
 
-from src.web.internal.db import get_db
+from src.web.constants.config import ERROR_MESSAGES, QUERY_CONFIG
+from src.web.internal.db import get_db, release_db_session
+from src.web.internal.pagination import InvalidCursorError, keyset_filter, keyset_order, paginate
+from src.web.internal.query_executor import query_executor
+from src.web.internal.result_cache import query_result_cache
+from src.web.internal.connection_providers import pa, unique_column_names
+if pa is not None:
+    import pyarrow.ipc as pa_ipc
 from src.web.models.connections import (
     Connection, ConnectionTemplate, ConnectionLog,
     ConnectionModel, ConnectionTemplateModel, ConnectionLogModel,
     ConnectionCreateForm, ConnectionUpdateForm, ConnectionTestForm,
     ConnectionResponse, ConnectionListResponse, ConnectionTemplateResponse,
     ConnectionStatsResponse, ConnectionTestResult,
-    ConnectionType, ConnectionStatus
+    ConnectionQueryForm, ConnectionQueryResult,
+    ConnectionType, ConnectionStatus, connection_log_buffer
 )
 from src.web.utils.auth import get_current_user
 from src.web.utils.connections import (
-    test_connection, get_connection_templates, create_connection_log
+    test_connection, get_connection_templates, create_connection_log,
+    get_decrypted_connection
 )
 from src.web.utils.security import (
     encrypt_credentials, decrypt_credentials, mask_credentials,
     check_connection_permission, audit_connection_access, SecurityError,
-    validate_credentials
+    validate_credentials, redact_credentials
 )
-from src.web.utils.health_monitor import force_health_check, get_health_summary
+from src.web.utils.health_monitor import force_health_check, get_health_summary, schedule_next_check
 
 log = logging.getLogger(__name__)
 
+# Unlike the chat, message, file, knowledge and prompt routes, these still
+# query through the sync Session of get_db on the event loop; only the
+# decrypted-connection lookups and the provider calls run off it. Moving
+# them to async tables is a separate change.
 router = APIRouter()
 
 
+def _safe_credentials(connection: Connection) -> Dict[str, Any]:
+    """Credentials without secrets; only legacy rows lacking credentials_masked are decrypted"""
+    if connection.credentials_masked is not None:
+        return connection.credentials_masked
+    decrypted_creds = decrypt_credentials(connection.credentials) if connection.credentials else {}
+    return redact_credentials(decrypted_creds)
+
+
 @router.get("/", response_model=ConnectionListResponse)
 async def get_connections(
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(20, ge=1, le=100),
+    include_total: bool = Query(False),
     type_filter: Optional[ConnectionType] = Query(None, alias="type"),
     status_filter: Optional[ConnectionStatus] = Query(None, alias="status"),
     provider_filter: Optional[str] = Query(None, alias="provider"),
@@ -43,7 +71,7 @@ async def get_connections(
     current_user = Depends(get_current_user)
 ):
     try:
-        query = db.query(Connection)
+        query = db.query(Connection).filter(Connection.user_id == current_user.id)
         
         # Apply filters
         if type_filter:
@@ -61,21 +89,20 @@ async def get_connections(
                 )
             )
         
-        # Get total count
-        total = query.count()
+        # Counting scans every matching row, so only do it on request
+        total = query.count() if include_total else None
         
-        # Apply pagination
-        offset = (page - 1) * limit
-        connections = query.order_by(desc(Connection.updated_at)).offset(offset).limit(limit).all()
+        # Apply keyset pagination on (updated_at, id)
+        if cursor:
+            query = query.filter(keyset_filter(Connection.updated_at, Connection.id, cursor))
+        connections = query.order_by(*keyset_order(Connection.updated_at, Connection.id)).limit(limit + 1).all()
+        connections, next_cursor = paginate(connections, limit, "updated_at")
         
         # Convert to response models
         connection_models = []
         for conn in connections:
-            # Decrypt credentials for response (remove sensitive data)
-            decrypted_creds = decrypt_credentials(conn.credentials) if conn.credentials else {}
             # Remove sensitive fields from response
-            safe_creds = {k: v for k, v in decrypted_creds.items() 
-                         if k not in ['password', 'api_key', 'bearer_token', 'client_secret', 'private_key']}
+            safe_creds = _safe_credentials(conn)
             
             connection_model = ConnectionModel(
                 id=str(conn.id),
@@ -106,10 +133,16 @@ async def get_connections(
         return ConnectionListResponse(
             connections=connection_models,
             total=total,
-            page=page,
-            limit=limit
+            limit=limit,
+            has_next=next_cursor is not None,
+            next_cursor=next_cursor
         )
         
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.INVALID_CURSOR
+        )
     except Exception as e:
         log.error(f"Error fetching connections: {str(e)}")
         raise HTTPException(
@@ -132,10 +165,8 @@ async def get_connection(
                 detail="Connection not found"
             )
         
-        # Decrypt credentials for response (remove sensitive data)
-        decrypted_creds = decrypt_credentials(connection.credentials) if connection.credentials else {}
-        safe_creds = {k: v for k, v in decrypted_creds.items() 
-                     if k not in ['password', 'api_key', 'bearer_token', 'client_secret', 'private_key']}
+        # Remove sensitive fields from response
+        safe_creds = _safe_credentials(connection)
         
         connection_model = ConnectionModel(
             id=str(connection.id),
@@ -189,30 +220,41 @@ async def create_connection(
             )
 
         # Validate credentials
-        if not validate_credentials(connection_data.credentials.dict(), connection_data.credentials.type):
+        credentials = connection_data.credentials or {}
+        if not validate_credentials(credentials, credentials.get("type")):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid credentials for the specified authentication type"
             )
-        # Encrypt credentials
-        encrypted_creds = encrypt_credentials(connection_data.credentials.dict())
-        
-        # Create connection
+
+        # Create connection with encrypted credentials
+        now = int(time.time())
         connection = Connection(
+            id=str(uuid.uuid4()),
+            user_id=current_user.id,
             name=connection_data.name,
             description=connection_data.description,
-            type=connection_data.type,
-            provider=connection_data.provider,
-            config=connection_data.config.dict(),
-            credentials=encrypted_creds,
-            health_check=connection_data.health_check.dict(),
-            tags=connection_data.tags,
-            category=connection_data.category,
-            is_active=connection_data.is_active,
-            created_by=current_user.id,
-            updated_by=current_user.id
+            type=connection_data.type.value,
+            driver=connection_data.driver.value if connection_data.driver else None,
+            host=connection_data.host,
+            port=connection_data.port,
+            database_name=connection_data.database_name,
+            username=connection_data.username,
+            config=connection_data.config or {},
+            credentials=encrypt_credentials(credentials),
+            credentials_masked=redact_credentials(credentials),
+            connection_string=connection_data.connection_string,
+            connection_metadata=connection_data.connection_metadata or {},
+            max_connections=connection_data.max_connections,
+            timeout_seconds=connection_data.timeout_seconds,
+            status=ConnectionStatus.PENDING.value,
+            is_active=True,
+            error_count=0,
+            success_count=0,
+            created_at=now,
+            updated_at=now
         )
-        
+
         db.add(connection)
         db.commit()
         db.refresh(connection)
@@ -221,34 +263,25 @@ async def create_connection(
         audit_connection_access(str(connection.id), current_user.id, "create")
 
         # Log creation
-        await create_connection_log(
-            db, str(connection.id), "info",
+        connection_log_buffer.add(
+            connection.id, current_user.id, "info",
             f"Connection '{connection.name}' created",
-            {"user_id": current_user.id}
+            action="create", source="api"
         )
-        
-        # Convert to response model
-        connection_model = ConnectionModel(
-            id=str(connection.id),
+
+        return ConnectionResponse(
+            id=connection.id,
             name=connection.name,
-            description=connection.description,
             type=connection.type,
-            provider=connection.provider,
+            provider=connection.driver,
             status=connection.status,
             is_active=connection.is_active,
-            config=connection.config or {},
-            credentials=connection_data.credentials,  # Return original for immediate use
-            health_check=connection.health_check or {},
-            tags=connection.tags or [],
-            category=connection.category,
             created_at=connection.created_at,
-            updated_at=connection.updated_at,
-            created_by=connection.created_by,
-            updated_by=connection.updated_by
+            updated_at=connection.updated_at
         )
-        
-        return ConnectionResponse(connection=connection_model)
 
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"Error creating connection: {str(e)}")
         db.rollback()
@@ -287,6 +320,7 @@ async def update_connection(
             if field == "credentials" and value:
                 # Encrypt new credentials
                 setattr(connection, field, encrypt_credentials(value.dict()))
+                connection.credentials_masked = redact_credentials(value.dict())
             elif field in ["config", "health_check"] and value:
                 setattr(connection, field, value.dict())
             else:
@@ -298,6 +332,9 @@ async def update_connection(
         db.commit()
         db.refresh(connection)
 
+        # Drop the pooled client built from the old settings
+        await query_executor.release(connection_id)
+
         # Audit log
         audit_connection_access(str(connection.id), current_user.id, "update")
 
@@ -309,9 +346,7 @@ async def update_connection(
         )
 
         # Convert to response model
-        decrypted_creds = decrypt_credentials(connection.credentials) if connection.credentials else {}
-        safe_creds = {k: v for k, v in decrypted_creds.items()
-                     if k not in ['password', 'api_key', 'bearer_token', 'client_secret', 'private_key']}
+        safe_creds = _safe_credentials(connection)
 
         connection_model = ConnectionModel(
             id=str(connection.id),
@@ -381,6 +416,8 @@ async def delete_connection(
         db.delete(connection)
         db.commit()
 
+        await query_executor.release(connection_id)
+
         # Audit log
         audit_connection_access(connection_id, current_user.id, "delete")
 
@@ -412,6 +449,7 @@ async def test_connection_configuration(
 ):
     """Test a connection configuration"""
     try:
+        await release_db_session()
         result = await test_connection(test_data.connection_data, test_data.test_endpoint, test_data.test_method)
 
         # Log test result
@@ -461,12 +499,14 @@ async def test_existing_connection(
             health_check=ConnectionHealthCheck(**connection.health_check) if connection.health_check else ConnectionHealthCheck()
         )
 
+        await release_db_session()
         result = await test_connection(test_data, test_endpoint, test_method)
 
         # Update connection status based on test result
+        now = int(time.time())
         if result.success:
             connection.status = ConnectionStatus.ACTIVE
-            connection.last_connected = datetime.utcnow()
+            connection.last_connected_at = now
             connection.success_count += 1
             connection.last_error = None
         else:
@@ -474,7 +514,8 @@ async def test_existing_connection(
             connection.error_count += 1
             connection.last_error = result.error or result.message
 
-        connection.last_health_check = datetime.utcnow()
+        connection.last_tested_at = now
+        schedule_next_check(connection, now)
         db.commit()
 
         # Log test result
@@ -496,6 +537,330 @@ async def test_existing_connection(
         )
 
 
+@router.post("/{connection_id}/query", response_model=ConnectionQueryResult)
+async def execute_connection_query(
+    connection_id: str,
+    query_data: ConnectionQueryForm,
+    format: str = Query("rows", pattern="^(rows|columns|arrow)$"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Execute a query against a connection's data source.
+
+    format=rows returns one object per row; format=columns returns
+    column-oriented JSON and format=arrow an Arrow IPC stream, both built
+    without materializing per-row dicts.
+
+    Results are capped at QUERY_PREVIEW_ROWS rows (``truncated`` tells
+    whether more exist) unless query_data.full is set. With
+    query_data.dry_run the query is only planned and the result carries the
+    planner's estimate; arrow output falls back to column-oriented JSON.
+    """
+    try:
+        if format == "arrow" and pa is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Arrow output is not available on this server"
+            )
+
+        connection = await asyncio.to_thread(get_decrypted_connection, connection_id)
+        if not connection:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Connection not found"
+            )
+
+        if connection.user_id != current_user.id and current_user.role != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions to query this connection"
+            )
+
+        if not connection.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Connection is not active"
+            )
+
+        await release_db_session()
+        result = await query_executor.execute(
+            connection, query_data.query, query_data.params, query_data.timeout_seconds,
+            columnar=format != "rows", use_cache=query_data.use_cache,
+            preview_rows=None if query_data.full else QUERY_CONFIG["PREVIEW_ROWS"],
+            dry_run=query_data.dry_run
+        )
+
+        if format == "columns" or (format == "arrow" and (query_data.dry_run or not result.success)):
+            return Response(content=result.to_columnar_json(), media_type="application/json")
+        if format == "arrow":
+            return Response(content=result.to_arrow_ipc(), media_type="application/vnd.apache.arrow.stream")
+        return ConnectionQueryResult.model_validate(result, from_attributes=True)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error executing query on connection {connection_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to execute query"
+        )
+
+
+@router.delete("/{connection_id}/query/cache")
+async def clear_connection_query_cache(
+    connection_id: str,
+    current_user = Depends(get_current_user)
+):
+    """Drop cached query results of a connection, e.g. after its data changed"""
+    try:
+        connection = await asyncio.to_thread(get_decrypted_connection, connection_id)
+        if not connection:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Connection not found"
+            )
+
+        if connection.user_id != current_user.id and current_user.role != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions to manage this connection"
+            )
+
+        await query_result_cache.invalidate(connection_id)
+        return {"message": "Query cache cleared"}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error clearing query cache for connection {connection_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to clear query cache"
+        )
+
+
+@router.get("/query-cache/stats")
+async def get_query_cache_stats(current_user = Depends(get_current_user)):
+    """Hit/miss counters and size of the query result cache (admin only)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Insufficient permissions to view query cache statistics"
+        )
+    return query_result_cache.stats()
+
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+async def _encode_ndjson(columns: List[str], batches: AsyncIterator[Tuple[List[str], List[tuple]]]):
+    try:
+        async for columns, rows in batches:
+            keys = unique_column_names(columns)
+            yield b"".join(
+                orjson.dumps(dict(zip(keys, row)), default=str) + b"\n" for row in rows
+            )
+    except Exception as e:
+        log.error(f"Query stream failed: {str(e)}")
+        yield orjson.dumps({"error": str(e)}) + b"\n"
+        # Raising aborts the response, so the client cannot take the
+        # truncated body for a complete result
+        raise
+
+
+async def _encode_csv(columns: List[str], batches: AsyncIterator[Tuple[List[str], List[tuple]]]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    try:
+        async for columns, rows in batches:
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    except Exception as e:
+        # CSV has no error channel: abort the response instead of ending it
+        log.error(f"Query stream failed: {str(e)}")
+        raise
+
+
+def _merge_arrow_types(types: List["pa.DataType"]) -> "pa.DataType":
+    """Common type of a column's values across batches; null if they were all NULL"""
+    types = [t for t in types if not pa.types.is_null(t)]
+    if not types:
+        return pa.null()
+    if all(t == types[0] for t in types):
+        return types[0]
+    merged = pa.unify_schemas(
+        [pa.schema([pa.field("value", t)]) for t in types], promote_options="permissive"
+    )
+    return merged.field(0).type
+
+
+def _conform_batch(batch: "pa.RecordBatch", schema: "pa.Schema") -> "pa.RecordBatch":
+    return pa.RecordBatch.from_arrays(
+        [column.cast(field.type) for column, field in zip(batch.columns, schema)], schema=schema
+    )
+
+
+async def _encode_arrow(columns: List[str], batches: AsyncIterator[Tuple[List[str], List[tuple]]]):
+    """
+    The schema of an Arrow IPC stream is fixed by its first message, and a
+    column that is all NULL in a batch is inferred as type null, which no
+    later value fits. So batches are held back while a column has only
+    NULLs, up to QUERY_CONFIG["ARROW_SCHEMA_ROWS"] rows; columns still all
+    NULL then are sent as strings.
+    """
+    sink = io.BytesIO()
+    writer = None
+    schema = None
+    string_columns: List[int] = []
+    pending: List["pa.RecordBatch"] = []
+    pending_rows = 0
+
+    def arrays_of(rows):
+        arrays = [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+        for i in string_columns:
+            arrays[i] = [None if value is None else str(value) for value in arrays[i]]
+        return arrays
+
+    try:
+        async for columns, rows in batches:
+            if writer is not None:
+                writer.write_batch(pa.record_batch(arrays_of(rows), schema=schema))
+            else:
+                pending.append(pa.record_batch(arrays_of(rows), names=columns))
+                pending_rows += len(rows)
+                types = [
+                    _merge_arrow_types([batch.schema.field(i).type for batch in pending])
+                    for i in range(len(columns))
+                ]
+                untyped = [i for i, t in enumerate(types) if pa.types.is_null(t)]
+                if untyped and pending_rows < QUERY_CONFIG["ARROW_SCHEMA_ROWS"]:
+                    continue
+
+                string_columns = untyped
+                for i in string_columns:
+                    types[i] = pa.string()
+                schema = pa.schema([pa.field(name, t) for name, t in zip(columns, types)])
+                writer = pa_ipc.new_stream(sink, schema)
+                for batch in pending:
+                    writer.write_batch(_conform_batch(batch, schema))
+                pending = []
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+
+        if writer is None and pending:
+            # The result ended while columns were still all NULL: their
+            # null type is accurate
+            schema = pa.schema([
+                pa.field(name, _merge_arrow_types([batch.schema.field(i).type for batch in pending]))
+                for i, name in enumerate(pending[0].schema.names)
+            ])
+            writer = pa_ipc.new_stream(sink, schema)
+            for batch in pending:
+                writer.write_batch(_conform_batch(batch, schema))
+        if writer is not None:
+            writer.close()
+            yield sink.getvalue()
+    except Exception as e:
+        # Abort the response: ending it cleanly would leave the client an
+        # IPC stream without end-of-stream marker that may still parse
+        log.error(f"Query stream failed: {str(e)}")
+        raise
+
+
+STREAM_ENCODERS = {
+    "ndjson": _encode_ndjson,
+    "csv": _encode_csv,
+    "arrow": _encode_arrow,
+}
+
+
+@router.post("/{connection_id}/query/stream")
+async def stream_connection_query(
+    connection_id: str,
+    query_data: ConnectionQueryForm,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|arrow)$"),
+    current_user = Depends(get_current_user)
+):
+    """
+    Stream a query result as NDJSON (one object per row), CSV or an Arrow
+    IPC stream. Rows are fetched in batches as the client reads them and
+    stop at query_data.max_rows. Errors before the first batch are returned
+    as HTTP errors; later ones abort the response (NDJSON first adds an
+    error line).
+    """
+    try:
+        if format == "arrow" and pa is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Arrow output is not available on this server"
+            )
+
+        connection = await asyncio.to_thread(get_decrypted_connection, connection_id)
+        if not connection:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Connection not found"
+            )
+
+        if connection.user_id != current_user.id and current_user.role != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions to query this connection"
+            )
+
+        if not connection.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Connection is not active"
+            )
+
+        await release_db_session()
+        batches = query_executor.stream_query(
+            connection, query_data.query, query_data.params,
+            max_rows=query_data.max_rows, timeout=query_data.timeout_seconds
+        )
+        try:
+            first_columns, first_rows = await batches.__anext__()
+        except StopAsyncIteration:
+            first_columns, first_rows = [], []
+        except Exception as e:
+            await batches.aclose()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Query failed: {str(e)}"
+            )
+
+        async def with_first_batch():
+            try:
+                yield first_columns, first_rows
+                async for batch in batches:
+                    yield batch
+            finally:
+                await batches.aclose()
+
+        return StreamingResponse(
+            STREAM_ENCODERS[format](first_columns, with_first_batch()),
+            media_type=STREAM_MEDIA_TYPES[format]
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Error streaming query on connection {connection_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to execute query"
+        )
+
+
 @router.get("/templates", response_model=ConnectionTemplateResponse)
 async def get_connection_templates(
     db: Session = Depends(get_db),
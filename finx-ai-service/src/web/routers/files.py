@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile
 
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
 from src.web.models.files import (
-    FileModel, FileForm, FileUpdateForm, Files
+    FileModel, FileForm, FileUpdateForm, AsyncFiles
 )
 from src.web.utils.auth import get_verified_user, get_admin_user
 
@@ -23,11 +23,11 @@ async def get_files(
     """Get files"""
     try:
         if user_only or current_user.role != "admin":
-            return Files.get_files_by_user_id(current_user.id, skip, limit)
+            return await AsyncFiles.get_files_by_user_id(current_user.id, skip, limit)
         else:
             # For admin, get all users' files (we'll need to implement this differently)
             # For now, just return current user's files
-            return Files.get_files_by_user_id(current_user.id, skip, limit)
+            return await AsyncFiles.get_files_by_user_id(current_user.id, skip, limit)
     except Exception as e:
         log.error(f"Error fetching files: {str(e)}")
         raise HTTPException(
@@ -39,7 +39,7 @@ async def get_files(
 async def get_file(file_id: str, current_user=Depends(get_verified_user)):
     """Get a specific file by ID"""
     try:
-        file = Files.get_file_by_id(file_id)
+        file = await AsyncFiles.get_file_by_id(file_id)
         if not file:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -70,7 +70,7 @@ async def create_file(
 ):
     """Create a new file record"""
     try:
-        file = Files.insert_new_file(current_user.id, file_data)
+        file = await AsyncFiles.insert_new_file(current_user.id, file_data)
         if not file:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -100,7 +100,7 @@ async def upload_file(
             data={"size": len(content), "content_type": file.content_type}
         )
         
-        file_record = Files.insert_new_file(current_user.id, file_data)
+        file_record = await AsyncFiles.insert_new_file(current_user.id, file_data)
         if not file_record:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -127,7 +127,7 @@ async def update_file(
     """Update an existing file"""
     try:
         # Check if file exists
-        existing_file = Files.get_file_by_id(file_id)
+        existing_file = await AsyncFiles.get_file_by_id(file_id)
         if not existing_file:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -142,7 +142,8 @@ async def update_file(
             )
         
         # Update file
-        updated_file = Files.update_file_by_id(file_id, file_data)
+        update_data = file_data.model_dump(exclude_unset=True)
+        updated_file = await AsyncFiles.update_file_by_id(file_id, update_data)
         if not updated_file:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -164,7 +165,7 @@ async def delete_file(file_id: str, current_user=Depends(get_verified_user)):
     """Delete a file"""
     try:
         # Check if file exists
-        existing_file = Files.get_file_by_id(file_id)
+        existing_file = await AsyncFiles.get_file_by_id(file_id)
         if not existing_file:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -179,7 +180,7 @@ async def delete_file(file_id: str, current_user=Depends(get_verified_user)):
             )
         
         # Delete file
-        success = Files.delete_file_by_id(file_id)
+        success = await AsyncFiles.delete_file_by_id(file_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -201,7 +202,7 @@ async def get_files_by_hash(file_hash: str, current_user=Depends(get_verified_us
     """Get files by hash"""
     try:
         # Use the existing get_file_by_hash method
-        file = Files.get_file_by_hash(file_hash)
+        file = await AsyncFiles.get_file_by_hash(file_hash)
         files = [file] if file else []
 
         # Filter files based on access permissions
@@ -221,7 +222,7 @@ async def get_files_by_hash(file_hash: str, current_user=Depends(get_verified_us
 async def get_files_by_filename(filename: str, current_user=Depends(get_verified_user)):
     """Get files by filename"""
     try:
-        files = Files.get_files_by_filename(filename)
+        files = await AsyncFiles.get_files_by_filename(filename)
         # Filter files based on access permissions
         accessible_files = []
         for file in files:
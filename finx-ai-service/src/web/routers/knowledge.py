@@ -1,10 +1,11 @@
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
+from src.web.internal.pagination import InvalidCursorError, paginate
 from src.web.models.knowledge import (
-    KnowledgeModel, KnowledgeForm, KnowledgeResponse, Knowledges
+    KnowledgeModel, KnowledgeForm, KnowledgeResponse, AsyncKnowledges
 )
 from src.web.utils.auth import get_verified_user, get_admin_user
 
@@ -15,15 +16,28 @@ router = APIRouter()
 
 @router.get("/", response_model=List[KnowledgeModel])
 async def get_knowledge_bases(
+    response: Response,
     user_only: bool = Query(False, description="Get only current user's knowledge bases"),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
     current_user=Depends(get_verified_user)
 ):
-    """Get knowledge bases"""
+    """Get knowledge bases, paged via the X-Next-Cursor header"""
     try:
         if user_only or current_user.role != "admin":
-            return Knowledges.get_knowledge_bases_by_user_id(current_user.id)
+            knowledge_bases = await AsyncKnowledges.get_knowledge_bases_by_user_id(current_user.id, limit + 1, cursor)
         else:
-            return Knowledges.get_knowledge_bases()
+            knowledge_bases = await AsyncKnowledges.get_knowledge_bases(limit + 1, cursor)
+
+        knowledge_bases, next_cursor = paginate(knowledge_bases, limit, "updated_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return knowledge_bases
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.INVALID_CURSOR
+        )
     except Exception as e:
         log.error(f"Error fetching knowledge bases: {str(e)}")
         raise HTTPException(
@@ -35,7 +49,7 @@ async def get_knowledge_bases(
 async def get_knowledge_base(knowledge_id: str, current_user=Depends(get_verified_user)):
     """Get a specific knowledge base by ID"""
     try:
-        knowledge = Knowledges.get_knowledge_by_id(knowledge_id)
+        knowledge = await AsyncKnowledges.get_knowledge_by_id(knowledge_id)
         if not knowledge:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -67,7 +81,7 @@ async def create_knowledge_base(
 ):
     """Create a new knowledge base"""
     try:
-        knowledge = Knowledges.insert_new_knowledge(current_user.id, knowledge_data)
+        knowledge = await AsyncKnowledges.insert_new_knowledge(current_user.id, knowledge_data)
         if not knowledge:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -90,7 +104,7 @@ async def update_knowledge_base(
     """Update an existing knowledge base"""
     try:
         # Check if knowledge base exists
-        existing_knowledge = Knowledges.get_knowledge_by_id(knowledge_id)
+        existing_knowledge = await AsyncKnowledges.get_knowledge_by_id(knowledge_id)
         if not existing_knowledge:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -105,7 +119,7 @@ async def update_knowledge_base(
             )
         
         # Update knowledge base
-        updated_knowledge = Knowledges.update_knowledge_by_id(knowledge_id, knowledge_data)
+        updated_knowledge = await AsyncKnowledges.update_knowledge_by_id(knowledge_id, knowledge_data)
         if not updated_knowledge:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -127,7 +141,7 @@ async def delete_knowledge_base(knowledge_id: str, current_user=Depends(get_veri
     """Delete a knowledge base"""
     try:
         # Check if knowledge base exists
-        existing_knowledge = Knowledges.get_knowledge_by_id(knowledge_id)
+        existing_knowledge = await AsyncKnowledges.get_knowledge_by_id(knowledge_id)
         if not existing_knowledge:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -142,7 +156,7 @@ async def delete_knowledge_base(knowledge_id: str, current_user=Depends(get_veri
             )
         
         # Delete knowledge base
-        success = Knowledges.delete_knowledge_by_id(knowledge_id)
+        success = await AsyncKnowledges.delete_knowledge_by_id(knowledge_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -168,7 +182,7 @@ async def update_knowledge_data(
     """Update knowledge base data"""
     try:
         # Check if knowledge base exists
-        existing_knowledge = Knowledges.get_knowledge_by_id(knowledge_id)
+        existing_knowledge = await AsyncKnowledges.get_knowledge_by_id(knowledge_id)
         if not existing_knowledge:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -183,7 +197,7 @@ async def update_knowledge_data(
             )
         
         # Update knowledge data
-        updated_knowledge = Knowledges.update_knowledge_data_by_id(knowledge_id, data)
+        updated_knowledge = await AsyncKnowledges.update_knowledge_data_by_id(knowledge_id, data)
         if not updated_knowledge:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -204,7 +218,7 @@ async def update_knowledge_data(
 async def delete_all_knowledge_bases(current_user=Depends(get_admin_user)):
     """Delete all knowledge bases (admin only)"""
     try:
-        success = Knowledges.delete_all_knowledge()
+        success = await AsyncKnowledges.delete_all_knowledge()
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,11 +1,12 @@
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
+from src.web.internal.pagination import InvalidCursorError, paginate
 from src.web.models.messages import (
-    MessageModel, MessageForm, MessageUpdateForm, Messages,
-    MessageReactionModel, MessageReactionForm, MessageReactions
+    MessageModel, MessageForm, MessageUpdateForm, AsyncMessages,
+    MessageReactionModel, MessageReactionForm, AsyncMessageReactions
 )
 from src.web.utils.auth import get_verified_user
 
@@ -16,16 +17,20 @@ router = APIRouter()
 
 @router.get("/", response_model=List[MessageModel])
 async def get_user_messages(
+    response: Response,
     channel_id: Optional[str] = Query(None),
     user_id: Optional[str] = Query(None),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=100),
     current_user=Depends(get_verified_user)
 ):
-    """Get messages with optional filters"""
+    """
+    Get messages with optional filters. The cursor for the next page is
+    returned in the X-Next-Cursor header.
+    """
     try:
         if channel_id:
-            return Messages.get_messages_by_channel_id(channel_id, skip, limit)
+            messages = await AsyncMessages.get_messages_by_channel_id(channel_id, limit + 1, cursor)
         elif user_id:
             # Users can only see their own messages unless they're admin
             if user_id != current_user.id and current_user.role != "admin":
@@ -33,12 +38,22 @@ async def get_user_messages(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=ERROR_MESSAGES.ACCESS_PROHIBITED
                 )
-            return Messages.get_messages_by_user_id(user_id, skip, limit)
+            messages = await AsyncMessages.get_messages_by_user_id(user_id, limit + 1, cursor)
         else:
             # Default to current user's messages
-            return Messages.get_messages_by_user_id(current_user.id, skip, limit)
+            messages = await AsyncMessages.get_messages_by_user_id(current_user.id, limit + 1, cursor)
+
+        messages, next_cursor = paginate(messages, limit, "created_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return messages
     except HTTPException:
         raise
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.INVALID_CURSOR
+        )
     except Exception as e:
         log.error(f"Error fetching messages: {str(e)}")
         raise HTTPException(
@@ -50,7 +65,7 @@ async def get_user_messages(
 async def get_message_by_id(message_id: str, current_user=Depends(get_verified_user)):
     """Get a specific message by ID"""
     try:
-        message = Messages.get_message_by_id(message_id)
+        message = await AsyncMessages.get_message_by_id(message_id)
         if not message:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -81,7 +96,7 @@ async def create_message(
 ):
     """Create a new message"""
     try:
-        message = Messages.insert_new_message(current_user.id, message_data)
+        message = await AsyncMessages.insert_new_message(current_user.id, message_data)
         if not message:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -104,7 +119,7 @@ async def update_message_by_id(
     """Update an existing message"""
     try:
         # Check if message exists and user owns it
-        existing_message = Messages.get_message_by_id(message_id)
+        existing_message = await AsyncMessages.get_message_by_id(message_id)
         if not existing_message:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -119,7 +134,7 @@ async def update_message_by_id(
         
         # Update message
         update_data = message_data.model_dump(exclude_unset=True)
-        updated_message = Messages.update_message_by_id(message_id, update_data)
+        updated_message = await AsyncMessages.update_message_by_id(message_id, update_data)
         
         if not updated_message:
             raise HTTPException(
@@ -142,7 +157,7 @@ async def delete_message_by_id(message_id: str, current_user=Depends(get_verifie
     """Delete a message"""
     try:
         # Check if message exists and user owns it
-        existing_message = Messages.get_message_by_id(message_id)
+        existing_message = await AsyncMessages.get_message_by_id(message_id)
         if not existing_message:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -156,7 +171,7 @@ async def delete_message_by_id(message_id: str, current_user=Depends(get_verifie
             )
         
         # Delete message (this will also delete replies)
-        success = Messages.delete_message_by_id(message_id)
+        success = await AsyncMessages.delete_message_by_id(message_id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -174,20 +189,35 @@ async def delete_message_by_id(message_id: str, current_user=Depends(get_verifie
         )
 
 @router.get("/{message_id}/replies", response_model=List[MessageModel])
-async def get_message_replies(message_id: str, current_user=Depends(get_verified_user)):
-    """Get replies to a specific message"""
+async def get_message_replies(
+    message_id: str,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    current_user=Depends(get_verified_user)
+):
+    """Get replies to a specific message, oldest first"""
     try:
         # Check if parent message exists
-        parent_message = Messages.get_message_by_id(message_id)
+        parent_message = await AsyncMessages.get_message_by_id(message_id)
         if not parent_message:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=ERROR_MESSAGES.RESOURCE_NOT_FOUND
             )
         
-        return Messages.get_replies_by_parent_id(message_id)
+        replies = await AsyncMessages.get_replies_by_parent_id(message_id, limit + 1, cursor)
+        replies, next_cursor = paginate(replies, limit, "created_at")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return replies
     except HTTPException:
         raise
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.INVALID_CURSOR
+        )
     except Exception as e:
         log.error(f"Error fetching replies for message {message_id}: {str(e)}")
         raise HTTPException(
@@ -200,14 +230,14 @@ async def get_message_reactions(message_id: str, current_user=Depends(get_verifi
     """Get reactions for a specific message"""
     try:
         # Check if message exists
-        message = Messages.get_message_by_id(message_id)
+        message = await AsyncMessages.get_message_by_id(message_id)
         if not message:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=ERROR_MESSAGES.RESOURCE_NOT_FOUND
             )
         
-        return MessageReactions.get_reactions_by_message_id(message_id)
+        return await AsyncMessageReactions.get_reactions_by_message_id(message_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -226,7 +256,7 @@ async def add_message_reaction(
     """Add a reaction to a message"""
     try:
         # Check if message exists
-        message = Messages.get_message_by_id(message_id)
+        message = await AsyncMessages.get_message_by_id(message_id)
         if not message:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -234,7 +264,7 @@ async def add_message_reaction(
             )
         
         # Check if user already reacted with this emoji
-        existing_reaction = MessageReactions.get_reaction_by_user_and_message(
+        existing_reaction = await AsyncMessageReactions.get_reaction_by_user_and_message(
             current_user.id, message_id, reaction_data.name
         )
         if existing_reaction:
@@ -243,7 +273,7 @@ async def add_message_reaction(
                 detail="User already reacted with this emoji"
             )
         
-        reaction = MessageReactions.insert_new_reaction(current_user.id, message_id, reaction_data)
+        reaction = await AsyncMessageReactions.insert_new_reaction(current_user.id, message_id, reaction_data)
         if not reaction:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -269,7 +299,7 @@ async def remove_message_reaction(
     """Remove a reaction from a message"""
     try:
         # Check if message exists
-        message = Messages.get_message_by_id(message_id)
+        message = await AsyncMessages.get_message_by_id(message_id)
         if not message:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -277,7 +307,7 @@ async def remove_message_reaction(
             )
         
         # Check if reaction exists
-        existing_reaction = MessageReactions.get_reaction_by_user_and_message(
+        existing_reaction = await AsyncMessageReactions.get_reaction_by_user_and_message(
             current_user.id, message_id, reaction_name
         )
         if not existing_reaction:
@@ -286,7 +316,7 @@ async def remove_message_reaction(
                 detail="Reaction not found"
             )
         
-        success = MessageReactions.delete_reaction_by_user_and_message(
+        success = await AsyncMessageReactions.delete_reaction_by_user_and_message(
             current_user.id, message_id, reaction_name
         )
         if not success:
@@ -1,10 +1,11 @@
 import logging
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
+from src.web.internal.pagination import InvalidCursorError, paginate
 from src.web.models.prompts import (
-    PromptModel, PromptForm, PromptResponse, Prompts
+    PromptModel, PromptForm, PromptResponse, AsyncPrompts
 )
 from src.web.utils.auth import get_verified_user, get_admin_user
 
@@ -15,22 +16,41 @@ router = APIRouter()
 
 @router.get("/", response_model=List[PromptModel])
 async def get_prompts(
+    response: Response,
     user_only: bool = Query(False, description="Get only current user's prompts"),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
     current_user=Depends(get_verified_user)
 ):
-    """Get prompts"""
+    """
+    Get prompts, paged via the X-Next-Cursor header. Pages can come back
+    shorter than limit since access filtering runs after the fetch.
+    """
     try:
         if user_only:
-            prompts = Prompts.get_prompts_by_user_id(current_user.id)
+            page = await AsyncPrompts.get_prompts_by_user_id(current_user.id, limit + 1, cursor)
+        else:
+            page = await AsyncPrompts.get_prompts(limit + 1, cursor)
+
+        page, next_cursor = paginate(page, limit, "timestamp", "command")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+
+        if user_only:
+            prompts = page
         else:
-            all_prompts = Prompts.get_prompts()
             # Filter prompts based on access permissions
             prompts = []
-            for prompt in all_prompts:
+            for prompt in page:
                 if _check_prompt_access(prompt, current_user, "read"):
                     prompts.append(prompt)
         
         return prompts
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.INVALID_CURSOR
+        )
     except Exception as e:
         log.error(f"Error fetching prompts: {str(e)}")
         raise HTTPException(
@@ -42,7 +62,7 @@ async def get_prompts(
 async def get_prompt(command: str, current_user=Depends(get_verified_user)):
     """Get a specific prompt by command"""
     try:
-        prompt = Prompts.get_prompt_by_command(command)
+        prompt = await AsyncPrompts.get_prompt_by_command(command)
         if not prompt:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -74,14 +94,14 @@ async def create_prompt(
     """Create a new prompt"""
     try:
         # Check if prompt with this command already exists
-        existing_prompt = Prompts.get_prompt_by_command(prompt_data.command)
+        existing_prompt = await AsyncPrompts.get_prompt_by_command(prompt_data.command)
         if existing_prompt:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Prompt with this command already exists"
             )
         
-        prompt = Prompts.insert_new_prompt(current_user.id, prompt_data)
+        prompt = await AsyncPrompts.insert_new_prompt(current_user.id, prompt_data)
         if not prompt:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -106,7 +126,7 @@ async def update_prompt(
     """Update an existing prompt"""
     try:
         # Check if prompt exists
-        existing_prompt = Prompts.get_prompt_by_command(command)
+        existing_prompt = await AsyncPrompts.get_prompt_by_command(command)
         if not existing_prompt:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -121,7 +141,7 @@ async def update_prompt(
             )
         
         # Update prompt
-        updated_prompt = Prompts.update_prompt_by_command(command, prompt_data)
+        updated_prompt = await AsyncPrompts.update_prompt_by_command(command, prompt_data)
         if not updated_prompt:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -143,7 +163,7 @@ async def delete_prompt(command: str, current_user=Depends(get_verified_user)):
     """Delete a prompt"""
     try:
         # Check if prompt exists
-        existing_prompt = Prompts.get_prompt_by_command(command)
+        existing_prompt = await AsyncPrompts.get_prompt_by_command(command)
         if not existing_prompt:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -158,7 +178,7 @@ async def delete_prompt(command: str, current_user=Depends(get_verified_user)):
             )
         
         # Delete prompt
-        success = Prompts.delete_prompt_by_command(command)
+        success = await AsyncPrompts.delete_prompt_by_command(command)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -179,7 +199,7 @@ async def delete_prompt(command: str, current_user=Depends(get_verified_user)):
 async def get_my_prompts(current_user=Depends(get_verified_user)):
     """Get current user's prompts"""
     try:
-        return Prompts.get_prompts_by_user_id(current_user.id)
+        return await AsyncPrompts.get_prompts_by_user_id(current_user.id)
     except Exception as e:
         log.error(f"Error fetching user prompts for {current_user.id}: {str(e)}")
         raise HTTPException(
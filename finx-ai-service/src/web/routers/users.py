@@ -1,7 +1,7 @@
 import logging
 from typing import Optional
 
-from src.web.models.auths import Auths
+from src.web.models.auths import Auths, AsyncAuths
 from src.web.models.chats import Chats
 from src.web.models.users import (
     UserModel,
@@ -12,9 +12,9 @@ from src.web.models.users import (
 )
 
 from src.web.constants.config import ERROR_MESSAGES, SRC_LOG_LEVELS
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
-from src.web.utils.auth import get_admin_user, get_password_hash, get_verified_user
+from src.web.utils.auth import get_admin_user, get_verified_user
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["API"])
@@ -24,8 +24,8 @@ router = APIRouter()
 
 @router.get("/", response_model=list[UserModel])
 async def get_all_users(
-    skip: Optional[int] = None,
-    limit: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
     user=Depends(get_admin_user),
 ):
     return Users.get_users(skip, limit)
@@ -220,9 +220,7 @@ async def update_user_by_id(
                 )
 
         if form_data.password:
-            hashed = get_password_hash(form_data.password)
-            log.debug(f"hashed: {hashed}")
-            Auths.update_user_password_by_id(user_id, hashed)
+            await AsyncAuths.update_user_password_by_id(user_id, form_data.password)
 
         Auths.update_email_by_id(user_id, form_data.email.lower())
         updated_user = Users.update_user_by_id(
@@ -5,7 +5,7 @@ from .auth import *
 
 # Logging utilities
 from .logging import (
-    FinxLogger, ContextLogger, LogLevel, LogFormat,
+    FinxLogger, ContextLogger, LogLevel, LogFormat, LogSampler,
     get_logger, setup_logging, logger,
     log_function_call, log_performance,
     DatabaseLogger, APILogger, SecurityLogger,
@@ -16,6 +16,7 @@ from .logging_integration import (
     DatabaseLoggingMixin, ConnectionLoggingMixin, 
     APILoggingMixin, SecurityLoggingMixin,
     log_database_operation, log_connection_operation,
+    db_log_sampler, connection_log_sampler,
     enhance_table_with_logging, log_model_operation,
     setup_model_logging, LoggedOperation
 )
@@ -23,7 +24,7 @@ from .logging_integration import (
 # Export all logging utilities
 __all__ = [
     # Core logging
-    "FinxLogger", "ContextLogger", "LogLevel", "LogFormat",
+    "FinxLogger", "ContextLogger", "LogLevel", "LogFormat", "LogSampler",
     "get_logger", "setup_logging", "logger",
     
     # Decorators
@@ -41,6 +42,7 @@ __all__ = [
     
     # Integration decorators
     "log_database_operation", "log_connection_operation",
+    "db_log_sampler", "connection_log_sampler",
     
     # Utilities
     "enhance_table_with_logging", "log_model_operation",
@@ -1,4 +1,3 @@
-import logging
 import uuid
 import jwt
 
@@ -6,27 +5,15 @@ from datetime import UTC, datetime, timedelta
 from typing import Optional, Union, List, Dict
 
 from src.web.constants.config import ERROR_MESSAGES, SECURITY_CONFIG
-from src.web.models.users import Users
+from src.web.models.users import Users, AsyncUsers, last_active_buffer
 
 from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from passlib.context import CryptContext
-
-logging.getLogger("passlib").setLevel(logging.ERROR)
 
 SESSION_SECRET = SECURITY_CONFIG["SECRET_KEY"]
 ALGORITHM = SECURITY_CONFIG["ALGORITHM"]
 
 bearer_security = HTTPBearer(auto_error=False)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password, hashed_password):
-    return (
-        pwd_context.verify(plain_password, hashed_password) if hashed_password else None
-    )
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
 
 def create_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
     payload = data.copy()
@@ -59,7 +46,7 @@ def get_http_authorization_cred(auth_header: str):
     except Exception:
         raise ValueError(ERROR_MESSAGES.INVALID_TOKEN)
 
-def get_current_user(
+async def get_current_user(
     request: Request,
     auth_token: HTTPAuthorizationCredentials = Depends(bearer_security),
 ):
@@ -107,14 +94,14 @@ def get_current_user(
         )
 
     if data is not None and "id" in data:
-        user = Users.get_user_by_id(data["id"])
+        user = await AsyncUsers.get_user_by_id(data["id"])
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=ERROR_MESSAGES.INVALID_TOKEN,
             )
         else:
-            Users.update_user_last_active_by_id(user.id)
+            last_active_buffer.touch(user.id)
         return user
     else:
         raise HTTPException(
@@ -131,7 +118,7 @@ def get_current_user_by_api_key(api_key: str):
             detail=ERROR_MESSAGES.INVALID_TOKEN,
         )
     else:
-        Users.update_user_last_active_by_id(user.id)
+        last_active_buffer.touch(user.id)
 
     return user
 
@@ -6,7 +6,10 @@ from typing import Dict, Any, Optional, List
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+from src.web.internal.db import get_db_context
+from src.web.internal.http_client import http_client
 from src.web.models.connections import (
+    Connection, ConnectionModel,
     ConnectionCreateForm, ConnectionTestResult, ConnectionTemplateModel,
     ConnectionLog, ConnectionType, AuthenticationType
 )
@@ -17,6 +20,24 @@ from src.web.utils.security import (
 
 log = logging.getLogger(__name__)
 
+def to_connection_model(connection: Connection) -> ConnectionModel:
+    """
+    Build a ConnectionModel with decrypted credentials, as the connection
+    providers expect. Stored credentials are an encrypted string, which
+    ConnectionModel cannot hold.
+    """
+    values = {column.name: getattr(connection, column.name) for column in Connection.__table__.columns}
+    credentials = values["credentials"]
+    if isinstance(credentials, str):
+        values["credentials"] = decrypt_credentials(credentials)
+    return ConnectionModel.model_validate(values)
+
+def get_decrypted_connection(connection_id: str) -> Optional[ConnectionModel]:
+    """Load a connection for query execution; None if it does not exist"""
+    with get_db_context() as db:
+        connection = db.query(Connection).filter(Connection.id == connection_id).first()
+        return to_connection_model(connection) if connection else None
+
 async def test_connection(
     connection_data: ConnectionCreateForm,
     test_endpoint: Optional[str] = None,
@@ -236,28 +257,30 @@ async def test_api_connection(
         
         timeout = connection_data.config.timeout or 30
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.request(test_method, test_url, headers=headers) as response:
-                response_time = time.time() - start_time
-                
-                if response.status < 400:
-                    return ConnectionTestResult(
-                        success=True,
-                        message=f"API connection successful (HTTP {response.status})",
-                        response_time=response_time,
-                        status_code=response.status,
-                        timestamp=datetime.utcnow()
-                    )
-                else:
-                    error_text = await response.text()
-                    return ConnectionTestResult(
-                        success=False,
-                        message=f"API connection failed (HTTP {response.status})",
-                        response_time=response_time,
-                        status_code=response.status,
-                        error=error_text[:500],  # Limit error message length
-                        timestamp=datetime.utcnow()
-                    )
+        session = http_client.get_session()
+        async with session.request(
+            test_method, test_url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            response_time = time.time() - start_time
+
+            if response.status < 400:
+                return ConnectionTestResult(
+                    success=True,
+                    message=f"API connection successful (HTTP {response.status})",
+                    response_time=response_time,
+                    status_code=response.status,
+                    timestamp=datetime.utcnow()
+                )
+            else:
+                error_text = await response.text()
+                return ConnectionTestResult(
+                    success=False,
+                    message=f"API connection failed (HTTP {response.status})",
+                    response_time=response_time,
+                    status_code=response.status,
+                    error=error_text[:500],  # Limit error message length
+                    timestamp=datetime.utcnow()
+                )
                     
     except asyncio.TimeoutError:
         response_time = time.time() - start_time
@@ -553,38 +576,39 @@ async def test_webhook_connection(
 
         timeout = connection_data.config.timeout or 30
 
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
-            async with session.request(
-                test_method,
-                test_url,
-                headers=headers,
-                json=test_payload
-            ) as response:
-                response_time = time.time() - start_time
-                response_text = await response.text()
-
-                if response.status < 400:
-                    return ConnectionTestResult(
-                        success=True,
-                        message=f"Webhook test successful (HTTP {response.status})",
-                        response_time=response_time,
-                        status_code=response.status,
-                        details={
-                            "webhook_url": test_url,
-                            "method": test_method,
-                            "response_preview": response_text[:200] if response_text else None
-                        },
-                        timestamp=datetime.utcnow()
-                    )
-                else:
-                    return ConnectionTestResult(
-                        success=False,
-                        message=f"Webhook test failed (HTTP {response.status})",
-                        response_time=response_time,
-                        status_code=response.status,
-                        error=response_text[:500],
-                        timestamp=datetime.utcnow()
-                    )
+        session = http_client.get_session()
+        async with session.request(
+            test_method,
+            test_url,
+            headers=headers,
+            json=test_payload,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            response_time = time.time() - start_time
+            response_text = await response.text()
+
+            if response.status < 400:
+                return ConnectionTestResult(
+                    success=True,
+                    message=f"Webhook test successful (HTTP {response.status})",
+                    response_time=response_time,
+                    status_code=response.status,
+                    details={
+                        "webhook_url": test_url,
+                        "method": test_method,
+                        "response_preview": response_text[:200] if response_text else None
+                    },
+                    timestamp=datetime.utcnow()
+                )
+            else:
+                return ConnectionTestResult(
+                    success=False,
+                    message=f"Webhook test failed (HTTP {response.status})",
+                    response_time=response_time,
+                    status_code=response.status,
+                    error=response_text[:500],
+                    timestamp=datetime.utcnow()
+                )
 
     except asyncio.TimeoutError:
         response_time = time.time() - start_time
@@ -1,20 +1,41 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import random
+import time
+from datetime import datetime
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, bindparam, func, update
 
-from src.web.internal.db import get_db
+from src.web.constants.config import HEALTH_CHECK_CONFIG, LOG_SAMPLING_CONFIG
+from src.web.internal.db import get_db, get_db_context, release_db_session
 from src.web.models.connections import (
-    Connection, ConnectionLog, ConnectionStatus,
-    ConnectionCreateForm
+    Connection, ConnectionLog, ConnectionModel, ConnectionStatus,
+    ConnectionCreateForm, ConnectionTestResult, connection_log_buffer
 )
-from src.web.utils.connections import test_connection, create_connection_log
-from src.web.utils.security import decrypt_credentials
+from src.web.utils.connections import test_connection, to_connection_model
+from src.web.utils.logging import LogSampler
 
 log = logging.getLogger(__name__)
 
+
+def _summarize_health_checks(connection_type: str, summary: Dict[str, Any]):
+    log.info(
+        f"Health checks for {connection_type}: {summary['calls']} run, {summary['failures']} failed, "
+        f"{summary['logged']} logged, avg {summary['avg_time']:.3f}s, max {summary['max_time']:.3f}s"
+    )
+
+# Per-check "debug" rows of successful checks are sampled by connection
+# type; failed checks and status changes are always logged
+health_check_log_sampler = LogSampler(
+    _summarize_health_checks,
+    success_rate=LOG_SAMPLING_CONFIG["SUCCESS_RATE"],
+    failure_rate=LOG_SAMPLING_CONFIG["FAILURE_RATE"],
+    rate_limit=LOG_SAMPLING_CONFIG["RATE_LIMIT"],
+    rate_window=LOG_SAMPLING_CONFIG["RATE_WINDOW"],
+    summary_interval=LOG_SAMPLING_CONFIG["SUMMARY_INTERVAL"],
+)
+
 class HealthMonitor:
     """Background health monitoring for connections"""
     
@@ -43,15 +64,24 @@ class HealthMonitor:
     def stop_monitoring(self):
         """Stop the health monitoring"""
         self.is_running = False
+        health_check_log_sampler.stop()
         log.info("Stopping connection health monitoring")
     
     async def perform_health_checks(self):
-        """Perform health checks for all active connections"""
+        """Perform health checks for all due connections"""
         try:
-            db = next(get_db())
-            
-            # Get connections that need health checks
-            connections_to_check = self.get_connections_for_health_check(db)
+            # Load the due connections in a short transaction; the checks
+            # themselves run without holding a session
+            with get_db_context() as db:
+                connections_to_check = []
+                for connection in self.get_connections_for_health_check(db):
+                    try:
+                        connections_to_check.append(to_connection_model(connection))
+                    except Exception as e:
+                        # One unreadable row must not roll back the claim of
+                        # the others; look at it again after one interval
+                        log.error(f"Skipping health check of connection {connection.id}: {str(e)}")
+                        schedule_next_check(connection, int(time.time()))
             
             if not connections_to_check:
                 return
@@ -63,133 +93,205 @@ class HealthMonitor:
             tasks = []
             
             for connection in connections_to_check:
-                task = self.check_single_connection(db, connection, semaphore)
+                task = self.check_single_connection(connection, semaphore)
                 tasks.append(task)
             
-            # Wait for all health checks to complete
-            await asyncio.gather(*tasks, return_exceptions=True)
+            # Wait for all health checks to complete, then write all status
+            # updates in one statement
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            self.apply_check_results([result for result in results if isinstance(result, dict)])
             
         except Exception as e:
             log.error(f"Error performing health checks: {str(e)}")
-        finally:
-            if 'db' in locals():
-                db.close()
     
     def get_connections_for_health_check(self, db: Session) -> List[Connection]:
-        """Get connections that need health checks"""
-        now = datetime.utcnow()
-        
-        # Get active connections with health checks enabled
+        """
+        Claim connections whose next_check_at is due, oldest first. Uses the
+        (is_active, next_check_at) index, so a tick only reads due rows.
+
+        Several workers or replicas may run the monitor: rows are selected
+        FOR UPDATE SKIP LOCKED and leased by pushing next_check_at
+        LEASE_SECONDS ahead before the transaction commits, so each due
+        connection is checked by exactly one worker. If that worker dies
+        before writing the result, the lease expires and another one picks
+        the connection up. (SQLite ignores FOR UPDATE; its single writer
+        serializes the claims instead.) At most claim_limit() rows are
+        claimed, so every claimed check finishes before its lease expires.
+        """
+        now = int(time.time())
+
         connections = db.query(Connection).filter(
             and_(
                 Connection.is_active == True,
-                Connection.status.in_([ConnectionStatus.ACTIVE, ConnectionStatus.ERROR])
+                Connection.status.in_([ConnectionStatus.ACTIVE, ConnectionStatus.ERROR]),
+                or_(Connection.next_check_at.is_(None), Connection.next_check_at <= now)
             )
-        ).all()
-        
+        ).order_by(Connection.next_check_at).limit(
+            self.claim_limit()
+        ).with_for_update(skip_locked=True).all()
+
         connections_to_check = []
-        
+
         for connection in connections:
-            health_check_config = connection.health_check or {}
-            
-            # Skip if health checks are disabled
-            if not health_check_config.get('enabled', True):
-                continue
-            
-            # Check if it's time for a health check
-            interval_minutes = health_check_config.get('interval', 5)
-            last_check = connection.last_health_check
-            
-            if not last_check:
-                # Never checked before
-                connections_to_check.append(connection)
+            health_check_config = get_health_check_config(connection)
+
+            if connection.next_check_at is None:
+                # Not scheduled yet: spread first checks over one interval
+                # instead of checking every new connection in this tick
+                interval = get_health_check_interval(connection)
+                connection.next_check_at = now + int(random.uniform(0, interval))
+            elif not health_check_config.get('enabled', True):
+                # Disabled: look again after one interval in case it is re-enabled
+                schedule_next_check(connection, now)
             else:
-                # Check if enough time has passed
-                next_check_time = last_check + timedelta(minutes=interval_minutes)
-                if now >= next_check_time:
-                    connections_to_check.append(connection)
-        
+                connection.next_check_at = now + HEALTH_CHECK_CONFIG["LEASE_SECONDS"]
+                connections_to_check.append(connection)
+
+        db.flush()
         return connections_to_check
     
-    async def check_single_connection(self, db: Session, connection: Connection, semaphore: asyncio.Semaphore):
-        """Perform health check for a single connection"""
+    def claim_limit(self) -> int:
+        """
+        Rows one sweep may claim. Checks run max_concurrent_checks at a
+        time and are cut off after DEFAULT_TIMEOUT, so this many waves
+        (less one, as margin) fit in the lease
+        """
+        waves = HEALTH_CHECK_CONFIG["LEASE_SECONDS"] // HEALTH_CHECK_CONFIG["DEFAULT_TIMEOUT"] - 1
+        return max(1, min(HEALTH_CHECK_CONFIG["BATCH_SIZE"], waves * self.max_concurrent_checks))
+
+    async def check_single_connection(
+        self, connection: ConnectionModel, semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """
+        Perform health check for a single connection. Log lines go to
+        connection_log_buffer; the status update is returned as a row for
+        apply_check_results.
+        """
         async with semaphore:
+            previous_status = connection.status
+            now = int(time.time())
+            outcome = {
+                "connection_id": connection.id,
+                "last_connected_at": None,
+                "last_tested_at": now,
+                "next_check_at": next_check_time(connection, now),
+            }
+
             try:
-                # Decrypt credentials for testing
-                decrypted_creds = decrypt_credentials(connection.credentials) if connection.credentials else {}
-                
-                # Create test form data
+                # Create test form data (credentials are already decrypted)
                 test_data = ConnectionCreateForm(
                     name=connection.name,
                     type=connection.type,
                     config=connection.config or {},
-                    credentials=decrypted_creds
+                    credentials=connection.credentials or {}
                 )
                 
                 # Perform the health check
-                health_check_config = connection.health_check or {}
+                health_check_config = get_health_check_config(connection)
                 test_endpoint = health_check_config.get('endpoint')
                 test_method = health_check_config.get('method', 'GET')
                 
-                result = await test_connection(test_data, test_endpoint, test_method)
+                timeout = HEALTH_CHECK_CONFIG["DEFAULT_TIMEOUT"]
+                try:
+                    result = await asyncio.wait_for(
+                        test_connection(test_data, test_endpoint, test_method), timeout
+                    )
+                except asyncio.TimeoutError:
+                    result = ConnectionTestResult(
+                        success=False,
+                        message="Health check timed out",
+                        error=f"Timed out after {timeout}s",
+                        response_time=timeout,
+                        timestamp=int(time.time())
+                    )
                 
                 # Update connection status based on result
-                previous_status = connection.status
-                
                 if result.success:
-                    connection.status = ConnectionStatus.ACTIVE
-                    connection.last_connected = datetime.utcnow()
-                    connection.success_count += 1
-                    connection.last_error = None
+                    outcome.update(
+                        status=ConnectionStatus.ACTIVE.value,
+                        success_inc=1,
+                        error_inc=0,
+                        last_error=None,
+                        last_connected_at=int(time.time())
+                    )
                 else:
-                    connection.status = ConnectionStatus.ERROR
-                    connection.error_count += 1
-                    connection.last_error = result.error or result.message
-                
-                connection.last_health_check = datetime.utcnow()
+                    outcome.update(
+                        status=ConnectionStatus.ERROR.value,
+                        success_inc=0,
+                        error_inc=1,
+                        last_error=result.error or result.message
+                    )
                 
                 # Log status change if it occurred
-                if previous_status != connection.status:
-                    await create_connection_log(
-                        db, str(connection.id), 
+                if previous_status != outcome["status"]:
+                    connection_log_buffer.add(
+                        connection.id, connection.user_id,
                         "info" if result.success else "error",
-                        f"Health check status changed from {previous_status} to {connection.status}",
-                        {"health_check_result": result.dict()}
+                        f"Health check status changed from {previous_status} to {outcome['status']}",
+                        {"health_check_result": result.dict()},
+                        action="health_check", source="scheduler"
                     )
                     
                     # Send notification for status changes
-                    await self.send_status_change_notification(connection, previous_status, connection.status, result)
+                    await self.send_status_change_notification(connection, previous_status, outcome["status"], result)
                 
-                # Log health check result
-                await create_connection_log(
-                    db, str(connection.id), 
-                    "debug",
-                    f"Health check completed: {result.message}",
-                    {
-                        "success": result.success,
-                        "response_time": result.response_time,
-                        "status_code": result.status_code
-                    }
-                )
-                
-                db.commit()
+                # Log health check result (sampled unless it failed)
+                if health_check_log_sampler.sample(
+                    connection.type, result.success, result.response_time, force=not result.success
+                ):
+                    connection_log_buffer.add(
+                        connection.id, connection.user_id,
+                        "debug",
+                        f"Health check completed: {result.message}",
+                        {
+                            "success": result.success,
+                            "response_time": result.response_time,
+                            "status_code": (result.details or {}).get("status_code")
+                        },
+                        action="health_check", source="scheduler"
+                    )
                 
             except Exception as e:
                 log.error(f"Error checking connection {connection.id}: {str(e)}")
                 
                 # Mark connection as error if health check fails
-                connection.status = ConnectionStatus.ERROR
-                connection.error_count += 1
-                connection.last_error = f"Health check failed: {str(e)}"
-                connection.last_health_check = datetime.utcnow()
+                outcome.update(
+                    status=ConnectionStatus.ERROR.value,
+                    success_inc=0,
+                    error_inc=1,
+                    last_error=f"Health check failed: {str(e)}"
+                )
                 
-                await create_connection_log(
-                    db, str(connection.id), "error",
+                connection_log_buffer.add(
+                    connection.id, connection.user_id, "error",
                     f"Health check failed with exception: {str(e)}",
-                    {"exception": str(e)}
+                    {"exception": str(e)},
+                    action="health_check", source="scheduler"
                 )
-                
-                db.commit()
+
+            return outcome
+
+    def apply_check_results(self, outcomes: List[Dict[str, Any]]):
+        """Write the outcome of a sweep with one executemany UPDATE"""
+        if not outcomes:
+            return
+
+        table = Connection.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("connection_id"))
+            .values(
+                status=bindparam("status"),
+                success_count=func.coalesce(table.c.success_count, 0) + bindparam("success_inc"),
+                error_count=func.coalesce(table.c.error_count, 0) + bindparam("error_inc"),
+                last_error=bindparam("last_error"),
+                last_connected_at=func.coalesce(bindparam("last_connected_at"), table.c.last_connected_at),
+                last_tested_at=bindparam("last_tested_at"),
+                next_check_at=bindparam("next_check_at"),
+            )
+        )
+        with get_db_context() as db:
+            db.execute(stmt, outcomes)
     
     async def send_status_change_notification(self, connection: Connection, old_status: str, new_status: str, result):
         """Send notification when connection status changes"""
@@ -246,11 +348,11 @@ class HealthMonitor:
             ).count()
             
             # Get connections that haven't been checked recently
-            stale_threshold = datetime.utcnow() - timedelta(hours=1)
+            stale_threshold = int(time.time()) - 3600
             stale_connections = db.query(Connection).filter(
                 and_(
                     Connection.is_active == True,
-                    Connection.last_health_check < stale_threshold
+                    Connection.last_tested_at < stale_threshold
                 )
             ).count()
             
@@ -273,6 +375,33 @@ class HealthMonitor:
                 "last_check": datetime.utcnow().isoformat()
             }
 
+def get_health_check_config(connection: Connection) -> Dict[str, Any]:
+    """Health check settings live under the "health_check" key of the connection config"""
+    return (connection.config or {}).get('health_check') or {}
+
+
+def get_health_check_interval(connection: Connection) -> int:
+    """Check interval in seconds (the config value is in minutes)"""
+    interval_minutes = get_health_check_config(connection).get('interval')
+    if not interval_minutes:
+        return HEALTH_CHECK_CONFIG["DEFAULT_INTERVAL"]
+    return int(interval_minutes * 60)
+
+
+def next_check_time(connection: Connection, now: int) -> int:
+    """
+    One interval from now, shifted by a random jitter so connections
+    checked together drift apart instead of staying in lockstep
+    """
+    interval = get_health_check_interval(connection)
+    jitter = interval * HEALTH_CHECK_CONFIG["JITTER"]
+    return now + max(1, int(interval + random.uniform(-jitter, jitter)))
+
+
+def schedule_next_check(connection: Connection, now: int):
+    connection.next_check_at = next_check_time(connection, now)
+
+
 # Global health monitor instance
 health_monitor = HealthMonitor()
 
@@ -288,22 +417,21 @@ def stop_health_monitoring():
 async def force_health_check(connection_id: str) -> bool:
     """Force a health check for a specific connection"""
     try:
-        db = next(get_db())
-        connection = db.query(Connection).filter(Connection.id == connection_id).first()
-        
-        if not connection:
-            return False
+        with get_db_context() as db:
+            connection = db.query(Connection).filter(Connection.id == connection_id).first()
+            if not connection:
+                return False
+            connection = to_connection_model(connection)
         
+        await release_db_session()
         semaphore = asyncio.Semaphore(1)
-        await health_monitor.check_single_connection(db, connection, semaphore)
+        outcome = await health_monitor.check_single_connection(connection, semaphore)
+        health_monitor.apply_check_results([outcome])
         return True
         
     except Exception as e:
         log.error(f"Error forcing health check for {connection_id}: {str(e)}")
         return False
-    finally:
-        if 'db' in locals():
-            db.close()
 
 async def get_health_summary() -> Dict[str, Any]:
     """Get connection health summary"""
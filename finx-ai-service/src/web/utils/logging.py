@@ -5,15 +5,24 @@ Provides structured logging with multiple handlers, formatters, and configuratio
 
 import os
 import sys
-import json
 import time
+import queue
+import random
+import atexit
 import logging
 import logging.handlers
+import threading
 from datetime import datetime
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Callable, List, Optional, Union
 from enum import Enum
 from pathlib import Path
 
+import orjson
+
+# Internal diagnostics of the pipeline itself (dropped records); goes through
+# the plain stdlib handlers, never through the queue it reports on
+_log = logging.getLogger(__name__)
+
 class LogLevel(str, Enum):
     DEBUG = "DEBUG"
     INFO = "INFO"
@@ -51,7 +60,7 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, 'extra_fields'):
             log_entry.update(record.extra_fields)
         
-        return json.dumps(log_entry, ensure_ascii=False)
+        return orjson.dumps(log_entry, default=str).decode()
 
 class StructuredFormatter(logging.Formatter):
     """Structured formatter with consistent field layout"""
@@ -79,6 +88,312 @@ class StructuredFormatter(logging.Formatter):
         
         return message
 
+class _BatchFlushMixin:
+    """Leaves flushing to the LogWriter, which flushes once per batch"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+class BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    """StreamHandler flushed per batch instead of per record"""
+
+class BatchRotatingFileHandler(_BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler flushed per batch instead of per record"""
+
+_STOP = object()
+
+class LogWriter:
+    """
+    Single background writer for every FinxLogger logger, in place of a
+    QueueListener per logger. Records are drained from a bounded queue in
+    batches and dispatched to the handlers registered for the logger whose
+    LogQueueHandler enqueued them (see LogQueueHandler.prepare); each
+    handler is flushed once per batch. Callers never block: when
+    the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, queue_size: int, batch_size: int, flush_interval: float):
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._sinks: Dict[str, List[logging.Handler]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters
+        self._counter_lock = threading.Lock()
+        self.written = 0
+        self.unrouted = 0  # records with no sinks registered for their logger
+        self.dropped = 0
+        self.dropped_by_level: Dict[str, int] = {}
+        self._reported_drops = 0
+        self._last_report = 0.0
+
+    def set_sinks(self, name: str, handlers: List[logging.Handler]) -> List[logging.Handler]:
+        """Route records of logger ``name`` to handlers; returns the replaced ones"""
+        with self._lock:
+            previous = self._sinks.get(name, [])
+            self._sinks[name] = handlers
+        return previous
+
+    def set_level(self, level: int):
+        with self._lock:
+            for handlers in self._sinks.values():
+                for handler in handlers:
+                    handler.setLevel(level)
+
+    def record_drop(self, record: logging.LogRecord):
+        with self._counter_lock:
+            self.dropped += 1
+            self.dropped_by_level[record.levelname] = self.dropped_by_level.get(record.levelname, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._counter_lock:
+            return {
+                "queued": self.queue.qsize(),
+                "queue_size": self.queue.maxsize,
+                "written": self.written,
+                "unrouted": self.unrouted,
+                "dropped": self.dropped,
+                "dropped_by_level": dict(self.dropped_by_level),
+            }
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Write out everything queued so far, then stop the writer thread"""
+        if self._thread is None:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            for handlers in self._sinks.values():
+                for handler in handlers:
+                    handler.flush_batch()
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._report_drops()
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not self._write(batch):
+                return
+            self._report_drops()
+
+    def _write(self, batch: List[Any]) -> bool:
+        """Dispatch and flush one batch; False once the stop marker is seen"""
+        running = True
+        touched = {}
+        written = 0
+        unrouted = 0
+        with self._lock:
+            for record in batch:
+                if record is _STOP:
+                    running = False
+                    continue
+                handlers = self._sinks.get(getattr(record, "finx_sink", record.name))
+                if handlers is None:
+                    unrouted += 1
+                    continue
+                for handler in handlers:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                        touched[id(handler)] = handler
+                written += 1
+
+            for handler in touched.values():
+                try:
+                    handler.flush_batch()
+                except Exception:
+                    _log.exception(f"Error flushing log handler {handler}")
+
+        with self._counter_lock:
+            self.written += written
+            self.unrouted += unrouted
+        return running
+
+    def _report_drops(self):
+        # At most one report per flush interval, however fast records drop
+        now = time.monotonic()
+        if now - self._last_report < self.flush_interval:
+            return
+        self._last_report = now
+        with self._counter_lock:
+            dropped = self.dropped - self._reported_drops
+            self._reported_drops = self.dropped
+        if dropped:
+            _log.warning(f"Log queue full: dropped {dropped} records")
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the LogWriter without blocking, dropping them when its
+    queue is full. ``sink`` is the name of the logger the handler is attached
+    to; records are written to that logger's sinks, including records
+    propagated from its child loggers.
+    """
+
+    def __init__(self, writer: LogWriter, sink: str):
+        super().__init__(writer.queue)
+        self.writer = writer
+        self.sink = sink
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the writer thread. Only the message is
+        # resolved here, so later changes to mutable args are not picked up
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        record.finx_sink = self.sink
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.writer.record_drop(record)
+
+class LogSampler:
+    """
+    Decides which records of a high-volume operation are written. Successes
+    are kept with probability success_rate and failures with failure_rate;
+    on top of that each key writes at most rate_limit successes and
+    rate_limit failures per rate_window seconds (0 disables the limit).
+    ``sample(..., force=True)`` keeps a record regardless of rates and
+    limits. Every call is counted, and once per summary_interval the counts
+    of each key are passed to ``summarize(key, summary)``; a background
+    thread, started on the first call, flushes them when no further call
+    comes.
+    """
+
+    def __init__(
+        self,
+        summarize: Callable[[str, Dict[str, Any]], None],
+        success_rate: float = 0.01,
+        failure_rate: float = 1.0,
+        rate_limit: int = 10,
+        rate_window: float = 60.0,
+        summary_interval: float = 60.0,
+    ):
+        self.summarize = summarize
+        self.success_rate = success_rate
+        self.failure_rate = failure_rate
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.summary_interval = summary_interval
+        self._lock = threading.Lock()
+        self._windows: Dict[tuple, List[float]] = {}  # (key, success) -> [window start, records written]
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._summary_started = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def sample(
+        self, key: str, success: bool = True, execution_time: Optional[float] = None, force: bool = False
+    ) -> bool:
+        """Count one call for key and return whether its record should be written"""
+        now = time.monotonic()
+        keep = force or random.random() < (self.success_rate if success else self.failure_rate)
+
+        with self._lock:
+            if self._thread is None and self.summary_interval > 0:
+                self._start()
+
+            if keep and self.rate_limit and not force:
+                # Successes and failures are limited separately, so a burst
+                # of successes never crowds out failures
+                window_key = (key, success)
+                window = self._windows.get(window_key)
+                if window is None or now - window[0] >= self.rate_window:
+                    window = self._windows[window_key] = [now, 0]
+                if window[1] >= self.rate_limit:
+                    keep = False
+                else:
+                    window[1] += 1
+
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    "calls": 0, "failures": 0, "logged": 0, "total_time": 0.0, "max_time": 0.0
+                }
+            stats["calls"] += 1
+            stats["failures"] += not success
+            stats["logged"] += keep
+            if execution_time is not None:
+                stats["total_time"] += execution_time
+                stats["max_time"] = max(stats["max_time"], execution_time)
+
+            due = now - self._summary_started >= self.summary_interval
+
+        if due:
+            self.flush()
+        return keep
+
+    def _start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="log-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        # Without this a key that goes quiet never reports its last interval
+        while True:
+            with self._lock:
+                remaining = self._summary_started + self.summary_interval - time.monotonic()
+            if remaining > 0:
+                if self._stopped.wait(remaining):
+                    return
+                continue
+            self.flush()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the flush thread and summarize the counts gathered so far"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stopped.set()
+            thread.join(timeout)
+        self.flush()
+
+    def flush(self):
+        """Hand the counts gathered so far to summarize and start a new interval"""
+        now = time.monotonic()
+        with self._lock:
+            stats, self._stats = self._stats, {}
+            elapsed = now - self._summary_started
+            self._summary_started = now
+            # Windows that have run out are not needed any more
+            self._windows = {
+                key: window for key, window in self._windows.items() if now - window[0] < self.rate_window
+            }
+
+        for key, counts in stats.items():
+            total_time = counts.pop("total_time")
+            self.summarize(key, {
+                **counts,
+                "suppressed": counts["calls"] - counts["logged"],
+                "avg_time": total_time / counts["calls"],
+                "interval_seconds": round(elapsed, 1),
+            })
+
 class LoggerConfig:
     """Configuration class for logger settings"""
     
@@ -92,6 +407,9 @@ class LoggerConfig:
         self.console_enabled = True
         self.file_enabled = True
         self.json_enabled = False
+        self.queue_size = 10000  # records waiting for the writer before new ones are dropped
+        self.batch_size = 500
+        self.flush_interval = 0.5  # seconds
         
         # Load from environment
         self._load_from_env()
@@ -106,6 +424,9 @@ class LoggerConfig:
         self.console_enabled = os.getenv("LOG_CONSOLE_ENABLED", "true").lower() == "true"
         self.file_enabled = os.getenv("LOG_FILE_ENABLED", "true").lower() == "true"
         self.json_enabled = os.getenv("LOG_JSON_ENABLED", "false").lower() == "true"
+        self.queue_size = int(os.getenv("LOG_QUEUE_SIZE", self.queue_size))
+        self.batch_size = int(os.getenv("LOG_BATCH_SIZE", self.batch_size))
+        self.flush_interval = int(os.getenv("LOG_FLUSH_INTERVAL_MS", int(self.flush_interval * 1000))) / 1000
 
 class FinxLogger:
     """Main logger class for FINX backend"""
@@ -113,6 +434,7 @@ class FinxLogger:
     _instance = None
     _loggers: Dict[str, logging.Logger] = {}
     _config: LoggerConfig = None
+    _writer: LogWriter = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -130,6 +452,12 @@ class FinxLogger:
         
         # Set root logger level
         logging.getLogger().setLevel(getattr(logging, cls._config.level.value))
+
+        # One writer thread for all loggers; queued records are written out at exit
+        cls._writer = LogWriter(
+            cls._config.queue_size, cls._config.batch_size, cls._config.flush_interval
+        )
+        atexit.register(cls._writer.stop)
     
     @classmethod
     def get_logger(cls, name: str, extra_fields: Optional[Dict[str, Any]] = None) -> logging.Logger:
@@ -147,20 +475,29 @@ class FinxLogger:
         # Clear existing handlers
         logger.handlers.clear()
         
+        # Output handlers run on the writer thread, not on the caller
+        sinks = []
+        
         # Add console handler
         if cls._config.console_enabled:
-            console_handler = cls._create_console_handler()
-            logger.addHandler(console_handler)
+            sinks.append(cls._create_console_handler())
         
         # Add file handler
         if cls._config.file_enabled:
-            file_handler = cls._create_file_handler(name)
-            logger.addHandler(file_handler)
+            sinks.append(cls._create_file_handler(name))
         
         # Add JSON handler if enabled
         if cls._config.json_enabled:
-            json_handler = cls._create_json_handler(name)
-            logger.addHandler(json_handler)
+            sinks.append(cls._create_json_handler(name))
+        
+        for handler in cls._writer.set_sinks(name, sinks):
+            handler.close()
+        
+        # The logger itself only enqueues
+        queue_handler = LogQueueHandler(cls._writer, name)
+        queue_handler.setLevel(getattr(logging, cls._config.level.value))
+        logger.addHandler(queue_handler)
+        cls._writer.start()
         
         # Prevent propagation to root logger
         logger.propagate = False
@@ -168,9 +505,9 @@ class FinxLogger:
         return logger
     
     @classmethod
-    def _create_console_handler(cls) -> logging.StreamHandler:
+    def _create_console_handler(cls) -> BatchStreamHandler:
         """Create console handler"""
-        handler = logging.StreamHandler(sys.stdout)
+        handler = BatchStreamHandler(sys.stdout)
         handler.setLevel(getattr(logging, cls._config.level.value))
         
         # Set formatter based on config
@@ -189,11 +526,11 @@ class FinxLogger:
         return handler
     
     @classmethod
-    def _create_file_handler(cls, logger_name: str) -> logging.handlers.RotatingFileHandler:
+    def _create_file_handler(cls, logger_name: str) -> BatchRotatingFileHandler:
         """Create rotating file handler"""
         log_file = Path(cls._config.log_dir) / f"{logger_name}.log"
         
-        handler = logging.handlers.RotatingFileHandler(
+        handler = BatchRotatingFileHandler(
             log_file,
             maxBytes=cls._config.max_file_size,
             backupCount=cls._config.backup_count,
@@ -208,11 +545,11 @@ class FinxLogger:
         return handler
     
     @classmethod
-    def _create_json_handler(cls, logger_name: str) -> logging.handlers.RotatingFileHandler:
+    def _create_json_handler(cls, logger_name: str) -> BatchRotatingFileHandler:
         """Create JSON file handler"""
         log_file = Path(cls._config.log_dir) / f"{logger_name}.json"
         
-        handler = logging.handlers.RotatingFileHandler(
+        handler = BatchRotatingFileHandler(
             log_file,
             maxBytes=cls._config.max_file_size,
             backupCount=cls._config.backup_count,
@@ -227,7 +564,7 @@ class FinxLogger:
     
     @classmethod
     def configure(cls, config: LoggerConfig):
-        """Update logger configuration"""
+        """Update logger configuration (queue settings keep their startup values)"""
         cls._config = config
         # Recreate all loggers with new config
         for name in list(cls._loggers.keys()):
@@ -247,6 +584,12 @@ class FinxLogger:
             logger.setLevel(log_level)
             for handler in logger.handlers:
                 handler.setLevel(log_level)
+        cls._writer.set_level(log_level)
+    
+    @classmethod
+    def get_stats(cls) -> Dict[str, Any]:
+        """Queue depth and written/dropped record counters of the log writer"""
+        return cls._writer.stats()
 
 class ContextLogger:
     """Logger with context information"""
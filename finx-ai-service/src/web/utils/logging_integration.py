@@ -6,7 +6,31 @@ Provides logging integration for database operations, API calls, and other compo
 import time
 import functools
 from typing import Any, Dict, Optional, Callable
-from src.web.utils.logging import DatabaseLogger, APILogger, SecurityLogger, get_logger
+from src.web.constants.config import LOG_SAMPLING_CONFIG
+from src.web.utils.logging import (
+    DatabaseLogger, APILogger, SecurityLogger, ContextLogger, LogSampler, get_logger
+)
+
+
+def _sampler_settings() -> Dict[str, Any]:
+    return {
+        "success_rate": LOG_SAMPLING_CONFIG["SUCCESS_RATE"],
+        "failure_rate": LOG_SAMPLING_CONFIG["FAILURE_RATE"],
+        "rate_limit": LOG_SAMPLING_CONFIG["RATE_LIMIT"],
+        "rate_window": LOG_SAMPLING_CONFIG["RATE_WINDOW"],
+        "summary_interval": LOG_SAMPLING_CONFIG["SUMMARY_INTERVAL"],
+    }
+
+def _summarize_db_operations(key: str, summary: Dict[str, Any]):
+    ContextLogger("finx.database").info(f"Database {key} summary: {summary['calls']} operations", summary)
+
+def _summarize_connection_operations(key: str, summary: Dict[str, Any]):
+    ContextLogger("finx.connections").info(f"Connection {key} summary: {summary['calls']} operations", summary)
+
+# Per-operation records are sampled; every call still counts towards the
+# periodic summaries. Keys are "<table>.<operation>" / "<type>.<operation>"
+db_log_sampler = LogSampler(_summarize_db_operations, **_sampler_settings())
+connection_log_sampler = LogSampler(_summarize_connection_operations, **_sampler_settings())
 
 class DatabaseLoggingMixin:
     """Mixin to add logging to database operations"""
@@ -47,19 +71,21 @@ def log_database_operation(operation_type: str):
             start_time = time.time()
             table_name = getattr(self, '__tablename__', self.__class__.__name__)
             
+            sample_key = f"{table_name}.{operation_type}"
+            
             try:
                 result = func(self, *args, **kwargs)
                 execution_time = time.time() - start_time
                 
-                # Extract record ID if possible
-                record_id = None
-                if hasattr(result, 'id'):
-                    record_id = str(result.id)
-                elif isinstance(result, dict) and 'id' in result:
-                    record_id = str(result['id'])
-                
                 # Log successful operation
-                if hasattr(self, '_log_db_operation'):
+                if hasattr(self, '_log_db_operation') and db_log_sampler.sample(sample_key, True, execution_time):
+                    # Extract record ID if possible
+                    record_id = None
+                    if hasattr(result, 'id'):
+                        record_id = str(result.id)
+                    elif isinstance(result, dict) and 'id' in result:
+                        record_id = str(result['id'])
+                    
                     self._log_db_operation(
                         operation=operation_type,
                         table=table_name,
@@ -74,7 +100,7 @@ def log_database_operation(operation_type: str):
                 execution_time = time.time() - start_time
                 
                 # Log failed operation
-                if hasattr(self, '_log_db_operation'):
+                if hasattr(self, '_log_db_operation') and db_log_sampler.sample(sample_key, False, execution_time):
                     self._log_db_operation(
                         operation=operation_type,
                         table=table_name,
@@ -131,13 +157,14 @@ def log_connection_operation(operation_type: str):
             # Extract connection info
             connection_name = getattr(self, 'name', 'unknown')
             connection_type = getattr(self, 'type', 'unknown')
+            sample_key = f"{connection_type}.{operation_type}"
             
             try:
                 result = func(self, *args, **kwargs)
                 execution_time = time.time() - start_time
                 
                 # Log successful operation
-                if hasattr(self, '_log_connection_event'):
+                if hasattr(self, '_log_connection_event') and connection_log_sampler.sample(sample_key, True, execution_time):
                     self._log_connection_event(
                         event=operation_type,
                         connection_name=connection_name,
@@ -152,7 +179,7 @@ def log_connection_operation(operation_type: str):
                 execution_time = time.time() - start_time
                 
                 # Log failed operation
-                if hasattr(self, '_log_connection_event'):
+                if hasattr(self, '_log_connection_event') and connection_log_sampler.sample(sample_key, False, execution_time):
                     self._log_connection_event(
                         event=operation_type,
                         connection_name=connection_name,
@@ -1,80 +1,216 @@
 import os
-import json
 import base64
 import hashlib
 import secrets
-from typing import Dict, Any, Optional
+import threading
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 import logging
+import orjson
+from sqlalchemy import select, update
+
+from src.web.constants.config import CACHE_CONFIG, SECURITY_CONFIG
+from src.web.internal.cache import TTLCache
+from src.web.internal.db import get_db_context
+from src.web.models.connections import Connection
 
 log = logging.getLogger(__name__)
 
-class CredentialManager:
-    """Secure credential management for connection data"""
-    
-    def __init__(self, master_key: Optional[str] = None):
-        """Initialize with master key or generate one"""
-        if master_key:
-            self.master_key = master_key.encode()
-        else:
-            # In production, this should come from environment variables or secure key management
-            self.master_key = os.environ.get('CONNECTION_MASTER_KEY', 'default-key-change-in-production').encode()
-        
-        # Generate encryption key from master key
-        self.encryption_key = self._derive_key(self.master_key)
-        self.cipher_suite = Fernet(self.encryption_key)
-    
-    def _derive_key(self, password: bytes, salt: Optional[bytes] = None) -> bytes:
-        """Derive encryption key from password using PBKDF2"""
-        if salt is None:
-            salt = b'connection_salt_2024'  # In production, use random salt per credential
-        
-        kdf = PBKDF2HMAC(
+# Credential fields that never leave the server in clear text
+SENSITIVE_FIELDS = frozenset({
+    'password', 'api_key', 'bearer_token', 'client_secret',
+    'private_key', 'access_token', 'refresh_token'
+})
+
+
+def _zero(key: bytes, plaintext: bytearray):
+    """Overwrite a cached plaintext when it leaves the credential cache"""
+    plaintext[:] = bytes(len(plaintext))
+
+
+# Salt of the original fixed-salt scheme. It is now only used to stretch
+# master keys; per-credential keys get a random salt (see KeyRing)
+MASTER_KEY_SALT = b'connection_salt_2024'
+CREDENTIAL_KEY_INFO = b'connection-credentials'
+
+
+@lru_cache(maxsize=None)
+def _stretch_master_key(master_key: bytes) -> bytes:
+    """PBKDF2 over a master key. Slow by design, so it runs once per key per process"""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=MASTER_KEY_SALT,
+        iterations=100000,
+        backend=default_backend()
+    )
+    return kdf.derive(master_key)
+
+
+class KeyRing:
+    """
+    Versioned master keys for credential encryption.
+
+    Master keys are stretched lazily on first use and cached for the life of
+    the process. Each credential is encrypted under a key derived from the
+    current master key and a random per-credential salt with HKDF, which is
+    cheap, so no request pays for PBKDF2 after the first.
+    """
+
+    def __init__(self, keys: Dict[int, bytes], current_version: Optional[int] = None, legacy_version: int = 1):
+        if not keys:
+            raise SecurityError("No credential encryption keys configured")
+        self.keys = keys
+        self.current_version = current_version or max(keys)
+        # Key that wrote ciphertexts from before versioning
+        self.legacy_version = legacy_version
+        if self.current_version not in keys:
+            raise SecurityError(f"Unknown credential key version {self.current_version}")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "KeyRing":
+        """
+        Build from CREDENTIAL_KEYS ("version:key,..."), falling back to
+        CONNECTION_MASTER_KEY as version 1
+        """
+        keys = {}
+        for entry in filter(None, (part.strip() for part in config["CREDENTIAL_KEYS"].split(','))):
+            version, _, key = entry.partition(':')
+            keys[int(version)] = key.encode()
+        if not keys:
+            keys[1] = config["CONNECTION_MASTER_KEY"].encode()
+        return cls(keys, config["CREDENTIAL_KEY_VERSION"], config["CREDENTIAL_LEGACY_KEY_VERSION"])
+
+    def master_key(self, version: int) -> bytes:
+        key = self.keys.get(version)
+        if key is None:
+            raise SecurityError(f"Unknown credential key version {version}")
+        return _stretch_master_key(key)
+
+    def fernet(self, version: int, salt: bytes) -> Fernet:
+        """Fernet for one credential, keyed by HKDF(master key, salt)"""
+        hkdf = HKDF(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt,
-            iterations=100000,
+            info=CREDENTIAL_KEY_INFO,
             backend=default_backend()
         )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        return key
-    
+        return Fernet(base64.urlsafe_b64encode(hkdf.derive(self.master_key(version))))
+
+    def legacy_fernet(self) -> Fernet:
+        """Fernet of the unversioned fixed-salt format"""
+        return Fernet(base64.urlsafe_b64encode(self.master_key(self.legacy_version)))
+
+    def warm(self):
+        """Stretch every master key now instead of on the first request"""
+        for version in self.keys:
+            self.master_key(version)
+
+
+class CredentialManager:
+    """
+    Secure credential management for connection data.
+
+    Ciphertexts are "v<version>$<salt>$<fernet token>". Values without the
+    prefix are the earlier base64-wrapped fixed-salt format; they still
+    decrypt and are rewritten by reencrypt_stored_credentials.
+    """
+
+    def __init__(self, master_key: Optional[str] = None, key_ring: Optional[KeyRing] = None):
+        """Initialize with a key ring, a single master key, or the configured keys"""
+        if key_ring is not None:
+            self.key_ring = key_ring
+        elif master_key:
+            self.key_ring = KeyRing({1: master_key.encode()})
+        else:
+            # In production, this should come from environment variables or secure key management
+            self.key_ring = KeyRing.from_config(SECURITY_CONFIG)
+
+        # Decrypted JSON by ciphertext hash, so listing pages and repeated
+        # health checks skip Fernet; entries are zeroed when they leave
+        self._decrypted = TTLCache(
+            maxsize=CACHE_CONFIG["CREDENTIAL_MAX_SIZE"],
+            ttl=CACHE_CONFIG["CREDENTIAL_TTL"],
+            on_evict=_zero
+        )
+        # Held while a cached plaintext is parsed, so no concurrent set or
+        # expiry can zero it mid-read (only decrypt_credentials touches the cache)
+        self._decrypted_lock = threading.Lock()
+
+    @staticmethod
+    def _split(encrypted_credentials: str) -> Tuple[Optional[int], Optional[bytes], str]:
+        """(version, salt, token); version and salt are None for the legacy format"""
+        if encrypted_credentials.startswith('v') and '$' in encrypted_credentials:
+            version, salt, token = encrypted_credentials[1:].split('$', 2)
+            return int(version), base64.urlsafe_b64decode(salt), token
+        return None, None, encrypted_credentials
+
     def encrypt_credentials(self, credentials: Dict[str, Any]) -> str:
-        """Encrypt credential dictionary"""
+        """Encrypt credential dictionary under the current key and a fresh salt"""
         try:
-            # Convert to JSON and encrypt
-            credentials_json = json.dumps(credentials, sort_keys=True)
-            encrypted_data = self.cipher_suite.encrypt(credentials_json.encode())
-            return base64.urlsafe_b64encode(encrypted_data).decode()
+            version = self.key_ring.current_version
+            salt = os.urandom(16)
+            token = self.key_ring.fernet(version, salt).encrypt(
+                orjson.dumps(credentials, option=orjson.OPT_SORT_KEYS)
+            )
+            return f"v{version}${base64.urlsafe_b64encode(salt).decode()}${token.decode()}"
         except Exception as e:
             log.error(f"Error encrypting credentials: {str(e)}")
             raise SecurityError("Failed to encrypt credentials")
-    
+
+    def _decrypt(self, encrypted_credentials: str) -> bytes:
+        version, salt, token = self._split(encrypted_credentials)
+        if version is None:
+            return self.key_ring.legacy_fernet().decrypt(base64.urlsafe_b64decode(token.encode()))
+        return self.key_ring.fernet(version, salt).decrypt(token.encode())
+
     def decrypt_credentials(self, encrypted_credentials: str) -> Dict[str, Any]:
-        """Decrypt credential string back to dictionary"""
+        """Decrypt credential string back to dictionary (a new dict per call)"""
         try:
-            # Decode and decrypt
-            encrypted_data = base64.urlsafe_b64decode(encrypted_credentials.encode())
-            decrypted_data = self.cipher_suite.decrypt(encrypted_data)
-            return json.loads(decrypted_data.decode())
+            cache_key = hashlib.sha256(encrypted_credentials.encode()).digest()
+            with self._decrypted_lock:
+                plaintext = self._decrypted.get(cache_key)
+                if plaintext is not None:
+                    return orjson.loads(plaintext)
+
+            plaintext = bytearray(self._decrypt(encrypted_credentials))
+            credentials = orjson.loads(plaintext)
+            with self._decrypted_lock:
+                self._decrypted.set(cache_key, plaintext)
+            return credentials
         except Exception as e:
             log.error(f"Error decrypting credentials: {str(e)}")
             return {}
-    
+
+    def needs_reencrypt(self, encrypted_credentials: str) -> bool:
+        """True for legacy ciphertexts and those under a retired key version"""
+        try:
+            version, _, _ = self._split(encrypted_credentials)
+        except ValueError:
+            return False
+        return version != self.key_ring.current_version
+
+    def reencrypt_credentials(self, encrypted_credentials: str) -> str:
+        """Re-encrypt under the current key version with a new salt"""
+        try:
+            plaintext = self._decrypt(encrypted_credentials)
+        except Exception as e:
+            log.error(f"Error decrypting credentials for re-encryption: {str(e)}")
+            raise SecurityError("Failed to decrypt credentials")
+        return self.encrypt_credentials(orjson.loads(plaintext))
+
     def mask_sensitive_data(self, credentials: Dict[str, Any]) -> Dict[str, Any]:
         """Mask sensitive credential data for safe display"""
-        sensitive_fields = {
-            'password', 'api_key', 'bearer_token', 'client_secret', 
-            'private_key', 'access_token', 'refresh_token'
-        }
-        
         masked = {}
         for key, value in credentials.items():
-            if key.lower() in sensitive_fields and value:
+            if key.lower() in SENSITIVE_FIELDS and value:
                 # Show first 4 and last 4 characters with asterisks in between
                 if len(str(value)) > 8:
                     masked[key] = f"{str(value)[:4]}{'*' * (len(str(value)) - 8)}{str(value)[-4:]}"
@@ -85,6 +221,13 @@ class CredentialManager:
         
         return masked
     
+    def redact_credentials(self, credentials: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Credentials without their secret fields. Stored in plaintext next to
+        the ciphertext (credentials_masked) so listings never decrypt.
+        """
+        return {key: value for key, value in credentials.items() if key.lower() not in SENSITIVE_FIELDS}
+
     def validate_credentials(self, credentials: Dict[str, Any], auth_type: str) -> bool:
         """Validate that required credentials are present for auth type"""
         required_fields = {
@@ -224,10 +367,63 @@ def decrypt_credentials(encrypted_credentials: str) -> Dict[str, Any]:
     """Decrypt credentials using global credential manager"""
     return credential_manager.decrypt_credentials(encrypted_credentials)
 
+def reencrypt_stored_credentials(batch_size: int = 100) -> int:
+    """
+    Rewrite stored connection credentials that are in the legacy format or
+    under a retired key version, committing one batch at a time. Each row is
+    updated only if its credentials are still the ciphertext that was read
+    (compare-and-set), so an update that lands in between is kept and the
+    row is left for the next run; several workers may run this at once.
+    Returns rows rewritten.
+    """
+    rewritten = 0
+    changed = 0
+    last_id = ""
+    while True:
+        with get_db_context() as db:
+            rows = db.execute(
+                select(Connection.id, Connection.credentials)
+                .where(Connection.id > last_id, Connection.credentials.isnot(None))
+                .order_by(Connection.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            for id, credentials in rows:
+                if not isinstance(credentials, str) or not credential_manager.needs_reencrypt(credentials):
+                    continue
+                try:
+                    reencrypted = credential_manager.reencrypt_credentials(credentials)
+                except SecurityError:
+                    log.warning(f"Skipping credentials of connection {id}: cannot decrypt")
+                    continue
+
+                result = db.execute(
+                    update(Connection)
+                    .where(Connection.id == id, Connection.credentials == credentials)
+                    .values(credentials=reencrypted)
+                )
+                if result.rowcount:
+                    rewritten += 1
+                else:
+                    changed += 1
+
+    if rewritten:
+        log.info(f"Re-encrypted credentials of {rewritten} connections")
+    if changed:
+        log.info(f"Skipped {changed} connections whose credentials changed during re-encryption")
+    return rewritten
+
 def mask_credentials(credentials: Dict[str, Any]) -> Dict[str, Any]:
     """Mask sensitive credential data"""
     return credential_manager.mask_sensitive_data(credentials)
 
+def redact_credentials(credentials: Dict[str, Any]) -> Dict[str, Any]:
+    """Strip secret fields from credentials"""
+    return credential_manager.redact_credentials(credentials)
+
 def validate_credentials(credentials: Dict[str, Any], auth_type: str) -> bool:
     """Validate credentials for auth type"""
     return credential_manager.validate_credentials(credentials, auth_type)
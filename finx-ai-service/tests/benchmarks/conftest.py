@@ -0,0 +1,58 @@
+"""
+Micro-benchmarks. They are skipped unless FINX_BENCHMARKS=1, and print
+their timings, so run them with output capture off:
+
+    FINX_BENCHMARKS=1 python -m pytest tests/benchmarks -s
+
+They use the SQLite test database of tests/conftest.py, which is enough
+to compare the before/after code paths but not to predict absolute
+production numbers.
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.getenv("FINX_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark; set FINX_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(skip)
+
+
+def _percentile(samples, q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _report(name: str, samples_ms):
+    print(
+        f"\n{name:<56} n={len(samples_ms):<6} p50={statistics.median(samples_ms):9.3f}ms "
+        f"p99={_percentile(samples_ms, 0.99):9.3f}ms max={max(samples_ms):9.3f}ms"
+    )
+
+
+def _timed(fn, *args, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+@pytest.fixture
+def report():
+    """report(name, samples_ms) prints count, median, p99 and max of timings in milliseconds"""
+    return _report
+
+
+@pytest.fixture
+def timed():
+    """timed(fn, *args, repeat=n) runs fn n times and returns the timings in milliseconds"""
+    return _timed
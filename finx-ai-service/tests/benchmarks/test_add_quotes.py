@@ -0,0 +1,85 @@
+"""
+user-013: add_quotes over a corpus of large generated queries.
+
+"before" is the previous algorithm kept here as a reference. It rebuilds
+the keyword set for every token, re-slices tokens and applies the edits
+by string concatenation.
+"""
+
+import random
+
+from sqlglot.tokens import Tokenizer, TokenType
+
+from src.core.engine import IDENTIFIER_TOKEN_TYPES, SQL_KEYWORDS, add_quotes, quote_identifiers, squish_sql
+
+
+def _quote_identifiers_before(sql: str, quote_char: str = '"') -> str:
+    def is_ident(tok) -> bool:
+        if tok.token_type not in IDENTIFIER_TOKEN_TYPES:
+            return False
+        sql_keywords = set(SQL_KEYWORDS)
+        return sql[tok.start : tok.end + 1].upper() not in sql_keywords
+
+    def is_already_quoted_text(text: str) -> bool:
+        text = text.strip()
+        return len(text) >= 2 and (text[0], text[-1]) in {('"', '"'), ("`", "`"), ("[", "]")}
+
+    toks = Tokenizer().tokenize(sql)
+    n = len(toks)
+    edits = []
+    i = 0
+    while i < n:
+        if not is_ident(toks[i]):
+            i += 1
+            continue
+        if i + 2 < n and toks[i + 1].token_type == TokenType.DOT and toks[i + 2].token_type == TokenType.STAR:
+            i += 3
+            continue
+        j = i
+        chain = [toks[i]]
+        while j + 2 < n and toks[j + 1].token_type == TokenType.DOT and is_ident(toks[j + 2]):
+            chain += [toks[j + 1], toks[j + 2]]
+            j += 2
+        if j + 1 < n and toks[j + 1].token_type == TokenType.L_PAREN:
+            i = j + 1
+            continue
+        for tok in chain[::2]:
+            text = sql[tok.start : tok.end + 1]
+            if not is_already_quoted_text(text):
+                edits.append((tok.start, tok.end + 1, f"{quote_char}{text}{quote_char}"))
+        i = j + 1
+
+    out = sql
+    for start, end, repl in sorted(edits, key=lambda x: x[0], reverse=True):
+        out = out[:start] + repl + out[end:]
+    return out
+
+
+def _generated_query(seed: int, columns: int = 400) -> str:
+    rng = random.Random(seed)
+    cols = [f"t{rng.randrange(4)}.col_{rng.randrange(1000)}" for _ in range(columns)]
+    conds = " AND ".join(f"{c} > {rng.randrange(100)}" for c in cols[: columns // 4])
+    joins = " ".join(f"JOIN schema_{k}.table_{k} AS t{k} ON t{k}.id = t0.ref_{k}" for k in range(1, 4))
+    return (
+        f"SELECT {', '.join(cols)}, COUNT(t0.*) FROM schema_0.table_0 AS t0 {joins} "
+        f"WHERE {conds} GROUP BY {', '.join(cols[:20])} ORDER BY {cols[0]} DESC LIMIT 100"
+    )
+
+
+def test_add_quotes_corpus(report, timed):
+    corpus = [squish_sql(_generated_query(seed)) for seed in range(20)]
+    assert [quote_identifiers(sql) for sql in corpus] == [_quote_identifiers_before(sql) for sql in corpus]
+
+    report("before: rebuilt keyword set, concatenated edits", timed(
+        lambda: [_quote_identifiers_before(sql) for sql in corpus], repeat=10
+    ))
+    report("after: quote_identifiers (single pass)", timed(
+        lambda: [quote_identifiers(sql) for sql in corpus], repeat=10
+    ))
+    report("tokenizer alone (shared cost)", timed(
+        lambda: [Tokenizer().tokenize(sql) for sql in corpus], repeat=10
+    ))
+
+    add_quotes.cache_clear()
+    report("after: add_quotes (squish + quote), memo miss", timed(lambda: [add_quotes(sql) for sql in corpus], repeat=1))
+    report("after: add_quotes, memo hit", timed(lambda: [add_quotes(sql) for sql in corpus], repeat=10))
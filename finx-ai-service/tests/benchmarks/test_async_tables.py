@@ -0,0 +1,122 @@
+"""
+user-001: latency of requests arriving at a fixed rate when the routes
+call sync tables on the event loop (before) versus the async tables
+(after), and the wait of a DB-free request (event-loop lag) meanwhile.
+
+SQLite answers in microseconds, unlike a PostgreSQL server over the
+network. Each statement therefore sleeps ROUND_TRIP in the thread of the
+driver that runs it: on the event loop for the sync engine, as psycopg2
+would block it, and in aiosqlite's worker thread for the async engine, as
+asyncpg waits on its socket without blocking the loop.
+"""
+
+import asyncio
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.web.constants.config import DATABASE_CONFIG
+from src.web.internal import db as db_module
+from src.web.internal.db import get_db_context
+from src.web.models.chats import AsyncChats, Chat, Chats
+from src.web.models.files import AsyncFiles, File, Files
+
+USERS = 50
+ROWS_PER_USER = 200
+REQUESTS = 1000
+RATE = 150  # requests per second
+ROUND_TRIP = 0.001  # seconds
+
+
+def _simulate_round_trip(sqlite_connection):
+    sqlite_connection.set_trace_callback(lambda statement: time.sleep(ROUND_TRIP))
+
+
+@pytest_asyncio.fixture
+async def seeded(database, monkeypatch):
+    now = int(time.time())
+    with get_db_context() as db:
+        for u in range(USERS):
+            for i in range(ROWS_PER_USER):
+                db.add(Chat(id=f"chat-{u}-{i}", user_id=f"user-{u}", title="t", chat={"messages": []},
+                            created_at=now - i, updated_at=now - i))
+                db.add(File(id=f"file-{u}-{i}", user_id=f"user-{u}", filename="f.csv", data={},
+                            created_at=now - i, updated_at=now - i))
+
+    # Pool the async connections like the PostgreSQL engine does
+    async_engine = create_async_engine(
+        db_module.async_engine.url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=DATABASE_CONFIG["POOL_SIZE"],
+        max_overflow=DATABASE_CONFIG["MAX_OVERFLOW"],
+    )
+    monkeypatch.setattr(db_module, "async_engine", async_engine)
+    monkeypatch.setattr(db_module, "AsyncSessionLocal", async_sessionmaker(async_engine, expire_on_commit=False))
+
+    database.dispose()
+    event.listen(database, "connect", lambda conn, _: _simulate_round_trip(conn))
+    event.listen(
+        async_engine.sync_engine, "connect",
+        lambda conn, _: conn.run_async(lambda aiosqlite_connection: aiosqlite_connection.set_trace_callback(
+            lambda statement: time.sleep(ROUND_TRIP)
+        ))
+    )
+    yield database
+    await async_engine.dispose()
+
+
+async def _serve(handler):
+    latencies, lags = [], []
+    stop = asyncio.Event()
+
+    async def ping():
+        # A request that needs no database: its wait beyond the 1ms sleep is
+        # the time the loop was busy with someone else
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append((time.perf_counter() - start) * 1000 - 1)
+
+    async def request(i, arrival):
+        await handler(f"user-{i % USERS}")
+        latencies.append((time.perf_counter() - arrival) * 1000)
+
+    # Warm up: open every pooled connection before measuring
+    pool_size = DATABASE_CONFIG["POOL_SIZE"] + DATABASE_CONFIG["MAX_OVERFLOW"]
+    await asyncio.gather(*(handler(f"user-{i % USERS}") for i in range(pool_size)))
+
+    pinger = asyncio.create_task(ping())
+    requests = []
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        # Open loop: requests arrive on schedule however far behind the
+        # server is, and their latency counts from the scheduled arrival
+        arrival = start + i / RATE
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        requests.append(asyncio.create_task(request(i, arrival)))
+    await asyncio.gather(*requests)
+    stop.set()
+    await pinger
+    return latencies, lags
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("name", "sync_call", "async_call"), [
+    ("chat listing", Chats.get_chats_by_user_id, AsyncChats.get_chats_by_user_id),
+    ("file listing", Files.get_files_by_user_id, AsyncFiles.get_files_by_user_id),
+])
+async def test_p99_sync_on_loop_vs_async(seeded, report, name, sync_call, async_call):
+    async def before(user_id):
+        return sync_call(user_id)
+
+    async def after(user_id):
+        return await async_call(user_id)
+
+    for label, handler in (("before (sync table on loop)", before), ("after (async table)", after)):
+        latencies, lags = await _serve(handler)
+        report(f"{name} {label}: request", latencies)
+        report(f"{name} {label}: DB-free request", lags)
@@ -0,0 +1,84 @@
+"""
+user-007: JSONField before (json.dumps/json.loads into TEXT) and after
+(orjson, JSONB on PostgreSQL).
+
+The PostgreSQL part compares JSON and JSONB columns for insert,
+containment (@>) and field access; it needs a scratch database:
+
+    FINX_BENCHMARKS=1 FINX_BENCHMARK_POSTGRES_URL=postgresql://... \\
+        python -m pytest tests/benchmarks/test_json_field.py -s
+"""
+
+import json
+import os
+import random
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.web.internal.database_providers import json_deserialize, json_serialize
+
+ROWS = 20000
+
+
+def _chat(i: int) -> dict:
+    rng = random.Random(i)
+    return {
+        "title": f"chat {i}",
+        "tags": [f"tag-{rng.randrange(50)}" for _ in range(3)],
+        "models": ["gpt-4o"],
+        "messages": [
+            {"id": f"{i}-{m}", "role": "user" if m % 2 else "assistant", "content": "lorem ipsum " * 40,
+             "timestamp": 1_700_000_000 + m, "usage": {"prompt_tokens": 120, "completion_tokens": 480}}
+            for m in range(rng.randrange(4, 20))
+        ],
+    }
+
+
+def test_codec_json_vs_orjson(report, timed):
+    chats = [_chat(i) for i in range(500)]
+    encoded = [json.dumps(chat) for chat in chats]
+
+    report("encode json.dumps (before)", timed(lambda: [json.dumps(c) for c in chats], repeat=30))
+    report("encode orjson (after)", timed(lambda: [json_serialize(c) for c in chats], repeat=30))
+    report("decode json.loads (before)", timed(lambda: [json.loads(e) for e in encoded], repeat=30))
+    report("decode orjson (after)", timed(lambda: [json_deserialize(e) for e in encoded], repeat=30))
+
+
+@pytest.fixture
+def postgres():
+    url = os.getenv("FINX_BENCHMARK_POSTGRES_URL")
+    if not url:
+        pytest.skip("set FINX_BENCHMARK_POSTGRES_URL to a scratch PostgreSQL database")
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        yield conn
+    engine.dispose()
+
+
+def test_postgres_json_vs_jsonb(postgres, report, timed):
+    rows = [{"id": i, "chat": json.dumps(_chat(i))} for i in range(ROWS)]
+    for kind in ("json", "jsonb"):
+        table = f"bench_chat_{kind}"
+        postgres.execute(text(f"CREATE TEMPORARY TABLE {table} (id integer PRIMARY KEY, chat {kind})"))
+        report(f"{kind}: insert {ROWS} rows", timed(
+            lambda: (postgres.execute(text(f"TRUNCATE {table}")),
+                     postgres.execute(text(f"INSERT INTO {table} VALUES (:id, CAST(:chat AS {kind}))"), rows)),
+            repeat=3
+        ))
+        if kind == "jsonb":
+            postgres.execute(text(f"CREATE INDEX ON {table} USING gin (chat jsonb_path_ops)"))
+        postgres.execute(text(f"ANALYZE {table}"))
+
+        # JSON has no containment operator: it has to be cast on every row
+        contains = "chat @> :probe" if kind == "jsonb" else "chat::jsonb @> :probe"
+        probe = {"probe": json.dumps({"tags": ["tag-7"]})}
+        report(f"{kind}: containment query", timed(
+            lambda: postgres.execute(text(f"SELECT count(*) FROM {table} WHERE {contains}"), probe).scalar(),
+            repeat=20
+        ))
+        report(f"{kind}: field access", timed(
+            lambda: postgres.execute(text(f"SELECT chat->>'title' FROM {table} WHERE id % 100 = 0")).all(),
+            repeat=20
+        ))
+        postgres.rollback()
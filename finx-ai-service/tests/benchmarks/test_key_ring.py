@@ -0,0 +1,50 @@
+"""
+user-022: CredentialManager cold start and per-call overhead.
+
+"before" is the PBKDF2 stretch that every instantiation used to run
+(_stretch_master_key without its cache) and the fixed-key legacy format.
+"""
+
+import base64
+import itertools
+
+import orjson
+
+from src.web.utils.security import CredentialManager, KeyRing, _stretch_master_key
+
+CREDENTIALS = {"username": "ada", "password": "hunter2", "host": "db.internal", "port": 5432}
+
+
+def test_cold_start(report, timed):
+    fresh_keys = (f"key-{i}".encode() for i in itertools.count())
+
+    report("before: PBKDF2 on every instantiation", timed(
+        lambda: _stretch_master_key.__wrapped__(b"key-one"), repeat=20
+    ))
+    report("after: first use of a new master key", timed(
+        lambda: CredentialManager(key_ring=KeyRing({1: next(fresh_keys)})).encrypt_credentials(CREDENTIALS),
+        repeat=20
+    ))
+    KeyRing({1: b"key-one"}).warm()
+    report("after: instantiation with a stretched key", timed(
+        lambda: CredentialManager(key_ring=KeyRing({1: b"key-one"})).encrypt_credentials(CREDENTIALS),
+        repeat=200
+    ))
+
+
+def test_per_call_overhead(report, timed):
+    key_ring = KeyRing({1: b"key-one", 2: b"key-two"})
+    key_ring.warm()
+    manager = CredentialManager(key_ring=key_ring)
+    versioned = manager.encrypt_credentials(CREDENTIALS)
+    legacy = base64.urlsafe_b64encode(key_ring.legacy_fernet().encrypt(orjson.dumps(CREDENTIALS))).decode()
+
+    report("encrypt (fresh salt, HKDF + Fernet)", timed(manager.encrypt_credentials, CREDENTIALS, repeat=2000))
+    report("decrypt legacy fixed-key format", timed(manager._decrypt, legacy, repeat=2000))
+    report("decrypt versioned format (HKDF + Fernet)", timed(manager._decrypt, versioned, repeat=2000))
+    report("decrypt_credentials, cache hit", timed(manager.decrypt_credentials, versioned, repeat=2000))
+
+    batch = [legacy] * 1000
+    report("re-encrypt a batch of 1000 legacy ciphertexts", timed(
+        lambda: [manager.reencrypt_credentials(c) for c in batch], repeat=5
+    ))
@@ -0,0 +1,79 @@
+"""
+user-023: /auth/login under a burst of logins.
+
+"before" runs bcrypt inline on the event loop, as login_user used to;
+"after" goes through a HashingPool. While the burst is in flight a probe
+requests a route that does no work, which shows how long every other
+request on the worker is held up.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import main
+from src.web.constants.config import PASSWORD_HASH_CONFIG
+from src.web.internal.hashing_pool import HashingPool
+from src.web.models import auths
+from src.web.routers import auth
+
+LOGINS = 32
+
+
+class _Inline:
+    """The previous behaviour: hash on the event loop"""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def _burst(client: httpx.AsyncClient):
+    login_ms, probe_ms = [], []
+
+    async def login():
+        start = time.perf_counter()
+        response = await client.post("/auth/login", json={"email": "ada@example.com", "password": "correct horse"})
+        assert response.status_code == 200
+        login_ms.append((time.perf_counter() - start) * 1000)
+
+    async def probe(done: asyncio.Event):
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/ping")
+            probe_ms.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.01)
+
+    done = asyncio.Event()
+    prober = asyncio.create_task(probe(done))
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await prober
+    return elapsed, login_ms, probe_ms
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["before", "after"])
+async def test_login_burst(database, monkeypatch, report, mode):
+    await auths.AsyncAuths.insert_new_auth("ada@example.com", "correct horse", "Ada")
+    pool = _Inline() if mode == "before" else HashingPool(PASSWORD_HASH_CONFIG)
+    monkeypatch.setattr(auths, "hashing_pool", pool)
+
+    app = FastAPI()
+    app.middleware("http")(main.db_session_middleware)
+    app.include_router(auth.router, prefix="/auth")
+    app.get("/ping")(lambda: "pong")
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        elapsed, login_ms, probe_ms = await _burst(client)
+
+    print(f"\n{mode}: {LOGINS} logins in {elapsed:.2f}s ({LOGINS / elapsed:.1f} logins/s)")
+    report(f"{mode}: login latency", login_ms)
+    report(f"{mode}: probe latency during the burst", probe_ms)
+    if mode == "after":
+        print(pool.stats())
+        pool.shutdown()
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.web.constants.config import QUERY_CONFIG
+from src.web.internal import db as db_module
+
+# Register every table on Base.metadata
+import src.web.models.auths  # noqa: F401
+import src.web.models.channels  # noqa: F401
+import src.web.models.chats  # noqa: F401
+import src.web.models.connections  # noqa: F401
+import src.web.models.files  # noqa: F401
+import src.web.models.knowledge  # noqa: F401
+import src.web.models.memories  # noqa: F401
+import src.web.models.messages  # noqa: F401
+import src.web.models.prompts  # noqa: F401
+import src.web.models.users  # noqa: F401
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Point the sync and async session factories at a fresh SQLite file"""
+    url = f"sqlite:///{tmp_path / 'finx.db'}"
+    engine = create_engine(url)
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"))
+    db_module.Base.metadata.create_all(engine)
+
+    monkeypatch.setattr(db_module, "engine", engine)
+    monkeypatch.setattr(db_module, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    monkeypatch.setattr(db_module, "async_engine", async_engine)
+    monkeypatch.setattr(db_module, "AsyncSessionLocal", async_sessionmaker(async_engine, expire_on_commit=False))
+
+    yield engine
+
+    async_engine.sync_engine.dispose()
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_sandbox(tmp_path, monkeypatch):
+    """Enable SQLite connections with tmp_path/sandbox as the sandbox directory"""
+    from src.web.internal.connection_providers import ConnectionProviderFactory, SQLiteProvider
+    from src.web.models.connections import ConnectionType
+
+    sandbox = tmp_path / "sandbox"
+    sandbox.mkdir()
+    monkeypatch.setitem(QUERY_CONFIG, "SQLITE_SANDBOX_DIR", str(sandbox))
+    monkeypatch.setitem(ConnectionProviderFactory._providers, ConnectionType.SQLITE, SQLiteProvider)
+    return sandbox
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import event, text
+
+from src.web.internal import db as db_module
+from src.web.internal.db import get_async_db_context, request_db_scope
+from src.web.internal.hashing_pool import hashing_pool
+from src.web.models.auths import AsyncAuths
+
+
+@pytest.mark.asyncio
+async def test_unknown_email_still_verifies_a_hash(database):
+    completed = hashing_pool.completed
+    assert await AsyncAuths.authenticate_user("nobody@example.com", "secret") is None
+    assert hashing_pool.completed == completed + 1
+
+
+@pytest.mark.asyncio
+async def test_signup_then_login(database):
+    user = await AsyncAuths.insert_new_auth("ada@example.com", "correct horse", "Ada")
+    assert user is not None
+
+    authenticated = await AsyncAuths.authenticate_user("ada@example.com", "correct horse")
+    assert authenticated is not None and authenticated.id == user.id
+    assert await AsyncAuths.authenticate_user("ada@example.com", "wrong") is None
+
+
+@pytest.mark.asyncio
+async def test_no_connection_is_held_while_hashing(database, monkeypatch):
+    await AsyncAuths.insert_new_auth("ada@example.com", "correct horse", "Ada")
+    engine = db_module.async_engine.sync_engine
+    checked_out = []
+    event.listen(engine, "checkout", lambda *_: checked_out.append(1))
+    event.listen(engine, "checkin", lambda *_: checked_out.pop())
+    held = []
+    run = hashing_pool.run
+
+    async def recording_run(fn, *args):
+        held.append(len(checked_out))
+        return await run(fn, *args)
+
+    monkeypatch.setattr(hashing_pool, "run", recording_run)
+    async with request_db_scope():
+        async with get_async_db_context() as db:  # opens the request's session
+            await db.execute(text("SELECT 1"))
+        assert await AsyncAuths.authenticate_user("ada@example.com", "correct horse") is not None
+        assert await AsyncAuths.authenticate_user("nobody@example.com", "secret") is None
+
+    assert held == [0, 0]
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import select
+
+from src.web.internal.db import get_async_db_context
+from src.web.models.connections import ConnectionLog, ConnectionLogBuffer
+
+
+async def _logged_messages():
+    async with get_async_db_context() as db:
+        return sorted((await db.execute(select(ConnectionLog.message))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_flush_drops_rejected_rows_and_writes_the_rest(database):
+    buffer = ConnectionLogBuffer(batch_size=100, flush_interval_ms=1000, max_pending=100)
+    for i in range(5):
+        buffer.add("conn-1", "user-1", "info", f"line {i}")
+    # message is NOT NULL, so this row can never be written
+    buffer.add("conn-1", "user-1", "info", None)
+
+    assert await buffer.flush() == 5
+    assert buffer.dropped == 1
+    assert buffer._pending == []
+    assert await _logged_messages() == [f"line {i}" for i in range(5)]
+
+    # The poisoned row does not come back with later flushes
+    buffer.add("conn-1", "user-1", "info", "line 5")
+    assert await buffer.flush() == 1
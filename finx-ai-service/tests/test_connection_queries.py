@@ -0,0 +1,66 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.web.internal.connection_providers import connection_manager
+from src.web.utils.auth import get_current_user
+
+API = "/api/v1/connections"
+
+
+@pytest.fixture
+def client(database):
+    user = SimpleNamespace(id="user-1", role="admin")
+    main.app.dependency_overrides[get_current_user] = lambda: user
+    # No lifespan: background buffers and pools stay out of the test
+    yield TestClient(main.app)
+    main.app.dependency_overrides.clear()
+    connection_manager.close_all_connections()
+
+
+@pytest.fixture
+def sample_db(sqlite_sandbox):
+    path = sqlite_sandbox / "sales.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE sales (region TEXT, amount INTEGER)")
+        conn.executemany("INSERT INTO sales VALUES (?, ?)", [("eu", 10), ("us", 20), ("eu", 5)])
+    return path
+
+
+def test_query_connection_created_through_router(client, sample_db):
+    response = client.post(API + "/", json={
+        "name": "sales",
+        "type": "sqlite",
+        "database_name": sample_db.name,
+        "credentials": {"password": "secret"},
+    })
+    assert response.status_code == 200, response.text
+    connection_id = response.json()["id"]
+
+    response = client.post(f"{API}/{connection_id}/query", json={
+        "query": "SELECT region, SUM(amount) AS total FROM sales GROUP BY region ORDER BY region",
+        "use_cache": False,
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["success"] is True
+    assert body["columns"] == ["region", "total"]
+    assert body["data"] == [{"region": "eu", "total": 15}, {"region": "us", "total": 20}]
+
+    response = client.post(f"{API}/{connection_id}/query", json={
+        "query": "SELECT region FROM sales WHERE amount > 6",
+        "dry_run": True,
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["success"] is True
+    assert body["data"] is None
+    assert body["estimate"]["plan"] == ["SCAN sales"]
+
+
+def test_query_unknown_connection(client):
+    response = client.post(f"{API}/missing/query", json={"query": "SELECT 1"})
+    assert response.status_code == 404
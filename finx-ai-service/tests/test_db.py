@@ -0,0 +1,140 @@
+import pytest
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+
+import main
+from src.web.internal.db import (
+    RollbackOnlyError, get_async_db_context, get_db_context, release_db_session, request_db_scope
+)
+from src.web.models.connections import ConnectionLog
+
+
+def _log(id):
+    return ConnectionLog(id=id, connection_id="conn-1", user_id="user-1", level="info", message=id, timestamp=0)
+
+
+def _count():
+    with get_db_context() as db:
+        return db.query(ConnectionLog).count()
+
+
+def _swallowing_insert(id):
+    # Table methods catch their own errors and return None
+    try:
+        with get_db_context() as db:
+            db.add(_log(id))
+            db.flush()
+            return id
+    except Exception:
+        return None
+
+
+def test_nested_blocks_join_the_outer_transaction(database):
+    with get_db_context() as outer:
+        outer.add(_log("a"))
+        with get_db_context() as inner:
+            assert inner is outer
+            inner.add(_log("b"))
+    assert _count() == 2
+
+
+def test_swallowed_nested_error_rolls_back_the_outer_block(database):
+    with pytest.raises(RollbackOnlyError):
+        with get_db_context() as db:
+            db.add(_log("a"))
+            db.flush()
+            assert _swallowing_insert("a") is None  # duplicate primary key
+    assert _count() == 0
+
+
+def test_blocks_outside_each_other_commit_independently(database):
+    assert _swallowing_insert("a") == "a"
+    assert _swallowing_insert("a") is None
+    assert _swallowing_insert("b") == "b"
+    assert _count() == 2
+
+
+@pytest.mark.asyncio
+async def test_async_nested_error_rolls_back_the_outer_block(database):
+    with pytest.raises(RollbackOnlyError):
+        async with get_async_db_context() as db:
+            db.add(_log("a"))
+            try:
+                async with get_async_db_context() as inner:
+                    inner.add(_log("a"))
+                    await inner.flush()
+            except Exception:
+                pass
+
+    async with get_async_db_context() as db:
+        assert (await db.execute(select(func.count()).select_from(ConnectionLog))).scalar() == 0
+
+
+@pytest.mark.asyncio
+async def test_request_shares_one_session_and_commits_once(database):
+    checkouts = []
+    event.listen(database, "checkout", lambda *args: checkouts.append(1))
+
+    async with request_db_scope() as scope:
+        assert scope.sync is None  # nothing is opened until a table call needs it
+        with get_db_context() as first:
+            first.add(_log("a"))
+        with get_db_context() as second:
+            assert second is first
+            second.add(_log("b"))
+
+    assert len(checkouts) == 1
+    assert scope.sync is None
+    assert _count() == 2
+
+
+@pytest.mark.asyncio
+async def test_release_commits_and_returns_the_connection(database):
+    async with request_db_scope() as scope:
+        with get_db_context() as db:
+            db.add(_log("a"))
+        await release_db_session()
+        assert scope.sync is None
+        assert database.pool.checkedout() == 0
+
+        with get_db_context() as db:
+            db.add(_log("b"))
+    assert _count() == 2
+
+
+@pytest.mark.asyncio
+async def test_swallowed_error_rolls_back_the_request(database):
+    with pytest.raises(RollbackOnlyError):
+        async with request_db_scope():
+            with get_db_context() as db:
+                db.add(_log("a"))
+            assert _swallowing_insert("a") is None
+    assert _count() == 0
+
+
+def test_middleware_commits_before_responding_and_rolls_back_server_errors(database):
+    app = FastAPI()
+    app.middleware("http")(main.db_session_middleware)
+
+    @app.post("/logs/{id}")
+    def add_log(id: str, status_code: int = 200):
+        with get_db_context() as db:
+            db.add(_log(id))
+        if status_code == 404:
+            raise HTTPException(status_code=404)
+        return Response(status_code=status_code)
+
+    @app.post("/swallowed")
+    def swallowed():
+        _swallowing_insert("a")
+        return {}
+
+    client = TestClient(app)
+    assert client.post("/logs/a").status_code == 200
+    assert client.post("/logs/b", params={"status_code": 503}).status_code == 503
+    assert client.post("/logs/c", params={"status_code": 404}).status_code == 404
+    assert client.post("/swallowed").status_code == 500
+
+    with get_db_context() as db:
+        assert sorted(log.id for log in db.query(ConnectionLog)) == ["a", "c"]
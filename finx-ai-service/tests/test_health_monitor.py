@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from src.web.constants.config import HEALTH_CHECK_CONFIG
+from src.web.internal.db import get_db_context
+from src.web.models.connections import (
+    Connection, ConnectionModel, ConnectionTestResult, connection_log_buffer
+)
+from src.web.utils import health_monitor as health_monitor_module
+from src.web.utils.health_monitor import HealthMonitor
+from src.web.utils.security import encrypt_credentials
+
+
+def _add_connection(db, id, **values):
+    now = int(time.time())
+    row = dict(
+        id=id, user_id="user-1", name=id, type="postgresql", status="active",
+        is_active=True, config={}, next_check_at=0, error_count=0, success_count=0,
+        created_at=now, updated_at=now,
+    )
+    row.update(values)
+    db.add(Connection(**row))
+
+
+@pytest.mark.asyncio
+async def test_sweep_decrypts_credentials_and_skips_bad_rows(database, monkeypatch):
+    with get_db_context() as db:
+        _add_connection(db, "good", credentials=encrypt_credentials({"password": "secret"}))
+        _add_connection(db, "broken", created_at=None)
+
+    seen = {}
+
+    async def fake_test_connection(test_data, test_endpoint=None, test_method="GET"):
+        seen[test_data.name] = test_data.credentials
+        return ConnectionTestResult(success=True, message="ok", response_time=0.01, timestamp=int(time.time()))
+
+    monkeypatch.setattr(health_monitor_module, "test_connection", fake_test_connection)
+    monkeypatch.setattr(connection_log_buffer, "_pending", [])
+
+    await HealthMonitor().perform_health_checks()
+
+    assert seen == {"good": {"password": "secret"}}
+    with get_db_context() as db:
+        good = db.get(Connection, "good")
+        broken = db.get(Connection, "broken")
+        assert good.last_tested_at is not None
+        assert good.success_count == 1
+        # The unreadable row is pushed back by one interval rather than
+        # aborting the sweep
+        assert broken.next_check_at > time.time()
+
+
+def test_claim_fits_in_the_lease(database, monkeypatch):
+    monkeypatch.setitem(HEALTH_CHECK_CONFIG, "LEASE_SECONDS", 30)
+    monkeypatch.setitem(HEALTH_CHECK_CONFIG, "DEFAULT_TIMEOUT", 10)
+    with get_db_context() as db:
+        for i in range(25):
+            _add_connection(db, f"conn-{i}")
+
+    monitor = HealthMonitor()
+    # Two waves of max_concurrent_checks fit in 30s with one wave of margin
+    assert monitor.claim_limit() == 2 * monitor.max_concurrent_checks
+    with get_db_context() as db:
+        assert len(monitor.get_connections_for_health_check(db)) == 20
+
+
+@pytest.mark.asyncio
+async def test_slow_check_is_cut_off_at_the_timeout(database, monkeypatch):
+    monkeypatch.setitem(HEALTH_CHECK_CONFIG, "DEFAULT_TIMEOUT", 0.05)
+    monkeypatch.setattr(connection_log_buffer, "_pending", [])
+
+    async def hanging_test_connection(test_data, test_endpoint=None, test_method="GET"):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(health_monitor_module, "test_connection", hanging_test_connection)
+    now = int(time.time())
+    connection = ConnectionModel(id="slow", user_id="user-1", name="slow", type="postgresql",
+                                 status="active", created_at=now, updated_at=now)
+
+    outcome = await HealthMonitor().check_single_connection(connection, asyncio.Semaphore(1))
+    assert outcome["status"] == "error"
+    assert outcome["last_error"] == "Timed out after 0.05s"
+
+
+@pytest.mark.asyncio
+async def test_failed_checks_are_logged_past_the_sampler(database, monkeypatch):
+    monkeypatch.setattr(connection_log_buffer, "_pending", [])
+    monkeypatch.setattr(health_monitor_module.health_check_log_sampler, "failure_rate", 0.0)
+
+    async def failing_test_connection(test_data, test_endpoint=None, test_method="GET"):
+        return ConnectionTestResult(success=False, message="refused", response_time=0.01, timestamp=int(time.time()))
+
+    monkeypatch.setattr(health_monitor_module, "test_connection", failing_test_connection)
+    now = int(time.time())
+    connection = ConnectionModel(id="down", user_id="user-1", name="down", type="postgresql",
+                                 status="error", created_at=now, updated_at=now)
+
+    monitor = HealthMonitor()
+    for _ in range(3):
+        await monitor.check_single_connection(connection, asyncio.Semaphore(1))
+
+    messages = [row["message"] for row in connection_log_buffer._pending]
+    assert messages.count("Health check completed: refused") == 3
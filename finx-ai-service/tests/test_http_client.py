@@ -0,0 +1,36 @@
+import pytest
+from aiohttp import web
+
+from src.web.constants.config import HTTP_CLIENT_CONFIG
+from src.web.internal.http_client import HTTPClientRegistry
+
+
+@pytest.mark.asyncio
+async def test_cookies_are_not_shared_between_requests():
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get("Cookie"))
+        response = web.Response(text="ok")
+        response.set_cookie("session", "user-a")
+        return response
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    registry = HTTPClientRegistry(HTTP_CLIENT_CONFIG)
+    try:
+        session = registry.get_session()
+        for _ in range(2):
+            async with session.get(f"http://localhost:{port}/") as response:
+                assert response.status == 200
+    finally:
+        await registry.close()
+        await runner.cleanup()
+
+    assert seen == [None, None]
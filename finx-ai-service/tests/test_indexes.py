@@ -0,0 +1,171 @@
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import and_, desc, event, or_, select
+
+from src.web.internal import db as db_module
+from src.web.internal.pagination import encode_cursor, keyset_filter, keyset_order
+from src.web.models.chats import AsyncChats, Chats
+from src.web.models.connections import Connection, ConnectionLog, ConnectionStatus
+from src.web.models.files import Files
+from src.web.models.memories import Memories
+from src.web.models.messages import AsyncMessages, MessageReactions, Messages
+
+
+def query_plan(engine, statement) -> str:
+    sql = str(statement.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return "\n".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+@contextmanager
+def captured_plans(database, engine=None):
+    """
+    Record the SELECTs a table method sends through engine and yield a list
+    that is filled with their query plans, one string per statement.
+    """
+    engine = engine or database
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    plans = []
+    try:
+        yield plans
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    with database.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append("\n".join(row[-1] for row in rows))
+    assert plans, "the table method issued no SELECT"
+
+
+def test_connection_listing_uses_the_user_index(database):
+    cursor = encode_cursor(int(time.time()), "conn-1")
+    statement = (
+        select(Connection)
+        .where(Connection.user_id == "user-1", keyset_filter(Connection.updated_at, Connection.id, cursor))
+        .order_by(*keyset_order(Connection.updated_at, Connection.id))
+        .limit(51)
+    )
+    assert "USING INDEX ix_connection_user_id_updated_at (user_id=? AND updated_at<?)" in query_plan(database, statement)
+
+
+def test_connection_log_listing_uses_the_timestamp_index(database):
+    statement = (
+        select(ConnectionLog)
+        .where(ConnectionLog.connection_id == "conn-1")
+        .order_by(desc(ConnectionLog.timestamp))
+        .limit(50)
+    )
+    plan = query_plan(database, statement)
+    assert "USING INDEX ix_connection_log_connection_id_timestamp" in plan
+    # The index also provides the order
+    assert "TEMP B-TREE" not in plan
+
+
+def test_health_check_claim_uses_the_schedule_index(database):
+    statement = (
+        select(Connection)
+        .where(and_(
+            Connection.is_active == True,
+            Connection.status.in_([ConnectionStatus.ACTIVE, ConnectionStatus.ERROR]),
+            or_(Connection.next_check_at.is_(None), Connection.next_check_at <= int(time.time()))
+        ))
+        .order_by(Connection.next_check_at)
+        .limit(10)
+    )
+    assert "USING INDEX ix_connection_is_active_next_check_at" in query_plan(database, statement)
+
+
+# The keyset listings order by (timestamp, id). The index provides the
+# timestamp order, and SQLite only sorts rows with equal timestamps on id
+# ("USE TEMP B-TREE FOR RIGHT PART OF ORDER BY"), which still stops at the
+# LIMIT. A full sort of every matching row is what must not appear.
+FULL_SORT = "USE TEMP B-TREE FOR ORDER BY"
+CURSOR = encode_cursor(int(time.time()), "row-1")
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+def test_chat_listing_uses_the_user_index(database, cursor):
+    with captured_plans(database) as plans:
+        Chats.get_chats_by_user_id("user-1", cursor=cursor)
+    assert "USING INDEX ix_chat_user_id_updated_at (user_id=?" in plans[0]
+    assert FULL_SORT not in plans[0]
+
+
+@pytest.mark.asyncio
+async def test_async_chat_listing_uses_the_user_index(database):
+    with captured_plans(database, db_module.async_engine.sync_engine) as plans:
+        await AsyncChats.get_chats_by_user_id("user-1", cursor=CURSOR)
+    assert "USING INDEX ix_chat_user_id_updated_at (user_id=? AND updated_at<?)" in plans[0]
+
+
+@pytest.mark.parametrize(("method", "index"), [
+    (Chats.get_archived_chats_by_user_id, "ix_chat_user_id_archived_updated_at (user_id=? AND archived=?)"),
+    (Chats.get_pinned_chats_by_user_id, "ix_chat_user_id_pinned_updated_at (user_id=? AND pinned=?)"),
+])
+def test_filtered_chat_listings_use_their_index(database, method, index):
+    with captured_plans(database) as plans:
+        method("user-1")
+    assert f"USING INDEX {index}" in plans[0]
+    assert FULL_SORT not in plans[0]
+
+
+def test_chat_folder_listing_uses_the_folder_index(database):
+    with captured_plans(database) as plans:
+        Chats.get_chats_by_folder_id("folder-1", "user-1", cursor=CURSOR)
+    assert "USING INDEX ix_chat_folder_id_user_id_updated_at (folder_id=? AND user_id=? AND updated_at<?)" in plans[0]
+
+
+def test_shared_chat_lookup_uses_the_share_id_index(database):
+    with captured_plans(database) as plans:
+        Chats.get_chat_by_share_id("share-1")
+    assert "USING INDEX sqlite_autoindex_chat_" in plans[0]
+
+
+@pytest.mark.parametrize("cursor", [None, CURSOR])
+def test_channel_messages_use_the_channel_index(database, cursor):
+    with captured_plans(database) as plans:
+        Messages.get_messages_by_channel_id("channel-1", cursor=cursor)
+    assert "USING INDEX ix_message_channel_id_created_at (channel_id=?" in plans[0]
+    assert FULL_SORT not in plans[0]
+
+
+@pytest.mark.asyncio
+async def test_async_channel_messages_use_the_channel_index(database):
+    with captured_plans(database, db_module.async_engine.sync_engine) as plans:
+        await AsyncMessages.get_messages_by_channel_id("channel-1", cursor=CURSOR)
+    assert "USING INDEX ix_message_channel_id_created_at (channel_id=? AND created_at<?)" in plans[0]
+
+
+def test_replies_use_the_parent_index(database):
+    with captured_plans(database) as plans:
+        Messages.get_replies_by_parent_id("message-1", cursor=CURSOR)
+    assert "USING INDEX ix_message_parent_id_created_at (parent_id=? AND created_at>?)" in plans[0]
+    assert FULL_SORT not in plans[0]
+
+
+def test_reactions_use_the_message_index(database):
+    with captured_plans(database) as plans:
+        MessageReactions.get_reactions_by_message_id("message-1")
+    assert "USING INDEX ix_message_reaction_message_id_created_at (message_id=?)" in plans[0]
+    assert FULL_SORT not in plans[0]
+
+
+def test_file_lookup_uses_the_hash_index(database):
+    with captured_plans(database) as plans:
+        Files.get_file_by_hash("0" * 64)
+    assert "USING INDEX ix_file_hash (hash=?)" in plans[0]
+
+
+def test_memory_listing_uses_the_user_index(database):
+    with captured_plans(database) as plans:
+        Memories.get_memories_by_user_id("user-1")
+    assert "USING INDEX ix_memory_user_id_updated_at (user_id=?)" in plans[0]
+    assert FULL_SORT not in plans[0]
@@ -0,0 +1,113 @@
+import logging
+import time
+
+from src.web.utils.logging import LogQueueHandler, LogSampler, LogWriter
+
+
+def make_sampler(**kwargs):
+    summaries = []
+    options = {"success_rate": 1.0, "failure_rate": 1.0, "rate_limit": 0, "summary_interval": 3600.0}
+    options.update(kwargs)
+    return LogSampler(lambda key, summary: summaries.append((key, summary)), **options), summaries
+
+
+def test_sample_rates():
+    sampler, _ = make_sampler(success_rate=0.0, failure_rate=1.0)
+    assert not any(sampler.sample("q", success=True) for _ in range(100))
+    assert all(sampler.sample("q", success=False) for _ in range(100))
+
+
+def test_rate_limit_is_per_key_and_outcome():
+    sampler, _ = make_sampler(rate_limit=2)
+    assert [sampler.sample("a") for _ in range(3)] == [True, True, False]
+    # A burst of successes does not use up the failure or other-key budget
+    assert sampler.sample("a", success=False)
+    assert sampler.sample("b")
+
+
+def test_flush_summarizes_every_call():
+    sampler, summaries = make_sampler(rate_limit=1)
+    sampler.sample("q", execution_time=0.1)
+    sampler.sample("q", execution_time=0.3)
+    sampler.sample("q", success=False, execution_time=0.2)
+    sampler.flush()
+
+    [(key, summary)] = summaries
+    assert key == "q"
+    assert summary["calls"] == 3
+    assert summary["failures"] == 1
+    assert summary["logged"] == 2
+    assert summary["suppressed"] == 1
+    assert summary["max_time"] == 0.3
+    assert abs(summary["avg_time"] - 0.2) < 1e-9
+
+    sampler.flush()
+    assert len(summaries) == 1
+
+
+def test_summary_is_emitted_once_the_interval_ends():
+    sampler, summaries = make_sampler(summary_interval=0.0)
+    sampler.sample("q")
+    assert [key for key, _ in summaries] == ["q"]
+
+
+def test_forced_records_bypass_rates_and_limits():
+    sampler, summaries = make_sampler(failure_rate=0.0, rate_limit=1)
+    assert all(sampler.sample("q", success=False, force=True) for _ in range(5))
+    assert not sampler.sample("q", success=False)
+    sampler.stop()
+
+    [(_, summary)] = summaries
+    assert summary["logged"] == 5
+    assert summary["suppressed"] == 1
+
+
+def test_quiet_keys_are_summarized_without_another_call():
+    sampler, summaries = make_sampler(summary_interval=0.05)
+    sampler.sample("q")
+    deadline = time.monotonic() + 2
+    while not summaries and time.monotonic() < deadline:
+        time.sleep(0.01)
+    sampler.stop()
+
+    assert [key for key, _ in summaries] == ["q"]
+    assert summaries[0][1]["calls"] == 1
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def flush_batch(self):
+        pass
+
+
+def test_child_logger_records_reach_the_parent_sinks():
+    writer = LogWriter(queue_size=100, batch_size=10, flush_interval=0.05)
+    sink = ListHandler()
+    writer.set_sinks("finx.test", [sink])
+
+    parent, other = logging.getLogger("finx.test"), logging.getLogger("finx.other")
+    for logger in (parent, other):
+        logger.addHandler(LogQueueHandler(writer, logger.name))
+        logger.propagate = False
+    try:
+        parent.warning("from the parent")
+        logging.getLogger("finx.test.child").warning("from a child")
+        other.warning("nowhere to go")
+
+        writer.start()
+        writer.stop()
+    finally:
+        for logger in (parent, other):
+            logger.handlers.clear()
+            logger.propagate = True
+
+    assert [record.getMessage() for record in sink.records] == ["from the parent", "from a child"]
+    stats = writer.stats()
+    assert stats["written"] == 2
+    assert stats["unrouted"] == 1
@@ -0,0 +1,34 @@
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from src.web.internal.pagination import InvalidCursorError, decode_cursor, encode_cursor, paginate
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(1_700_000_000, "conn/é+1")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (1_700_000_000, "conn/é+1")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor!",
+    base64.urlsafe_b64encode(b'["1700000000","id"]').decode(),
+    base64.urlsafe_b64encode(b"[1700000000,7]").decode(),
+    base64.urlsafe_b64encode(b"[1700000000]").decode(),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_paginate_returns_a_cursor_only_when_more_rows_exist():
+    rows = [SimpleNamespace(id=f"id-{i}", updated_at=100 - i) for i in range(3)]
+
+    page, cursor = paginate(rows, 2, "updated_at")
+    assert page == rows[:2]
+    assert decode_cursor(cursor) == (99, "id-1")
+
+    assert paginate(rows, 3, "updated_at") == (rows, None)
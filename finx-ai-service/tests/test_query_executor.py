@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.web.constants.config import QUERY_CONFIG
+from src.web.internal.connection_providers import ConnectionProviderFactory, SQLiteProvider, connection_manager
+from src.web.internal.query_executor import QueryExecutor
+from src.web.models.connections import ConnectionModel, ConnectionType
+
+COUNT_TO = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < {n}) SELECT count(*) AS n FROM c"
+
+
+@pytest.fixture
+def connection(sqlite_sandbox):
+    now = int(time.time())
+    connection = ConnectionModel(
+        id="sqlite-test", user_id="user-1", name="test", type="sqlite",
+        database_name="data.db", created_at=now, updated_at=now
+    )
+    yield connection
+    connection_manager.close_connection(connection.id)
+
+
+@pytest.mark.asyncio
+async def test_timeout_cancels_only_its_own_query(connection):
+    executor = QueryExecutor(max_workers=4)
+    try:
+        slow, other = await asyncio.gather(
+            executor.execute(connection, COUNT_TO.format(n=50_000_000), timeout=0.3, use_cache=False),
+            executor.execute(connection, COUNT_TO.format(n=1_000_000), timeout=30, use_cache=False),
+        )
+    finally:
+        executor.shutdown()
+
+    assert not slow.success
+    assert "timed out" in slow.error
+    assert other.success, other.error
+    assert other.data == [{"n": 1_000_000}]
+
+
+
+class _BlockingProvider:
+    def __init__(self):
+        self.release = threading.Event()
+        self.cancelled = []
+
+    def block(self):
+        self.release.wait(5)
+        return "blocked"
+
+    def cancel(self, token):
+        self.cancelled.append(token)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_call_holds_its_slot_until_the_worker_finishes(connection):
+    connection = connection.model_copy(update={"max_connections": 1})
+    provider = _BlockingProvider()
+    executor = QueryExecutor(max_workers=2)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(connection, provider, provider.block, timeout=0.05)
+        assert provider.cancelled
+
+        # The worker is still running, so the only slot is still taken
+        second = asyncio.ensure_future(executor.run(connection, provider, lambda: "second", timeout=5))
+        await asyncio.sleep(0.1)
+        assert not second.done()
+
+        provider.release.set()
+        assert await asyncio.wait_for(second, 5) == "second"
+    finally:
+        provider.release.set()
+        executor.shutdown()
+
+def test_sqlite_is_not_offered_without_a_sandbox(monkeypatch):
+    monkeypatch.delitem(ConnectionProviderFactory._providers, ConnectionType.SQLITE, raising=False)
+    now = int(time.time())
+    connection = ConnectionModel(
+        id="sqlite-off", user_id="user-1", name="test", type="sqlite",
+        database_name="/etc/passwd", created_at=now, updated_at=now
+    )
+    assert ConnectionProviderFactory.create_provider(connection) is None
+
+
+@pytest.mark.parametrize("database_name", ["../outside.db", "/etc/passwd", ""])
+def test_sqlite_paths_outside_the_sandbox_are_rejected(sqlite_sandbox, database_name):
+    now = int(time.time())
+    connection = ConnectionModel(
+        id="sqlite-escape", user_id="user-1", name="test", type="sqlite",
+        database_name=database_name, created_at=now, updated_at=now
+    )
+    with pytest.raises(ValueError):
+        SQLiteProvider(connection)._database_path()
+
+
+def test_sqlite_attach_is_disabled(connection):
+    provider = connection_manager.get_provider(connection)
+    result = provider.execute_query("ATTACH DATABASE '/tmp/other.db' AS other")
+    assert not result.success
+
+
+def test_repeated_column_names_survive_row_results(connection):
+    provider = connection_manager.get_provider(connection)
+    result = provider.execute_query("SELECT 1 AS id, 2 AS id")
+    assert result.columns == ["id", "id_2"]
+    assert result.data == [{"id": 1, "id_2": 2}]
+
+
+def test_sqlite_explain_returns_the_plan_without_estimates(connection):
+    provider = connection_manager.get_provider(connection)
+    estimate = provider.explain("SELECT 1")
+    assert estimate["estimated_rows"] is None
+    assert estimate["estimated_cost"] is None
+    assert estimate["plan"]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_rejects_queries_over_the_estimate_limit(connection, monkeypatch):
+    provider = connection_manager.get_provider(connection)
+    monkeypatch.setitem(QUERY_CONFIG, "DRY_RUN_MAX_ROWS", 100)
+    monkeypatch.setattr(provider, "has_cost_estimates", True)
+    monkeypatch.setattr(
+        provider, "explain",
+        lambda query, params=None: {"estimated_rows": 5000, "estimated_cost": 1.0, "plan": []}
+    )
+    monkeypatch.setattr(provider, "execute_query", lambda *args: pytest.fail("query ran after a failed dry run"))
+
+    executor = QueryExecutor(max_workers=2)
+    try:
+        result = await executor.execute(connection, "SELECT 1", use_cache=False)
+        with pytest.raises(ValueError, match="5000 rows"):
+            async for _ in executor.stream_query(connection, "SELECT 1"):
+                pass
+    finally:
+        executor.shutdown()
+
+    assert not result.success
+    assert "5000 rows exceeds the limit of 100" in result.error
+    assert result.estimate["estimated_rows"] == 5000
+
+
+@pytest.mark.asyncio
+async def test_estimate_is_returned_with_the_result(connection, monkeypatch):
+    provider = connection_manager.get_provider(connection)
+    monkeypatch.setattr(provider, "has_cost_estimates", True)
+    monkeypatch.setattr(
+        provider, "explain",
+        lambda query, params=None: {"estimated_rows": 1, "estimated_cost": 0.01, "plan": []}
+    )
+
+    executor = QueryExecutor(max_workers=2)
+    try:
+        result = await executor.execute(connection, "SELECT 1 AS one", use_cache=False)
+    finally:
+        executor.shutdown()
+
+    assert result.success, result.error
+    assert result.data == [{"one": 1}]
+    assert result.estimate == {"estimated_rows": 1, "estimated_cost": 0.01, "plan": []}
+
+
+@pytest.mark.asyncio
+async def test_dry_run_only_plans_the_query(connection):
+    executor = QueryExecutor(max_workers=2)
+    try:
+        await executor.execute(connection, "CREATE TABLE t (x INTEGER)", use_cache=False)
+        planned = await executor.execute(connection, "INSERT INTO t VALUES (1)", dry_run=True)
+        count = await executor.execute(connection, "SELECT count(*) AS n FROM t", use_cache=False)
+    finally:
+        executor.shutdown()
+
+    assert planned.success, planned.error
+    assert planned.estimate == {"estimated_rows": None, "estimated_cost": None, "plan": []}
+    assert planned.data is None
+    assert count.data == [{"n": 0}]
+
+
+@pytest.mark.asyncio
+async def test_dry_run_passes_queries_without_estimates(connection, monkeypatch):
+    monkeypatch.setitem(QUERY_CONFIG, "DRY_RUN_MAX_COST", 10.0)
+    executor = QueryExecutor(max_workers=2)
+    try:
+        result = await executor.execute(connection, "SELECT 42 AS answer", use_cache=False)
+    finally:
+        executor.shutdown()
+
+    assert result.success, result.error
+    assert result.data == [{"answer": 42}]
+
+
+@pytest.mark.asyncio
+async def test_preview_rows_caps_the_query_limit(connection):
+    query = "WITH RECURSIVE c AS (SELECT 1 AS x UNION ALL SELECT x + 1 FROM c WHERE x < 10) SELECT x FROM c LIMIT 8;"
+    assert QueryExecutor._limit_query(connection, query, 3).endswith("LIMIT 3")
+    assert QueryExecutor._limit_query(connection, "DELETE FROM t", 3) == "DELETE FROM t"
+
+    executor = QueryExecutor(max_workers=2)
+    try:
+        result = await executor.execute(connection, query, use_cache=False, preview_rows=2)
+    finally:
+        executor.shutdown()
+
+    assert result.success, result.error
+    assert result.data == [{"x": 1}, {"x": 2}]
+    assert result.truncated
@@ -0,0 +1,53 @@
+import pyarrow as pa
+import pyarrow.ipc as pa_ipc
+
+from src.web.internal.connection_providers import QueryResult, unique_column_names
+
+
+def _columnar():
+    return QueryResult(
+        success=True,
+        columns=["id", "name", "id"],
+        column_values=[[1, 2, 3], ["a", "b", "c"], [10, 20, 30]],
+        row_count=3,
+    )
+
+
+def test_unique_column_names():
+    assert unique_column_names(["id", "name", "id", "id"]) == ["id", "name", "id_2", "id_3"]
+    # A suffixed name never clashes with a real column
+    assert unique_column_names(["id", "id", "id_2"]) == ["id", "id_3", "id_2"]
+
+
+def test_to_arrow_keeps_repeated_columns():
+    table = _columnar().to_arrow()
+    assert table.column_names == ["id", "name", "id"]
+    assert table.column(2).to_pylist() == [10, 20, 30]
+
+
+def test_arrow_ipc_round_trip():
+    table = pa_ipc.open_stream(_columnar().to_arrow_ipc()).read_all()
+    assert table.equals(_columnar().to_arrow())
+
+
+def test_rows_keep_repeated_columns():
+    assert _columnar().get_rows()[0] == {"id": 1, "name": "a", "id_2": 10}
+
+
+def test_truncate_flags_dropped_rows():
+    result = _columnar()
+    result.truncate(2)
+    assert result.truncated
+    assert result.row_count == 2
+    assert result.column_values == [[1, 2], ["a", "b"], [10, 20]]
+
+    rows = QueryResult(success=True, data=[{"x": 1}, {"x": 2}], columns=["x"], row_count=2)
+    rows.truncate(2)
+    assert not rows.truncated
+    assert rows.data == [{"x": 1}, {"x": 2}]
+
+
+def test_empty_result_to_arrow():
+    result = QueryResult(success=True, columns=["x"], column_values=[[]], row_count=0)
+    assert result.to_arrow().num_rows == 0
+    assert isinstance(result.to_arrow(), pa.Table)
@@ -0,0 +1,44 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.web.internal.result_cache import _json_exact, is_cacheable_query
+
+
+@pytest.mark.parametrize("query", [
+    "SELECT region, SUM(amount) FROM sales GROUP BY region",
+    "WITH t AS (SELECT 1 AS x) SELECT x FROM t",
+    "(SELECT 1) UNION (SELECT 2)",
+])
+def test_plain_reads_are_cacheable(query):
+    assert is_cacheable_query(query, "postgresql")
+
+
+@pytest.mark.parametrize("query", [
+    "WITH d AS (DELETE FROM t RETURNING *) SELECT * FROM d",
+    "SELECT * FROM t FOR UPDATE",
+    "SELECT * INTO backup FROM t",
+    "SELECT now()",
+    "SELECT current_timestamp",
+    "SELECT nextval('orders_id_seq')",
+    "SELECT random()",
+    "SELECT 1; DELETE FROM t",
+    "UPDATE t SET x = 1",
+    "not sql at all (",
+])
+def test_writes_locks_and_volatile_queries_are_not_cacheable(query):
+    assert not is_cacheable_query(query, "postgresql")
+
+
+def test_unknown_dialects_are_not_cacheable():
+    assert not is_cacheable_query("SELECT 1", "aws_s3")
+
+
+def test_only_json_exact_values_go_to_redis():
+    assert _json_exact([{"a": 1, "b": "x", "c": None, "d": 1.5, "e": {"f": [True]}}])
+    assert not _json_exact([{"a": Decimal("1.10")}])
+    assert not _json_exact([{"a": datetime.date(2024, 1, 1)}])
+    assert not _json_exact([[b"bytes"]])
+    assert not _json_exact([[float("nan")]])
+    assert not _json_exact([[2**70]])
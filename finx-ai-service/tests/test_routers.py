@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from src.web.routers import files, knowledge, prompts
+from src.web.utils.auth import get_verified_user
+
+
+@pytest.fixture
+def client(database):
+    app = FastAPI()
+    app.middleware("http")(main.db_session_middleware)
+    app.include_router(files.router, prefix="/files")
+    app.include_router(knowledge.router, prefix="/knowledge")
+    app.include_router(prompts.router, prefix="/prompts")
+    app.dependency_overrides[get_verified_user] = lambda: SimpleNamespace(id="user-1", role="user")
+
+    # These routes run on the event loop and must only use the async engine
+    checkouts = []
+    event.listen(database, "checkout", lambda *_: checkouts.append(1))
+    yield TestClient(app)
+    assert checkouts == []
+
+
+def test_file_routes(client):
+    file = client.post("/files/", json={"filename": "a.csv", "hash": "abc"}).json()
+    updated = client.put(f"/files/{file['id']}", json={"filename": "b.csv"})
+    assert updated.status_code == 200
+    assert updated.json()["filename"] == "b.csv"
+    assert [f["id"] for f in client.get("/files/search/by-hash/abc").json()] == [file["id"]]
+    assert client.delete(f"/files/{file['id']}").status_code == 200
+    assert client.get(f"/files/{file['id']}").status_code == 404
+
+
+def test_knowledge_routes(client):
+    created = client.post("/knowledge/", json={"name": "kb", "description": "d"}).json()
+    assert client.put(f"/knowledge/{created['id']}/data", json={"rows": 1}).status_code == 200
+    assert client.get(f"/knowledge/{created['id']}").json()["data"] == {"rows": 1}
+    assert [k["id"] for k in client.get("/knowledge/").json()] == [created["id"]]
+
+
+def test_prompt_routes(client):
+    assert client.post("/prompts/", json={"command": "sum", "title": "Sum", "content": "x"}).status_code == 200
+    updated = client.put("/prompts/sum", json={"command": "sum", "title": "Total", "content": "y"})
+    assert updated.status_code == 200, updated.text
+    assert [p["title"] for p in client.get("/prompts/", params={"user_only": True}).json()] == ["Total"]
+    assert client.delete("/prompts/sum").status_code == 200
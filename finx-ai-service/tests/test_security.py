@@ -0,0 +1,122 @@
+import base64
+
+import orjson
+import pytest
+from sqlalchemy import select, update
+
+from src.web.models.connections import Connection
+from src.web.utils.security import (
+    CredentialManager, KeyRing, SecurityError, credential_manager, reencrypt_stored_credentials
+)
+
+CREDENTIALS = {"username": "ada", "password": "hunter2"}
+
+
+def test_round_trip_uses_a_fresh_salt_per_credential():
+    manager = CredentialManager(key_ring=KeyRing({1: b"key-one"}))
+    first = manager.encrypt_credentials(CREDENTIALS)
+    second = manager.encrypt_credentials(CREDENTIALS)
+
+    assert first.startswith("v1$")
+    assert first != second
+    assert manager.decrypt_credentials(first) == CREDENTIALS
+    assert manager.decrypt_credentials(second) == CREDENTIALS
+
+
+def test_decrypt_returns_a_new_dict_per_call():
+    manager = CredentialManager(key_ring=KeyRing({1: b"key-one"}))
+    encrypted = manager.encrypt_credentials(CREDENTIALS)
+
+    manager.decrypt_credentials(encrypted)["password"] = "changed"
+    assert manager.decrypt_credentials(encrypted) == CREDENTIALS
+
+
+def test_rotation_keeps_old_ciphertexts_readable():
+    old = CredentialManager(key_ring=KeyRing({1: b"key-one"}))
+    encrypted = old.encrypt_credentials(CREDENTIALS)
+
+    rotated = CredentialManager(key_ring=KeyRing({1: b"key-one", 2: b"key-two"}))
+    assert rotated.decrypt_credentials(encrypted) == CREDENTIALS
+    assert rotated.needs_reencrypt(encrypted)
+
+    reencrypted = rotated.reencrypt_credentials(encrypted)
+    assert reencrypted.startswith("v2$")
+    assert not rotated.needs_reencrypt(reencrypted)
+    assert rotated.decrypt_credentials(reencrypted) == CREDENTIALS
+
+
+def test_legacy_ciphertexts_decrypt_with_the_legacy_key():
+    key_ring = KeyRing({1: b"key-one", 2: b"key-two"})
+    token = key_ring.legacy_fernet().encrypt(orjson.dumps(CREDENTIALS))
+    legacy = base64.urlsafe_b64encode(token).decode()
+
+    manager = CredentialManager(key_ring=key_ring)
+    assert manager.decrypt_credentials(legacy) == CREDENTIALS
+    assert manager.needs_reencrypt(legacy)
+    assert manager.reencrypt_credentials(legacy).startswith("v2$")
+
+
+def test_unknown_key_versions_do_not_decrypt():
+    encrypted = CredentialManager(key_ring=KeyRing({2: b"key-two"})).encrypt_credentials(CREDENTIALS)
+    manager = CredentialManager(key_ring=KeyRing({1: b"key-one"}))
+
+    assert manager.decrypt_credentials(encrypted) == {}
+    with pytest.raises(SecurityError):
+        manager.reencrypt_credentials(encrypted)
+
+
+def test_key_ring_from_config():
+    key_ring = KeyRing.from_config({
+        "CREDENTIAL_KEYS": "1:old, 2:new",
+        "CONNECTION_MASTER_KEY": "unused",
+        "CREDENTIAL_KEY_VERSION": None,
+        "CREDENTIAL_LEGACY_KEY_VERSION": 1,
+    })
+    assert key_ring.keys == {1: b"old", 2: b"new"}
+    assert key_ring.current_version == 2
+
+    with pytest.raises(SecurityError):
+        KeyRing({1: b"old"}, current_version=3)
+
+
+def _store(database, id, credentials):
+    with database.begin() as conn:
+        conn.execute(
+            Connection.__table__.insert(),
+            {"id": id, "user_id": "user-1", "name": id, "type": "postgresql", "credentials": credentials},
+        )
+
+
+def _stored(database, id):
+    with database.connect() as conn:
+        return conn.execute(select(Connection.credentials).where(Connection.id == id)).scalar()
+
+
+def _legacy(credentials):
+    token = credential_manager.key_ring.legacy_fernet().encrypt(orjson.dumps(credentials))
+    return base64.urlsafe_b64encode(token).decode()
+
+
+def test_stored_legacy_credentials_are_reencrypted(database):
+    _store(database, "conn-1", _legacy(CREDENTIALS))
+
+    assert reencrypt_stored_credentials() == 1
+    stored = _stored(database, "conn-1")
+    assert not credential_manager.needs_reencrypt(stored)
+    assert credential_manager.decrypt_credentials(stored) == CREDENTIALS
+
+
+def test_reencryption_does_not_overwrite_a_concurrent_update(database, monkeypatch):
+    _store(database, "conn-1", _legacy(CREDENTIALS))
+    updated = credential_manager.encrypt_credentials({"username": "ada", "password": "new"})
+    reencrypt = credential_manager.reencrypt_credentials
+
+    def reencrypt_while_a_user_saves(encrypted):
+        with database.begin() as conn:
+            conn.execute(update(Connection).where(Connection.id == "conn-1").values(credentials=updated))
+        return reencrypt(encrypted)
+
+    monkeypatch.setattr(credential_manager, "reencrypt_credentials", reencrypt_while_a_user_saves)
+
+    assert reencrypt_stored_credentials() == 0
+    assert _stored(database, "conn-1") == updated
@@ -0,0 +1,54 @@
+import pytest
+import pytest_asyncio
+
+from src.providers.engine.sql import PostgresEngine, SQLiteEngine
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = SQLiteEngine(str(tmp_path / "engine.db"))
+    yield engine
+    await engine.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_dry_run_plans_without_running(engine):
+    ok, _ = await engine.execute_sql("CREATE TABLE t (x INTEGER PRIMARY KEY)", None, dry_run=False)
+    assert ok
+
+    ok, estimate = await engine.execute_sql("INSERT INTO t VALUES (1)", None)
+    assert ok
+    assert estimate["estimated_rows"] is None
+    assert estimate["estimated_cost"] is None
+
+    ok, result = await engine.execute_sql("SELECT count(*) AS n FROM t", None, dry_run=False)
+    assert ok
+    assert result == {"columns": ["n"], "data": [{"n": 0}]}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_dry_run_reports_invalid_sql(engine):
+    ok, result = await engine.execute_sql("SELECT * FROM missing", None)
+    assert not ok
+    assert "no such table" in result["error"]
+
+
+def test_sqlite_engine_needs_a_file():
+    with pytest.raises(ValueError):
+        SQLiteEngine(":memory:")
+
+
+def test_estimates_over_the_limits_fail_the_dry_run():
+    engine = PostgresEngine("postgresql://localhost/unused", max_cost=100.0, max_rows=1000)
+
+    ok, result = engine._check_estimate({"estimated_rows": 10, "estimated_cost": 250.0, "plan": []})
+    assert not ok
+    assert result["error"] == "Estimated cost 250.0 exceeds the limit of 100.0"
+
+    ok, result = engine._check_estimate({"estimated_rows": 5000, "estimated_cost": 50.0, "plan": []})
+    assert not ok
+    assert result["error"] == "Estimated 5000 rows exceeds the limit of 1000"
+
+    ok, result = engine._check_estimate({"estimated_rows": 10, "estimated_cost": 50.0, "plan": []})
+    assert ok
+    assert "error" not in result
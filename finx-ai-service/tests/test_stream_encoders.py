@@ -0,0 +1,67 @@
+import pyarrow as pa
+import pytest
+
+from src.web.constants.config import QUERY_CONFIG
+from src.web.routers.connections import _encode_arrow, _encode_csv, _encode_ndjson
+
+COLUMNS = ["id", "note"]
+
+
+async def _batches(*batches, error=None):
+    for rows in batches:
+        yield COLUMNS, rows
+    if error is not None:
+        raise error
+
+
+async def _collect(encoder, batches) -> bytes:
+    chunks = []
+    async for chunk in encoder(COLUMNS, batches):
+        chunks.append(chunk.encode() if isinstance(chunk, str) else chunk)
+    return b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_arrow_types_a_column_that_starts_all_null():
+    body = await _collect(_encode_arrow, _batches([(1, None), (2, None)], [(3, "late")], [(4, None)]))
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.schema.field("note").type == pa.string()
+    assert table.column("note").to_pylist() == [None, None, "late", None]
+
+
+@pytest.mark.asyncio
+async def test_arrow_promotes_types_seen_while_holding_back():
+    body = await _collect(_encode_arrow, _batches([(1, None)], [(2.5, 7)]))
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.schema.field("id").type == pa.float64()
+    assert table.column("id").to_pylist() == [1.0, 2.5]
+
+
+@pytest.mark.asyncio
+async def test_arrow_sends_columns_still_null_after_the_sample_as_strings(monkeypatch):
+    monkeypatch.setitem(QUERY_CONFIG, "ARROW_SCHEMA_ROWS", 2)
+    body = await _collect(_encode_arrow, _batches([(1, None), (2, None)], [(3, 42)]))
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.schema.field("note").type == pa.string()
+    assert table.column("note").to_pylist() == [None, None, "42"]
+
+
+@pytest.mark.asyncio
+async def test_arrow_keeps_the_null_type_of_a_column_that_stays_null():
+    body = await _collect(_encode_arrow, _batches([(1, None)], [(2, None)]))
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.schema.field("note").type == pa.null()
+    assert table.num_rows == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoder", [_encode_arrow, _encode_csv, _encode_ndjson])
+async def test_failures_after_the_first_batch_abort_the_stream(encoder):
+    with pytest.raises(RuntimeError, match="connection lost"):
+        await _collect(encoder, _batches([(1, "a")], error=RuntimeError("connection lost")))
+
+
+@pytest.mark.asyncio
+async def test_arrow_values_that_do_not_fit_the_schema_abort_the_stream():
+    with pytest.raises(pa.ArrowException):
+        await _collect(_encode_arrow, _batches([(1, "a")], [("not a number", "b")]))
@@ -0,0 +1,38 @@
+import pytest
+
+from src.web.internal.db import get_db_context
+from src.web.models import users as users_module
+from src.web.models.users import AsyncUsers, Users
+
+
+@pytest.fixture
+def user(database):
+    users_module._user_cache.clear()
+    yield Users.insert_new_user("user-1", "Ada", "ada@example.com", role="user")
+    users_module._user_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_role_change_is_seen_after_commit(user):
+    assert (await AsyncUsers.get_user_by_id(user.id)).role == "user"
+
+    Users.update_user_role_by_id(user.id, "admin")
+    assert user.id not in users_module._user_cache
+    assert (await AsyncUsers.get_user_by_id(user.id)).role == "admin"
+
+
+@pytest.mark.asyncio
+async def test_invalidation_waits_for_the_outer_commit(user):
+    await AsyncUsers.get_user_by_id(user.id)
+    with get_db_context():
+        Users.update_user_role_by_id(user.id, "admin")
+        # Not committed yet: the cached row is still the current one
+        assert user.id in users_module._user_cache
+    assert user.id not in users_module._user_cache
+
+
+def test_read_overlapping_an_invalidation_is_not_cached(user):
+    generation = users_module._user_cache_generation
+    users_module._forget_user(user.id)
+    users_module._cache_user(user, generation)
+    assert user.id not in users_module._user_cache